@@ -0,0 +1,107 @@
+"""Awaitable ADT functionality for asyncio applications
+
+The HTTP communication is still done by the synchronous Connection
+but in a pool of worker threads, so the event loop is never blocked and
+many requests can be in flight at once.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from sap.adt.core import DEFAULT_POOL_SIZE
+from sap.adt.repository import Repository
+
+
+class AsyncConnection:
+    """Asyncio facade of sap.adt.Connection"""
+
+    def __init__(self, connection, max_workers=DEFAULT_POOL_SIZE):
+        """Parameters:
+            - connection: sap.adt.Connection shared by the worker threads
+            - max_workers: maximum number of requests in flight which
+                           should not exceed the connection's pool size
+        """
+
+        self._connection = connection
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def connection(self):
+        """The wrapped synchronous connection"""
+
+        return self._connection
+
+    @property
+    def user(self):
+        """Connected user"""
+
+        return self._connection.user
+
+    @property
+    def uri(self):
+        """ADT path for building URLs (e.g. sap/bc/adt)"""
+
+        return self._connection.uri
+
+    def close(self):
+        """Waits for the running requests and stops the worker threads"""
+
+        self._executor.shutdown(wait=True)
+
+    async def run(self, func, *args, **kwargs):
+        """Calls the blocking function in a worker thread"""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def execute(self, method, adt_uri, params=None, headers=None, body=None):
+        """Executes the given ADT URI as an HTTP request and returns
+           the requests response object
+        """
+
+        return await self.run(self._connection.execute, method, adt_uri, params=params, headers=headers, body=body)
+
+    async def get_text(self, relativeuri):
+        """Executes a GET HTTP request with the headers Accept = text/plain.
+        """
+
+        return await self.run(self._connection.get_text, relativeuri)
+
+    async def fetch(self, adt_object):
+        """Populates the ADT object with its metadata and returns it"""
+
+        await self.run(adt_object.fetch)
+        return adt_object
+
+    async def text(self, adt_object):
+        """Returns the source code of the ADT object"""
+
+        return await self.run(getattr, adt_object, 'text')
+
+    async def lock(self, adt_object):
+        """Locks the ADT object and returns the lock handle"""
+
+        return await self.run(adt_object.lock)
+
+    async def unlock(self, adt_object, lock_handle):
+        """Unlocks the ADT object"""
+
+        return await self.run(adt_object.unlock, lock_handle)
+
+    async def create(self, adt_object, corrnr=None):
+        """Creates the ADT object"""
+
+        return await self.run(adt_object.create, corrnr=corrnr)
+
+    async def read_node(self, adt_object, withdescr=False, nodekeys=None):
+        """Returns node structure of the ADT object"""
+
+        repository = Repository(self._connection)
+        return await self.run(repository.read_node, adt_object, withdescr=withdescr, nodekeys=nodekeys)
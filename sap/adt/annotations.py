@@ -5,14 +5,16 @@
 class XmlAttributeProperty(property):
     """XML Annotation"""
 
-    def __init__(self, name, fget, fset=None, deserialize=True):
+    # pylint: disable=too-many-arguments
+    def __init__(self, name, fget, fset=None, deserialize=True, serialize=True):
         super(XmlAttributeProperty, self).__init__(fget, fset)
 
         self.name = name
         self.deserialize = deserialize
+        self.serialize = serialize
 
     def setter(self, fset):
-        return type(self)(self.name, self.fget, fset, deserialize=self.deserialize)
+        return type(self)(self.name, self.fget, fset, deserialize=self.deserialize, serialize=self.serialize)
 
 
 # pylint: disable=too-few-public-methods
@@ -30,13 +32,13 @@ class XmlElementProperty(property):
         return type(self)(self.name, self.fget, fset, deserialize=self.deserialize, factory=self.factory)
 
 
-def xml_attribute(name, deserialize=True):
+def xml_attribute(name, deserialize=True, serialize=True):
     """Mark the given property as a XML element attribute of the given name"""
 
     def decorator(meth):
         """Creates a property object"""
 
-        return XmlAttributeProperty(name, meth, deserialize=deserialize)
+        return XmlAttributeProperty(name, meth, deserialize=deserialize, serialize=serialize)
 
     return decorator
 
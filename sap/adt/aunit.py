@@ -2,10 +2,10 @@
 
 from typing import NamedTuple, List
 
-import xml.sax
 from xml.sax.handler import ContentHandler
 
 from sap import get_logger
+from sap.adt.xmlparser import parse_string, debug_log
 
 
 def mod_log():
@@ -29,10 +29,14 @@ class AUnit:
         return '/' + connection.uri + '/' + adt_object.uri
 
     @staticmethod
-    def build_test_configuration(adt_object_uri):
-        """Build the AUnit ADT URI of the tested object.
+    def build_test_configuration(adt_object_uris):
+        """Build the AUnit run configuration of the tested objects
+           given by an ADT URI or a list of ADT URIs.
         """
 
+        if isinstance(adt_object_uris, str):
+            adt_object_uris = [adt_object_uris]
+
         test_config = '''<?xml version="1.0" encoding="UTF-8"?>
 <aunit:runConfiguration xmlns:aunit="http://www.sap.com/adt/aunit">
   <external>
@@ -46,12 +50,12 @@ class AUnit:
   </options>
   <adtcore:objectSets xmlns:adtcore="http://www.sap.com/adt/core">
     <objectSet kind="inclusive">
-      <adtcore:objectReferences>
-        <adtcore:objectReference adtcore:uri="'''
+      <adtcore:objectReferences>'''
 
-        test_config += adt_object_uri
+        test_config += ''.join(f'''
+        <adtcore:objectReference adtcore:uri="{adt_object_uri}"/>''' for adt_object_uri in adt_object_uris)
 
-        test_config += '''"/>
+        test_config += '''
       </adtcore:objectReferences>
     </objectSet>
   </adtcore:objectSets>
@@ -59,12 +63,16 @@ class AUnit:
 
         return test_config
 
-    def execute(self, adt_object):
-        """Executes ABAP Unit tests on the given ADT object
+    def execute(self, adt_objects):
+        """Executes ABAP Unit tests on the given ADT object or the list
+           of ADT objects in one test run
         """
 
-        adt_object_uri = AUnit.build_tested_object_uri(self._connection, adt_object)
-        test_config = AUnit.build_test_configuration(adt_object_uri)
+        if not isinstance(adt_objects, (list, tuple)):
+            adt_objects = [adt_objects]
+
+        adt_object_uris = [AUnit.build_tested_object_uri(self._connection, adt_object) for adt_object in adt_objects]
+        test_config = AUnit.build_test_configuration(adt_object_uris)
 
         return self._connection.execute(
             'POST', 'abapunit/testruns',
@@ -81,6 +89,20 @@ class RunResults(NamedTuple):
     programs: List
 
 
+def merge_run_results(run_results):
+    """Merges results of several test runs into one RunResults
+       where identical alerts of the runs are reported only once
+    """
+
+    merged = RunResults([], [])
+
+    for results in run_results:
+        merged.alerts.extend(alert for alert in results.alerts if alert not in merged.alerts)
+        merged.programs.extend(results.programs)
+
+    return merged
+
+
 # pylint: disable=too-few-public-methods
 class Program(NamedTuple):
     """ABAP Unit Tests Framework ADT results Program node"""
@@ -123,6 +145,8 @@ class AUnitResponseHandler(ContentHandler):
     def __init__(self):
         super(AUnitResponseHandler, self).__init__()
 
+        self._debug = debug_log(mod_log())
+
         self.run_results = RunResults(list(), list())
         self._program = None
         self._test_class = None
@@ -135,42 +159,43 @@ class AUnitResponseHandler(ContentHandler):
         self._alert_details = None
         self._alert_stack = None
 
+    # pylint: disable=too-many-branches
     def startElement(self, name, attrs):
-        mod_log().debug('XML: %s', name)
+        self._debug('XML: %s', name)
         if name == 'program':
             self._program = Program(name=attrs.get('adtcore:name'), test_classes=[])
             self.run_results.programs.append(self._program)
-            mod_log().debug('XML: %s: %s', name, self._program.name)
+            self._debug('XML: %s: %s', name, self._program.name)
         elif name == 'testClass':
             self._test_class = TestClass(name=attrs.get('adtcore:name'), test_methods=[])
             self._program.test_classes.append(self._test_class)
-            mod_log().debug('XML: %s: %s', name, self._test_class.name)
+            self._debug('XML: %s: %s', name, self._test_class.name)
         elif name == 'testMethod':
             self._test_method = TestMethod(name=attrs.get('adtcore:name'), alerts=[])
             self._test_class.test_methods.append(self._test_method)
-            mod_log().debug('XML: %s: %s', name, self._test_method.name)
+            self._debug('XML: %s: %s', name, self._test_method.name)
         elif name == 'alert':
             self._alert_kind = attrs.get('kind')
             self._alert_severity = attrs.get('severity')
             self._alert_details = []
             self._alert_stack = []
-            mod_log().debug('XML: %s', name)
+            self._debug('XML: %s', name)
         elif name == 'title':
             self._alert_title_part = ''
         elif name == 'detail':
             self._alert_details.append(attrs.get('text'))
-            mod_log().debug('XML: %s: %s', name, self._alert_details[-1])
+            self._debug('XML: %s: %s', name, self._alert_details[-1])
         elif name == 'stackEntry':
             self._alert_stack.append(attrs.get('adtcore:description'))
-            mod_log().debug('XML: %s: %s', name, self._alert_stack[-1])
+            self._debug('XML: %s: %s', name, self._alert_stack[-1])
 
     def characters(self, content):
         if self._alert_title_part is not None:
-            mod_log().debug('XML: alert title: %s', content)
+            self._debug('XML: alert title: %s', content)
             self._alert_title_part += content.strip()
 
     def endElement(self, name):
-        mod_log().debug('XML: %s: CLOSING', name)
+        self._debug('XML: %s: CLOSING', name)
         if name == 'program':
             self._program = None
         elif name == 'testclas':
@@ -201,6 +226,6 @@ def parse_run_results(aunit_results_xml):
     """Converts XML results into Python representation"""
 
     xml_handler = AUnitResponseHandler()
-    xml.sax.parseString(aunit_results_xml, xml_handler)
+    parse_string(aunit_results_xml, xml_handler)
 
     return xml_handler.run_results
@@ -0,0 +1,170 @@
+"""On-disk cache of ADT HTTP responses validated by conditional requests"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from sap import get_logger
+
+
+def mod_log():
+    """ADT Module logger"""
+
+    return get_logger()
+
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+class CacheEntry:
+    """Cached response body with its validators"""
+
+    def __init__(self, text, etag=None, last_modified=None, content_type=None):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type
+
+    @staticmethod
+    def from_response(response):
+        """Creates a new entry from the response or returns None
+           if the response cannot be validated later.
+        """
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        if etag is None and last_modified is None:
+            return None
+
+        return CacheEntry(response.text, etag=etag, last_modified=last_modified,
+                          content_type=response.headers.get('Content-Type'))
+
+    def conditional_headers(self):
+        """Returns HTTP headers making the request conditional"""
+
+        headers = {}
+
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+    def to_response(self, not_modified):
+        """Builds a complete response from the 304 response"""
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.encoding = 'utf-8'
+        # pylint: disable=protected-access
+        response._content = self.text.encode('utf-8')
+        response._content_consumed = True
+        response.headers = CaseInsensitiveDict(not_modified.headers)
+
+        if self.content_type is not None:
+            response.headers['Content-Type'] = self.content_type
+
+        return response
+
+
+class ResponseCache:
+    """Directory of cached responses keyed by URL and the header Accept
+       where the least recently used entries are removed when
+       the total size exceeds the configured limit.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self._directory = directory
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        """Cache directory"""
+
+        return self._directory
+
+    @property
+    def max_size(self):
+        """Maximum total size of the cached entries in bytes"""
+
+        return self._max_size
+
+    def _entry_path(self, key, accept):
+        digest = hashlib.sha256(f'{accept}\n{key}'.encode('utf-8')).hexdigest()
+        return os.path.join(self._directory, f'{digest}.json')
+
+    def get(self, key, accept):
+        """Returns the cached entry or None"""
+
+        path = self._entry_path(key, accept)
+
+        try:
+            with open(path, 'r', encoding='utf-8') as source:
+                data = json.load(source)
+
+            # mtime is the time of the last use for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as ex:
+            mod_log().info('Ignoring broken cache entry %s: %s', path, str(ex))
+            return None
+
+        return CacheEntry(data['text'], etag=data.get('etag'), last_modified=data.get('last_modified'),
+                          content_type=data.get('content_type'))
+
+    def put(self, key, accept, entry):
+        """Stores the entry and evicts the least recently used entries"""
+
+        path = self._entry_path(key, accept)
+        data = {'key': key, 'accept': accept, 'etag': entry.etag, 'last_modified': entry.last_modified,
+                'content_type': entry.content_type, 'text': entry.text}
+
+        handle, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        with os.fdopen(handle, 'w', encoding='utf-8') as dest:
+            json.dump(data, dest)
+
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+
+            for dir_entry in os.scandir(self._directory):
+                if not dir_entry.name.endswith('.json'):
+                    continue
+
+                stat = dir_entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                total += stat.st_size
+
+            entries.sort()
+
+            for _, size, path in entries:
+                if total <= self._max_size:
+                    break
+
+                mod_log().debug('Evicting cache entry %s', path)
+
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+                total -= size
@@ -1,11 +1,17 @@
 """Base ADT functionality module"""
 
 import os
+import time
+import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
 from sap import get_logger
 from sap.adt.errors import HTTPRequestError
+from sap.adt.cache import CacheEntry
+from sap.adt.session import SessionState
 
 
 def mod_log():
@@ -14,12 +20,159 @@ def mod_log():
     return get_logger()
 
 
+def is_csrf_token_failure(response):
+    """Returns True if the server rejected the request because of
+       invalid or expired X-CSRF-Token
+    """
+
+    if response.status_code != 403:
+        return False
+
+    if response.headers.get('x-csrf-token', '').lower() == 'required':
+        return True
+
+    return 'CSRF token validation failed' in response.text
+
+
+# maximum number of bytes of a response body written to debug log
+LOG_BODY_LIMIT = 4096
+
+# number of bytes of streamed response bodies read at once
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def log_response(method, url, response, limit=LOG_BODY_LIMIT, stream=False):
+    """Writes the beginning of the response body to debug log without
+       decoding the whole body if debug log is disabled
+
+       The body of a streamed response is not logged because reading it
+       here would load it into memory.
+    """
+
+    logger = mod_log()
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
+    if stream:
+        logger.debug('Response %s %s: streamed %s bytes', method, url, response.headers.get('Content-Length', '?'))
+        return
+
+    content = response.content or b''
+    body = content[:limit].decode(response.encoding or 'utf-8', errors='replace')
+
+    if len(content) > limit:
+        body += f'\n... ({len(content) - limit} more bytes)'
+
+    logger.debug('Response %s %s:\n++++\n%s\n++++', method, url, body)
+
+
+def stream_position(body):
+    """Returns the current position of the file-like body which can be sent
+       again after seeking back or None for other bodies
+    """
+
+    if not hasattr(body, 'read'):
+        return None
+
+    try:
+        if body.seekable():
+            return body.tell()
+    except (AttributeError, OSError):
+        pass
+
+    return None
+
+
+class ChunkedBody:
+    """Body of unknown length sent in chunks which counts the sent bytes"""
+
+    def __init__(self, body):
+        self._body = body
+        self.bytes_sent = 0
+
+    def __iter__(self):
+        for chunk in self._body:
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+
+def is_repeatable(body, position):
+    """Returns True if the body can be sent again - it is not a stream or
+       a stream which can be rewound to the position
+    """
+
+    if hasattr(body, 'read') or hasattr(body, '__next__'):
+        return position is not None
+
+    return True
+
+
+def is_session_timeout(response):
+    """Returns True if the server terminated the HTTP session"""
+
+    if response.status_code == 440:
+        return True
+
+    if response.status_code != 400:
+        return False
+
+    text = response.text.lower()
+    return 'session timed out' in text or 'session expired' in text
+
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+RETRY_STATUS_CODES = (502, 503, 504)
+MAX_BACKOFF = 30
+DEFAULT_POOL_SIZE = 10
+
+
+class HTTPStatistics:
+    """Counters of HTTP traffic of a connection"""
+
+    def __init__(self, requests_sent=0, connections_opened=0, bytes_sent=0, bytes_received=0):
+        self.requests_sent = requests_sent
+        self.connections_opened = connections_opened
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+
+    @property
+    def connections_reused(self):
+        """Number of requests sent over an already opened connection"""
+
+        return max(self.requests_sent - self.connections_opened, 0)
+
+    def __str__(self):
+        return (f'HTTP requests: {self.requests_sent}, '
+                f'connections opened: {self.connections_opened}, '
+                f'connections reused: {self.connections_reused}, '
+                f'bytes sent: {self.bytes_sent}, '
+                f'bytes received: {self.bytes_received}')
+
+
+def count_connections(session):
+    """Returns the number of TCP connections opened by the session's adapters"""
+
+    opened = 0
+
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+
+    return opened
+
+
+# pylint: disable=too-many-instance-attributes
 class Connection:
     """ADT Connection for HTTP communication built on top Python requests.
     """
 
     # pylint: disable=too-many-arguments
-    def __init__(self, host, client, user, password, port=None, ssl=True, verify=True):
+    def __init__(self, host, client, user, password, port=None, ssl=True, verify=True, cache=None,
+                 session_store=None, max_retries=3, backoff_factor=0.5,
+                 pool_size=DEFAULT_POOL_SIZE, connect_retries=0):
         """Parameters:
             - host: string host name
             - client: string SAP client
@@ -29,6 +182,17 @@ class Connection:
                     (default 80 or 443 - it depends on the parameter ssl)
             - ssl: boolean to switch between http and https
             - verify: boolean to switch SSL validation on/off
+            - cache: sap.adt.cache.ResponseCache for GET requests or None
+            - session_store: sap.adt.session.SessionStore to reuse cookies
+                             and X-CSRF-Token of previous connections or None
+            - max_retries: how many times an idempotent request is repeated
+                           after a gateway error or a connection failure
+            - backoff_factor: the first delay in seconds before repeating
+                              the request; the delay doubles with each retry
+            - pool_size: maximum number of kept-alive connections which
+                         should be at least the number of worker threads
+            - connect_retries: how many times the HTTP adapter repeats
+                               a failed attempt to open a connection
         """
 
         if ssl:
@@ -49,6 +213,17 @@ class Connection:
         self._user = user
         self._auth = HTTPBasicAuth(user, password)
         self._session = None
+        # Worker threads share one connection, so the session must be
+        # created only once.
+        self._session_lock = threading.Lock()
+        self._cache = cache
+        self._session_store = session_store
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._pool_size = pool_size
+        self._connect_retries = connect_retries
+        self._stats = HTTPStatistics()
+        self._stats_lock = threading.Lock()
 
     @property
     def user(self):
@@ -56,6 +231,65 @@ class Connection:
 
         return self._user
 
+    @property
+    def session_key(self):
+        """Identification of the user session on the system"""
+
+        return f'{self._user}@{self._base_url}?{self._query_args}'
+
+    @property
+    def system_key(self):
+        """Identification of the system and client"""
+
+        return f'{self._base_url}?{self._query_args}'
+
+    @property
+    def statistics(self):
+        """Returns HTTPStatistics of the connection"""
+
+        with self._stats_lock:
+            stats = HTTPStatistics(requests_sent=self._stats.requests_sent,
+                                   connections_opened=self._stats.connections_opened,
+                                   bytes_sent=self._stats.bytes_sent,
+                                   bytes_received=self._stats.bytes_received)
+
+        if self._session is not None:
+            stats.connections_opened += count_connections(self._session)
+
+        return stats
+
+    # pylint: disable=unused-argument
+    def _count_response(self, response, *args, **kwargs):
+        """requests response hook updating the traffic counters
+
+           Streamed responses are counted by their header Content-Length
+           to keep their bodies unread. Chunked request bodies are counted
+           by the bytes actually sent.
+        """
+
+        request = response.request
+        body = request.body if request is not None else None
+
+        if isinstance(body, str):
+            sent = len(body.encode('utf-8'))
+        elif isinstance(body, bytes):
+            sent = len(body)
+        elif isinstance(body, ChunkedBody):
+            sent = body.bytes_sent
+        elif body is not None:
+            # streamed body
+            sent = int(request.headers.get('Content-Length', 0))
+        else:
+            sent = 0
+
+        with self._stats_lock:
+            self._stats.requests_sent += 1
+            self._stats.bytes_sent += sent
+            if kwargs.get('stream'):
+                self._stats.bytes_received += int(response.headers.get('Content-Length', 0))
+            else:
+                self._stats.bytes_received += len(response.content or b'')
+
     @property
     def uri(self):
         """ADT path for building URLs (e.g. sap/bc/adt)"""
@@ -71,8 +305,9 @@ class Connection:
             base_url=self._base_url, adt_uri=adt_uri,
             query_args=self._query_args)
 
+    # pylint: disable=too-many-arguments
     @staticmethod
-    def _execute_with_session(session, method, url, params=None, headers=None, body=None):
+    def _execute_with_session(session, method, url, params=None, headers=None, body=None, stream=False):
         """Executes the given URL using the given method in
            the common HTTP session.
         """
@@ -80,12 +315,20 @@ class Connection:
         req = requests.Request(method.upper(), url, params=params, data=body, headers=headers)
         req = session.prepare_request(req)
 
+        if req.body is not None and 'Content-Length' not in req.headers:
+            req.body = ChunkedBody(req.body)
+
         mod_log().info('Executing %s %s', method, url)
-        res = session.send(req)
+        res = session.send(req, stream=stream)
 
-        mod_log().debug('Response %s %s:\n++++\n%s\n++++', method, url, res.text)
+        log_response(method, url, res, stream=stream)
 
         if res.status_code >= 400:
+            if stream:
+                # read the error message before the connection returns to the pool
+                res.content  # pylint: disable=pointless-statement
+                res.close()
+
             raise HTTPRequestError(req, res)
 
         return res
@@ -96,41 +339,215 @@ class Connection:
            also retrieves X-CSRF-Token.
         """
 
-        if self._session is None:
-            self._session = requests.Session()
-            self._session.auth = self._auth
-            # requests.session.verify is either boolean or path to CA to use!
-            self._session.verify = os.environ.get('SAP_SSL_SERVER_CERT', self._session.verify)
+        with self._session_lock:
+            if self._session is None:
+                self._session = self._create_session()
 
-            if self._session.verify is not True:
-                mod_log().info('Using custom SSL Server cert path: SAP_SSL_SERVER_CERT = %s', self._session.verify)
-            elif self._ssl_verify is False:
-                import urllib3
-                urllib3.disable_warnings()
-                mod_log().info('SSL Server cert will not be verified: SAP_SSL_VERIFY = no')
-                self._session.verify = False
+        return self._session
 
-            url = self._build_adt_url('core/discovery')
+    def _create_session(self):
+        """Creates a new HTTP session with populated X-CSRF-Token
 
-            response = Connection._execute_with_session(self._session, 'GET', url, headers={'x-csrf-token': 'Fetch'})
+           If the session store holds a session of the user, its cookies and
+           X-CSRF-Token are reused without contacting the server.
+        """
+
+        session = requests.Session()
+        session.auth = self._auth
+
+        adapter = HTTPAdapter(pool_maxsize=self._pool_size, max_retries=self._connect_retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.hooks['response'].append(self._count_response)
+        # requests.session.verify is either boolean or path to CA to use!
+        session.verify = os.environ.get('SAP_SSL_SERVER_CERT', session.verify)
+
+        if session.verify is not True:
+            mod_log().info('Using custom SSL Server cert path: SAP_SSL_SERVER_CERT = %s', session.verify)
+        elif self._ssl_verify is False:
+            import urllib3
+            urllib3.disable_warnings()
+            mod_log().info('SSL Server cert will not be verified: SAP_SSL_VERIFY = no')
+            session.verify = False
+
+        state = None
+        if self._session_store is not None:
+            state = self._session_store.load(self.session_key)
+
+        if state is not None:
+            mod_log().info('Reusing stored HTTP session: %s', self.session_key)
+            session.cookies.update(state.cookies)
+            session.headers.update({'x-csrf-token': state.csrf_token})
+        else:
+            self._fetch_csrf_token(session)
 
-            self._session.headers.update({'x-csrf-token': response.headers['x-csrf-token']})
+        return session
 
-        return self._session
+    def _fetch_csrf_token(self, session):
+        """Populates the session with a new X-CSRF-Token"""
+
+        url = self._build_adt_url('core/discovery')
+
+        response = Connection._execute_with_session(session, 'GET', url, headers={'x-csrf-token': 'Fetch'})
+
+        session.headers.update({'x-csrf-token': response.headers['x-csrf-token']})
 
-    def execute(self, method, adt_uri, params=None, headers=None, body=None):
+        if self._session_store is not None:
+            state = SessionState(session.cookies.get_dict(), response.headers['x-csrf-token'])
+            self._session_store.save(self.session_key, state)
+
+    def _refresh_csrf_token(self, session, rejected_token):
+        """Replaces the rejected X-CSRF-Token unless another thread
+           has already done it
+        """
+
+        with self._session_lock:
+            if session.headers.get('x-csrf-token') != rejected_token:
+                return
+
+            mod_log().info('X-CSRF-Token was rejected: fetching new one')
+
+            # the stored session cookies could have expired too
+            session.cookies.clear()
+            self._fetch_csrf_token(session)
+
+    def _renew_session(self, session):
+        """Replaces the terminated session unless another thread
+           has already done it
+        """
+
+        with self._session_lock:
+            if self._session is session:
+                mod_log().info('HTTP session timed out: opening new one')
+
+                if self._session_store is not None:
+                    self._session_store.remove(self.session_key)
+
+                with self._stats_lock:
+                    self._stats.connections_opened += count_connections(session)
+
+                self._session = self._create_session()
+
+            return self._session
+
+    def _backoff(self, attempt):
+        """Sleeps before the next attempt"""
+
+        delay = min(self._backoff_factor * (2 ** attempt), MAX_BACKOFF)
+        mod_log().info('Repeating the request in %s seconds', delay)
+        time.sleep(delay)
+
+    def _execute_cached(self, session, url, params=None, headers=None):
+        """Executes the GET request conditionally if the response is cached
+           and returns the cached body if the server responds 304.
+        """
+
+        key = self._user + '@' + requests.Request('GET', url, params=params).prepare().url
+        accept = headers.get('Accept', '') if headers else ''
+
+        entry = self._cache.get(key, accept)
+        if entry is not None:
+            headers = dict(headers or {})
+            headers.update(entry.conditional_headers())
+
+        res = Connection._execute_with_session(session, 'GET', url, params=params, headers=headers)
+
+        if res.status_code == 304 and entry is not None:
+            mod_log().info('Using cached response: %s', key)
+            return entry.to_response(res)
+
+        entry = CacheEntry.from_response(res)
+        if entry is not None:
+            self._cache.put(key, accept, entry)
+
+        return res
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    def execute(self, method, adt_uri, params=None, headers=None, body=None, stream=False):
         """Executes the given ADT URI as an HTTP request and returns
            the requests response object
+
+           The body can be also a file-like object or a generator of bytes
+           which are streamed. Failed requests are repeated only if
+           the stream can be rewound.
+
+           If stream is True, the response body is not downloaded until
+           it is read via iter_content() and the caller must close
+           the response. Cached GET requests ignore stream.
         """
 
         session = self._get_session()
 
         url = self._build_adt_url(adt_uri)
 
-        return Connection._execute_with_session(session, method, url, params=params, headers=headers, body=body)
+        position = stream_position(body)
+        repeatable = is_repeatable(body, position)
+
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        csrf_refreshed = False
+        session_renewed = False
+        attempt = 0
+
+        while True:
+            if position is not None:
+                body.seek(position)
+
+            try:
+                return self._execute_request(session, method, url, params=params, headers=headers, body=body,
+                                             stream=stream)
+            except HTTPRequestError as ex:
+                if not repeatable:
+                    raise
+
+                if is_csrf_token_failure(ex.response) and not csrf_refreshed:
+                    self._refresh_csrf_token(session, ex.request.headers.get('x-csrf-token'))
+                    csrf_refreshed = True
+                elif is_session_timeout(ex.response) and not session_renewed:
+                    session = self._renew_session(session)
+                    session_renewed = True
+                elif idempotent and ex.response.status_code in RETRY_STATUS_CODES and attempt < self._max_retries:
+                    self._backoff(attempt)
+                    attempt += 1
+                else:
+                    raise
+            except requests.exceptions.ConnectionError:
+                if not repeatable or not idempotent or attempt >= self._max_retries:
+                    raise
+
+                self._backoff(attempt)
+                attempt += 1
+
+    # pylint: disable=too-many-arguments
+    def _execute_request(self, session, method, url, params=None, headers=None, body=None, stream=False):
+        """Executes the request either directly or through the cache"""
+
+        if self._cache is not None and method.upper() == 'GET':
+            return self._execute_cached(session, url, params=params, headers=headers)
+
+        return Connection._execute_with_session(session, method, url, params=params, headers=headers, body=body,
+                                                stream=stream)
 
     def get_text(self, relativeuri):
         """Executes a GET HTTP request with the headers Accept = text/plain.
         """
 
         return self.execute('GET', relativeuri, headers={'Accept': 'text/plain'}).text
+
+    def download_text(self, relativeuri, dest, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """Executes a GET HTTP request with the headers Accept = text/plain
+           and writes the response body in chunks to the binary file-like
+           object dest without keeping the whole body in memory.
+        """
+
+        res = self.execute('GET', relativeuri, headers={'Accept': 'text/plain'}, stream=True)
+
+        if res.raw is None:
+            # responses built from the cache have no connection to stream from
+            dest.write(res.content)
+            return
+
+        try:
+            for chunk in res.iter_content(chunk_size):
+                dest.write(chunk)
+        finally:
+            res.close()
@@ -1,11 +1,11 @@
 """CTS object proxies"""
 
-import xml.sax
 from xml.sax.handler import ContentHandler
 
 from typing import NamedTuple, Any, List
 
 from sap.adt.core import mod_log
+from sap.adt.xmlparser import parse_string
 
 
 # pylint: disable=too-few-public-methods
@@ -261,6 +261,6 @@ class Workbench:
 
         builder = WorkbenchBuilder(self._connection)
         xml_handler = WorkbenchResponseHandler(builder)
-        xml.sax.parseString(resp.text, xml_handler)
+        parse_string(resp.text, xml_handler)
 
         return builder.transports
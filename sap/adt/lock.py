@@ -0,0 +1,76 @@
+"""Locks shared by several editors of ADT objects"""
+
+import collections
+
+from sap.adt.core import mod_log
+from sap.errors import SAPCliError
+
+
+class LockSession:
+    """Locks objects once and shares their lock handles among all editors
+       opened in the session; the objects are unlocked together when
+       the session is closed.
+
+       Objects are identified by their URIs, hence class includes
+       share the lock of their class.
+
+       with LockSession() as session:
+           with session.open_editor(Class.Include.definitions(clas)) as editor:
+               editor.write(definitions)
+
+           with session.open_editor(Class.Include.implementations(clas)) as editor:
+               editor.write(implementations)
+    """
+
+    def __init__(self):
+        self._locked = collections.OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.close()
+        except SAPCliError:
+            # do not replace the error which left the session
+            if exc_type is None:
+                raise
+
+    def lock(self, obj):
+        """Returns the lock handle of the object and locks the object
+           if it has not been locked in this session yet
+        """
+
+        try:
+            return self._locked[obj.uri][1]
+        except KeyError:
+            pass
+
+        lock_handle = obj.lock()
+        self._locked[obj.uri] = (obj, lock_handle)
+
+        return lock_handle
+
+    def open_editor(self, obj, corrnr=None):
+        """Creates editor of the object which does not unlock the object"""
+
+        return obj.open_editor(lock_handle=self.lock(obj), corrnr=corrnr, unlock=False)
+
+    def close(self):
+        """Unlocks all objects locked in this session in the reverse order
+           and re-raises the first error after trying to unlock the others
+        """
+
+        error = None
+
+        while self._locked:
+            _, (obj, lock_handle) = self._locked.popitem()
+
+            try:
+                obj.unlock(lock_handle)
+            except SAPCliError as ex:
+                mod_log().debug('Failed to unlock %s: %s', obj.uri, ex)
+                error = error or ex
+
+        if error is not None:
+            raise error
@@ -1,51 +1,61 @@
 """Convert Python Objects to ADT XML entities"""
 
-from functools import partial
+from io import StringIO, TextIOWrapper, BufferedIOBase, RawIOBase
+from functools import partial, lru_cache
 
-import xml.sax
+from xml.sax.saxutils import escape
 from xml.sax.handler import ContentHandler
 
 from sap import get_logger
 from sap.adt.annotations import XmlAttributeProperty, XmlElementProperty
+from sap.adt.xmlparser import parse_string, debug_log
 
 
-class Element:
-    """XML element representation"""
+_ATTRIBUTE_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}
 
-    def __init__(self, name):
-        self._name = name
-        self._children = []
-        self._attributes = {}
 
-    @property
-    def name(self):
-        """Element name"""
+class StreamWriter:
+    """Writes XML elements to a text sink (anything with the method write)
+       as they come without building any document tree
+    """
 
-        return self._name
+    def __init__(self, dest):
+        self._dest = dest
+        # [name, has children] of the started elements
+        self._started = []
 
-    @property
-    def children(self):
-        """Child elements"""
+    def declaration(self):
+        """Writes XML declaration"""
 
-        return self._children
+        self._dest.write('<?xml version="1.0" encoding="UTF-8"?>\n')
 
-    @property
-    def attributes(self):
-        """Element attributes"""
+    def start(self, name, attributes):
+        """Writes the start tag of a child of the current element"""
 
-        return self._attributes
+        if self._started:
+            parent = self._started[-1]
+            if parent[1]:
+                self._dest.write('\n')
+            else:
+                self._dest.write('>\n')
+                parent[1] = True
 
-    def add_child(self, name):
-        """Adds a new child element and return it"""
+        self._dest.write(f'<{name}')
 
-        child = Element(name)
-        self._children.append(child)
-        return child
+        for key, value in attributes.items():
+            self._dest.write(f' {key}="{escape(str(value), _ATTRIBUTE_ENTITIES)}"')
 
-    def add_attribute(self, name, value):
-        """Adds a new attribute or change the value"""
+        self._started.append([name, False])
 
-        self._attributes[name] = value
+    def end(self):
+        """Writes the end tag of the current element"""
+
+        name, has_children = self._started.pop()
+
+        if has_children:
+            self._dest.write(f'\n</{name}>')
+        else:
+            self._dest.write('/>')
 
 
 def adt_object_to_element_name(adt_object):
@@ -63,6 +73,46 @@ def factory_with_setter(factory, setter, obj):
     return product
 
 
+# pylint: disable=too-few-public-methods
+class MarshalPlan:
+    """XML annotated properties of a class in the order of declaration"""
+
+    def __init__(self, cls):
+        # properties to be serialized
+        self.serialized_attributes = []
+        self.serialized_elements = []
+        # element properties to be deserialized
+        self.elements = []
+        # attribute properties to be deserialized by XML names
+        self.attributes = {}
+
+        for attr_name in cls.__ordered__:
+            if attr_name.startswith('__'):
+                continue
+
+            attr = getattr(cls, attr_name)
+
+            if isinstance(attr, XmlElementProperty):
+                if not attr_name.startswith('_'):
+                    self.serialized_elements.append(attr)
+
+                if attr.deserialize:
+                    self.elements.append(attr)
+            elif isinstance(attr, XmlAttributeProperty):
+                if not attr_name.startswith('_') and attr.serialize:
+                    self.serialized_attributes.append(attr)
+
+                if attr.deserialize:
+                    self.attributes[attr.name] = attr
+
+
+@lru_cache(maxsize=None)
+def marshal_plan(cls):
+    """Returns MarshalPlan of the class which is built only once"""
+
+    return MarshalPlan(cls)
+
+
 class ElementHandler:
     """XML element desirialization"""
 
@@ -82,52 +132,37 @@ class ElementHandler:
     def set(self, attr_name, value):
         """Sets object's property value"""
 
-        get_logger().debug('Going to set XML attribute property: %s', attr_name)
         try:
-            self.attributes[attr_name].__set__(self.obj, value)
-            get_logger().debug('Set XML attribute property: %s', attr_name)
+            attr = self.attributes[attr_name]
+        except KeyError:
+            return
+
+        try:
+            attr.__set__(self.obj, value)
         except AttributeError as ex:
             get_logger().error('XML property %s: %s', attr_name, str(ex))
-        except KeyError:
-            get_logger().debug('Not an XML attribute property: %s', attr_name)
 
     def load_definitions(self, obj):
-        """Examines annotations of the current object"""
-
-        attributes = dict()
-        for attr_name in obj.__class__.__ordered__:
-            if attr_name.startswith('__'):
-                continue
-
-            attr = getattr(obj.__class__, attr_name)
-
-            if isinstance(attr, XmlElementProperty):
-                xml_path = f'{self.my_xpath}/{attr.name}'
-
-                if not attr.deserialize:
-                    get_logger().debug('Found readonly XML element property: %s -> %s', attr_name, xml_path)
-                    continue
+        """Registers handlers of child elements of the current object
+           and returns its deserializable attributes
+        """
 
-                get_logger().debug('Found XML element property: %s -> %s', attr_name, xml_path)
+        plan = marshal_plan(obj.__class__)
 
-                factory = attr.factory
+        for attr in plan.elements:
+            xml_path = f'{self.my_xpath}/{attr.name}'
 
-                if factory is None:
-                    factory = partial(attr.__get__, obj)
+            factory = attr.factory
 
-                if attr.fset is not None:
-                    factory = partial(factory_with_setter, factory, attr.__set__, obj)
+            if factory is None:
+                factory = partial(attr.__get__, obj)
 
-                self.elements[xml_path] = ElementHandler(xml_path, self.elements, factory)
-            elif isinstance(attr, XmlAttributeProperty):
-                if not attr.deserialize:
-                    get_logger().debug('Found readonly XML attribute property: %s -> %s', attr_name, attr.name)
-                    continue
+            if attr.fset is not None:
+                factory = partial(factory_with_setter, factory, attr.__set__, obj)
 
-                get_logger().debug('Found XML attribute property: %s -> %s', attr_name, attr.name)
-                attributes[attr.name] = attr
+            self.elements[xml_path] = ElementHandler(xml_path, self.elements, factory)
 
-        return attributes
+        return plan.attributes
 
 
 class ADTObjectSAXHandler(ContentHandler):
@@ -136,31 +171,38 @@ class ADTObjectSAXHandler(ContentHandler):
     def __init__(self, elements):
         super(ADTObjectSAXHandler, self).__init__()
 
+        self._debug = debug_log(get_logger())
+
         self.stack = list()
         self.current = ''
         self.elements = elements
+        # (parent path, name) -> path to avoid building the same strings
+        self._paths = {}
 
     def startElement(self, name, attrs):
         self.stack.append(self.current)
-        self.current = f'{self.current}/{name}'
-        get_logger().debug('Encountered XML element: %s', self.current)
+
+        try:
+            self.current = self._paths[(self.current, name)]
+        except KeyError:
+            path = f'{self.current}/{name}'
+            self._paths[(self.current, name)] = path
+            self.current = path
+
+        self._debug('Encountered XML element: %s', self.current)
 
         try:
             handler = self.elements[self.current]
         except KeyError:
             return
 
-        get_logger().debug('Deserializing element: %s', self.current)
+        self._debug('Deserializing element: %s', self.current)
 
         # this loads handlers for children elements!! /o\
         handler.new()
 
         for attr_name, value in attrs.items():
-            get_logger().debug('Encountered XML attribute: %s', attr_name)
-            try:
-                handler.set(attr_name, value)
-            except KeyError:
-                pass
+            handler.set(attr_name, value)
 
     def endElement(self, name):
         self.current = self.stack.pop()
@@ -169,11 +211,42 @@ class ADTObjectSAXHandler(ContentHandler):
 class Marshal:
     """ADT object marshaling"""
 
-    def serialize(self, adt_object):
-        """Serialized ADT Object"""
+    def serialize(self, adt_object, dest=None):
+        """Serializes ADT Object to the text or binary (UTF-8) stream dest
+           or returns the XML string if dest is None
+        """
+
+        if dest is None:
+            buffer = StringIO()
+            self.serialize(adt_object, dest=buffer)
+            return buffer.getvalue()
+
+        if isinstance(dest, (BufferedIOBase, RawIOBase)):
+            wrapper = TextIOWrapper(dest, encoding='utf-8', newline='')
+            try:
+                self.serialize(adt_object, dest=wrapper)
+                wrapper.flush()
+            finally:
+                wrapper.detach()
+
+            return None
+
+        writer = StreamWriter(dest)
+        writer.declaration()
+
+        objtype = adt_object.objtype
+        xmlns = objtype.xmlnamespace
 
-        tree = self._object_to_tree(adt_object)
-        return self._tree_to_xml(tree)
+        attributes = {f'xmlns:{xmlns.name}': xmlns.uri}
+
+        if xmlns.name != 'adtcore':
+            attributes['xmlns:adtcore'] = 'http://www.sap.com/adt/core'
+
+        if objtype.code is not None:
+            attributes['adtcore:type'] = objtype.code
+
+        self._write_element(writer, adt_object_to_element_name(adt_object), adt_object, attributes)
+        return None
 
     @staticmethod
     def deserialize(xml_text, adt_object):
@@ -188,76 +261,36 @@ class Marshal:
         elements[name] = handler
 
         parser = ADTObjectSAXHandler(elements)
-        xml.sax.parseString(xml_text, parser)
+        parse_string(xml_text, parser)
 
         return adt_object
 
-    def _object_to_tree(self, adt_object):
-        """Create a DOM like representation of the given ADT object"""
+    def _write_element(self, writer, name, obj, attributes=None):
+        """Writes the element of the ADT Object member"""
 
-        objtype = adt_object.objtype
-        name = adt_object_to_element_name(adt_object)
-
-        root = Element(name)
-        xmlns = objtype.xmlnamespace
-
-        root.add_attribute(f'xmlns:{xmlns.name}', xmlns.uri)
-
-        if xmlns.name != 'adtcore':
-            root.add_attribute('xmlns:adtcore', 'http://www.sap.com/adt/core')
-
-        if objtype.code is not None:
-            root.add_attribute('adtcore:type', objtype.code)
-
-        self._build_tree(root, adt_object)
-        return root
-
-    def _build_tree(self, root, obj):
-        """Convert ADT Object members to XML elements"""
+        attributes = {} if attributes is None else attributes
 
         if obj is None:
+            writer.start(name, attributes)
+            writer.end()
             return
 
-        for attr_name in obj.__class__.__ordered__:
-            if attr_name.startswith('_'):
-                continue
+        plan = marshal_plan(obj.__class__)
 
-            attr = getattr(obj.__class__, attr_name)
+        for attr in plan.serialized_attributes:
+            value = attr.fget(obj)
+            if value is not None:
+                attributes[attr.name] = value
 
-            if isinstance(attr, XmlElementProperty):
-                child = getattr(obj, attr_name)
-                new_element = partial(root.add_child, attr.name)
-
-                if isinstance(child, list):
-                    for item in child:
-                        self._build_tree(new_element(), item)
-                else:
-                    self._build_tree(new_element(), child)
-            elif isinstance(attr, XmlAttributeProperty):
-                value = getattr(obj, attr_name)
-                if value is not None:
-                    root.add_attribute(attr.name, value)
-
-    def _tree_to_xml(self, tree):
-        """Turn the given abstract XML tree to XML string"""
-
-        body = '<?xml version="1.0" encoding="UTF-8"?>\n'
+        writer.start(name, attributes)
 
-        return body + self._element_to_xml(tree)
+        for attr in plan.serialized_elements:
+            child = attr.fget(obj)
 
-    def _element_to_xml(self, tree):
-        """ """
-
-        xml_str = f'<{tree.name}'
-
-        attributes = ' '.join(f'{key}="{value}"' for key, value in tree.attributes.items())
-        if attributes:
-            xml_str += f' {attributes}'
-
-        children = '\n'.join((self._element_to_xml(child) for child in tree.children))
-        if children:
-            xml_str += f'>\n{children}\n</{tree.name}>'
-        else:
-            xml_str += '/>'
+            if isinstance(child, list):
+                for item in child:
+                    self._write_element(writer, attr.name, item)
+            else:
+                self._write_element(writer, attr.name, child)
 
-        return xml_str
+        writer.end()
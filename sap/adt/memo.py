@@ -0,0 +1,56 @@
+"""Opt-in memoization and streamed downloads of source texts of ADT objects"""
+
+
+class TextMemo:
+    """Mixin keeping the source text downloaded by the property text
+       if enabled via memoize_text() and downloading the text from
+       the property text_uri directly to a file
+
+       prog = Program(connection, 'ZHELLO').memoize_text()
+       if prog.text != local:   # downloads the source
+           digest(prog.text)    # no request
+
+       Editors writing the source call refresh() so the next access
+       downloads the new source.
+    """
+
+    _memoize_text = False
+    _text_memo = None
+
+    def memoize_text(self, enabled=True):
+        """Enables or disables memoization of the source text and returns self"""
+
+        self._memoize_text = enabled
+        self._text_memo = None
+
+        return self
+
+    def refresh(self):
+        """Forgets the memoized source text"""
+
+        self._text_memo = None
+
+    def download_text(self, dest):
+        """Writes the source text as sent by the server to the binary
+           file-like object dest in chunks; the memoized text is written
+           UTF-8 encoded if available
+        """
+
+        if self._text_memo is not None:
+            dest.write(self._text_memo.encode('utf-8'))
+        else:
+            # pylint: disable=no-member
+            self.connection.download_text(self.text_uri, dest)
+
+    def _memoized_text(self, download):
+        """Returns the memoized source text or the text returned by the function download"""
+
+        if self._text_memo is not None:
+            return self._text_memo
+
+        text = download()
+
+        if self._memoize_text:
+            self._text_memo = text
+
+        return text
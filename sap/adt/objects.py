@@ -9,6 +9,7 @@ from sap.errors import SAPCliError
 
 import sap.adt.marshalling
 from sap.adt.annotations import xml_attribute, xml_element
+from sap.adt.memo import TextMemo
 
 
 LOCK_ACCESS_MODE_MODIFY = 'MODIFY'
@@ -78,7 +79,7 @@ class ADTObjectType:
         self._xmlname = xmlname
         self._editor_factory = editor_factory
 
-    def open_editor(self, instance, lock_handle, corrnr=None):
+    def open_editor(self, instance, lock_handle, corrnr=None, unlock=True):
         """Returns a new instance of Editor for this object type
            and raises SAPCliError if the object type does not allow modifications.
         """
@@ -86,7 +87,7 @@ class ADTObjectType:
         if self._editor_factory is None:
             raise SAPCliError(f'Object {self._code}: modifications are not supported')
 
-        return self._editor_factory(instance, lock_handle, corrnr=corrnr)
+        return self._editor_factory(instance, lock_handle, corrnr=corrnr, unlock=unlock)
 
     @property
     def code(self):
@@ -274,7 +275,7 @@ class ADTCoreData:
 
 
 # pylint: disable=too-many-public-methods
-class ADTObject(metaclass=OrderedClassMembers):
+class ADTObject(TextMemo, metaclass=OrderedClassMembers):
     """Abstract base class for ADT objects
     """
 
@@ -288,6 +289,7 @@ class ADTObject(metaclass=OrderedClassMembers):
         self._connection = connection
         self._name = name
         self._active_status = active_status
+        self._changed_at = None
 
         self._metadata = metadata if metadata is not None else ADTCoreData()
 
@@ -407,16 +409,19 @@ class ADTObject(metaclass=OrderedClassMembers):
 
         return '/' + self._connection.uri + '/' + self.uri
 
+    @property
+    def text_uri(self):
+        """URI of text representation of the SAP Object"""
+
+        return self.uri + self.objtype.get_uri_for_type('text/plain')
+
     @property
     def text(self):
         """Downloads text representation of the SAP Object
-           if the MIME Type 'text/plain'.
+           if the MIME Type 'text/plain'; see memoize_text().
         """
 
-        text_uri = self.objtype.get_uri_for_type('text/plain')
-
-        return self._connection.get_text('{objuri}{text_uri}'.format(
-            objuri=self.uri, text_uri=text_uri))
+        return self._memoized_text(lambda: self._connection.get_text(self.text_uri))
 
     @xml_attribute('adtcore:version')
     def active(self):
@@ -430,6 +435,18 @@ class ADTObject(metaclass=OrderedClassMembers):
 
         self._active_status = value
 
+    @xml_attribute('adtcore:changedAt', serialize=False)
+    def changed_at(self):
+        """Time stamp of the last change"""
+
+        return self._changed_at
+
+    @changed_at.setter
+    def changed_at(self, value):
+        """Time stamp of the last change"""
+
+        self._changed_at = value
+
     @xml_element('adtcore:packageRef')
     def reference(self):
         """The object's package reference"""
@@ -495,7 +512,7 @@ class ADTObject(metaclass=OrderedClassMembers):
             }
         )
 
-    def open_editor(self, lock_handle=None, corrnr=None):
+    def open_editor(self, lock_handle=None, corrnr=None, unlock=True):
         """Creates editor and returns its instance
 
            The given lock_handle is passed to the new editor's instance.
@@ -505,27 +522,32 @@ class ADTObject(metaclass=OrderedClassMembers):
            unlocked by the editor itself.
 
            The given corrnr is passed to the new editor's instance.
+
+           If unlock is False, the editor does not unlock the object
+           when leaving its context (see sap.adt.lock.LockSession).
         """
 
         if lock_handle is None:
             lock_handle = self.lock()
 
-        return self.objtype.open_editor(self, lock_handle, corrnr=corrnr)
+        return self.objtype.open_editor(self, lock_handle, corrnr=corrnr, unlock=unlock)
 
 
 class ADTObjectEditor:
     """Base Editor for ADT Object which implements common functionality"""
 
-    def __init__(self, obj, lock_handle, corrnr=None):
+    def __init__(self, obj, lock_handle, corrnr=None, unlock=True):
         self._obj = obj
         self._lock_handle = lock_handle
         self._corrnr = corrnr
+        self._unlock = unlock
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self._obj.unlock(self.lock_handle)
+        if self._unlock:
+            self._obj.unlock(self.lock_handle)
 
     @property
     def uri(self):
@@ -596,7 +618,14 @@ class ADTObjectSourceEditor(ADTObjectEditor):
         return {'Content-Type': 'text/plain; charset=utf-8'}
 
     def write(self, content):
-        """Changes Source Code of the source object"""
+        """Changes Source Code of the source object
+
+           The content can be a string, UTF-8 encoded bytes or a binary
+           file-like object which is sent without reading it into memory.
+        """
+
+        if isinstance(content, str):
+            content = content.encode('utf-8')
 
         text_uri = self.uri + self.get_uri_for_type('text/plain')
 
@@ -607,6 +636,8 @@ class ADTObjectSourceEditor(ADTObjectEditor):
             headers=self.get_headers(),
             body=content)
 
+        self._obj.refresh()
+
         mod_log().debug("Write text response status: %i", resp.status_code)
 
 
@@ -695,7 +726,7 @@ class Class(OOADTObjectBase):
         editor_factory=ADTObjectSourceEditorWithResponse
     )
 
-    class Include(metaclass=OrderedClassMembers):
+    class Include(TextMemo, metaclass=OrderedClassMembers):
         """Class includes"""
 
         DefinitionsMetadata = ClassIncludeMetadata(
@@ -780,11 +811,17 @@ class Class(OOADTObjectBase):
 
             return self._metadata.include_type
 
+        @property
+        def text_uri(self):
+            """Returns URI of the include's source code"""
+
+            return f'{self.uri}{self._metadata.source_uri}'
+
         @property
         def text(self):
-            """Returns text"""
+            """Returns text; see memoize_text()"""
 
-            return self._clas.connection.get_text(f'{self.uri}{self._metadata.source_uri}')
+            return self._memoized_text(lambda: self._clas.connection.get_text(self.text_uri))
 
         def lock(self):
             """Calls parent's lock() for Class's open_editor()"""
@@ -796,13 +833,44 @@ class Class(OOADTObjectBase):
 
             return self._clas.unlock(lock_handle)
 
-        def open_editor(self, lock_handle=None, corrnr=None):
+        def open_editor(self, lock_handle=None, corrnr=None, unlock=True):
             """Changes source codes"""
 
             if lock_handle is None:
                 lock_handle = self.lock()
 
-            return self._clas.objtype.open_editor(self, lock_handle=lock_handle, corrnr=corrnr)
+            return self._clas.objtype.open_editor(self, lock_handle=lock_handle, corrnr=corrnr, unlock=unlock)
+
+    class IncludeVersion(metaclass=OrderedClassMembers):
+        """Version of a class include as listed in the class metadata"""
+
+        def __init__(self):
+            self._include_type = None
+            self._changed_at = None
+
+        @xml_attribute('class:includeType')
+        def include_type(self):
+            """ADT Class include type"""
+
+            return self._include_type
+
+        @include_type.setter
+        def include_type(self, value):
+            """ADT Class include type"""
+
+            self._include_type = value
+
+        @xml_attribute('adtcore:changedAt', serialize=False)
+        def changed_at(self):
+            """Time stamp of the last change"""
+
+            return self._changed_at
+
+        @changed_at.setter
+        def changed_at(self, value):
+            """Time stamp of the last change"""
+
+            self._changed_at = value
 
     def __init__(self, connection, name, package=None, metadata=None):
         super(Class, self).__init__(connection, name, metadata)
@@ -812,6 +880,7 @@ class Class(OOADTObjectBase):
         self._definitions = None
         self._implementations = None
         self._test_classes = None
+        self._include_versions = []
         self._fixpntar = None
         self._final = 'true'
         self._visibility = 'public'
@@ -858,6 +927,22 @@ class Class(OOADTObjectBase):
 
         return self.test_classes
 
+    @xml_element('class:include')
+    def _new_include_version(self):
+        """Creates new list item for deserialization of included sources"""
+
+        version = Class.IncludeVersion()
+        self._include_versions.append(version)
+        return version
+
+    @property
+    def include_versions(self):
+        """Dictionary of include types and their last change time stamps
+           populated by fetch()
+        """
+
+        return {version.include_type: version.changed_at for version in self._include_versions}
+
     @xml_element('class:superClassRef')
     def super_class(self):
         """Super Class reference"""
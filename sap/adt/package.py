@@ -2,6 +2,7 @@
 
 from types import SimpleNamespace
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # pylint: disable=unused-import
 from sap.adt.objects import OrderedClassMembers
@@ -200,28 +201,63 @@ class Package(ADTObject):
         self._appcomp.name = name
 
 
-def walk(package):
-    """Returns the same structure as python os.walk"""
+def _read_package_nodes(repository, package):
+    """Returns names of sub-packages and objects of the package"""
+
+    root_node = repository.read_node(package)
+
+    subpackages = [subpkg.OBJECT_NAME for subpkg in root_node.objects]
+
+    nodekeys = [objtyp.NODE_ID for objtyp in root_node.types if objtyp.OBJECT_TYPE != 'DEVC/K']
+    if nodekeys:
+        objects_node = repository.read_node(package, nodekeys=nodekeys)
+        objects = [SimpleNamespace(typ=obj.OBJECT_TYPE, name=obj.OBJECT_NAME) for obj in objects_node.objects]
+    else:
+        objects = []
+
+    return (subpackages, objects)
+
+
+def walk(package, jobs=1):
+    """Returns the same structure as python os.walk
+
+       If jobs is greater than 1, packages are read by the given number of
+       threads as soon as their parent packages are known while the results
+       are still yielded in the same order.
+    """
 
     repository = Repository(package.connection)
+    executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+
+    def read_ahead(explored):
+        if executor is None:
+            return None
+
+        return executor.submit(_read_package_nodes, repository, explored)
 
-    # This is a queue of tuples (Package, list) where the list holds path of
-    # package names from the top package + 1 to the current one
-    toexplore = deque(((package, []), ))
+    # This is a queue of tuples (Package, list, Future) where the list holds
+    # path of package names from the top package + 1 to the current one and
+    # the future is None if the package has not been read ahead
+    toexplore = deque(((package, [], read_ahead(package)), ))
 
-    while toexplore:
-        explored, path = toexplore.pop()
-        root_node = repository.read_node(explored)
+    try:
+        while toexplore:
+            explored, path, future = toexplore.pop()
 
-        subpackages = [subpkg.OBJECT_NAME for subpkg in root_node.objects]
+            if future is None:
+                subpackages, objects = _read_package_nodes(repository, explored)
+            else:
+                subpackages, objects = future.result()
 
-        nodekeys = [objtyp.NODE_ID for objtyp in root_node.types if objtyp.OBJECT_TYPE != 'DEVC/K']
-        if nodekeys:
-            objects_node = repository.read_node(explored, nodekeys=nodekeys)
-            objects = [SimpleNamespace(typ=obj.OBJECT_TYPE, name=obj.OBJECT_NAME) for obj in objects_node.objects]
-        else:
-            objects = []
+            for subpkg in subpackages:
+                subpackage = Package(package.connection, subpkg)
+                toexplore.appendleft((subpackage, path + [subpkg], read_ahead(subpackage)))
 
-        toexplore.extendleft(((Package(package.connection, subpkg), path + [subpkg]) for subpkg in subpackages))
+            yield (path, subpackages, objects)
+    finally:
+        if executor is not None:
+            # the consumer may stop iterating before all packages are read
+            for _, _, future in toexplore:
+                future.cancel()
 
-        yield (path, subpackages, objects)
+            executor.shutdown(wait=True)
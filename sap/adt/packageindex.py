@@ -0,0 +1,178 @@
+"""Local SQLite index of ABAP package hierarchies
+
+The index stores results of sap.adt.package.walk and answers listings,
+reverse lookups of owning packages and searches of objects by name prefix
+without asking the server.
+"""
+
+import time
+import sqlite3
+from types import SimpleNamespace
+from collections import deque
+
+from sap import get_logger
+
+
+def mod_log():
+    """ADT Module logger"""
+
+    return get_logger()
+
+
+DEFAULT_TTL = 24 * 60 * 60
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS packages (
+    system TEXT NOT NULL,
+    name TEXT NOT NULL,
+    parent TEXT,
+    position INTEGER NOT NULL,
+    indexed_at REAL NOT NULL,
+    PRIMARY KEY (system, name)
+);
+CREATE INDEX IF NOT EXISTS packages_parent ON packages (system, parent);
+CREATE TABLE IF NOT EXISTS objects (
+    system TEXT NOT NULL,
+    package TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_package ON objects (system, package);
+CREATE INDEX IF NOT EXISTS objects_name ON objects (system, name);
+'''
+
+
+class PackageIndex:
+    """Packages, their sub-packages and objects stored in a SQLite database
+       where the entries are considered outdated after ttl seconds
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        """Parameters:
+            - path: SQLite database file; created if it does not exist
+            - ttl: number of seconds the indexed packages are valid
+                   or None for entries which never expire
+        """
+
+        self._ttl = ttl
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        """Closes the database"""
+
+        self._db.close()
+
+    def _oldest_valid(self):
+        if self._ttl is None:
+            return float('-inf')
+
+        return time.time() - self._ttl
+
+    def _package_row(self, system, name):
+        return self._db.execute('SELECT parent, position, indexed_at FROM packages WHERE system = ? AND name = ?',
+                                (system, name)).fetchone()
+
+    def _subpackages(self, system, name):
+        return [row[0] for row in self._db.execute(
+            'SELECT name FROM packages WHERE system = ? AND parent = ? ORDER BY position',
+            (system, name))]
+
+    def _objects(self, system, name):
+        return [SimpleNamespace(typ=row[0], name=row[1]) for row in self._db.execute(
+            'SELECT type, name FROM objects WHERE system = ? AND package = ? ORDER BY position',
+            (system, name))]
+
+    def _delete_tree(self, system, name):
+        for subpkg in self._subpackages(system, name):
+            self._delete_tree(system, subpkg)
+
+        self._db.execute('DELETE FROM objects WHERE system = ? AND package = ?', (system, name))
+        self._db.execute('DELETE FROM packages WHERE system = ? AND name = ?', (system, name))
+
+    def is_fresh(self, system, name):
+        """Returns True if the package is indexed and the entry has not
+           expired yet
+        """
+
+        row = self._package_row(system, name)
+        return row is not None and row[2] >= self._oldest_valid()
+
+    def update(self, system, name, walk_iter):
+        """Replaces the indexed tree of the package name by results of
+           sap.adt.package.walk started from the package
+        """
+
+        indexed_at = time.time()
+
+        with self._db:
+            row = self._package_row(system, name)
+            parent, position = (None, 0) if row is None else row[:2]
+
+            self._delete_tree(system, name)
+            self._db.execute('INSERT INTO packages VALUES (?, ?, ?, ?, ?)',
+                             (system, name, parent, position, indexed_at))
+
+            for path, subpackages, objects in walk_iter:
+                package = path[-1] if path else name
+
+                self._db.executemany('INSERT OR REPLACE INTO packages VALUES (?, ?, ?, ?, ?)',
+                                     ((system, subpkg, package, i, indexed_at)
+                                      for i, subpkg in enumerate(subpackages)))
+
+                self._db.execute('DELETE FROM objects WHERE system = ? AND package = ?', (system, package))
+                self._db.executemany('INSERT INTO objects VALUES (?, ?, ?, ?, ?)',
+                                     ((system, package, i, obj.typ, obj.name) for i, obj in enumerate(objects)))
+
+        mod_log().debug('Indexed the package %s in %.3f s', name, time.time() - indexed_at)
+
+    def walk(self, system, name):
+        """Returns the same structure as sap.adt.package.walk"""
+
+        # This is a queue of tuples (package name, list) where the list holds
+        # path of package names from the top package + 1 to the current one
+        toexplore = deque(((name, []), ))
+
+        while toexplore:
+            explored, path = toexplore.popleft()
+
+            subpackages = self._subpackages(system, explored)
+            toexplore.extend((subpkg, path + [subpkg]) for subpkg in subpackages)
+
+            yield (path, subpackages, self._objects(system, explored))
+
+    def owners(self, system, name, typ=None):
+        """Returns objects of the given name, and optionally type, with
+           their packages in valid entries
+        """
+
+        query = '''SELECT o.package, o.type, o.name FROM objects o
+                   JOIN packages p ON p.system = o.system AND p.name = o.package
+                   WHERE o.system = ? AND o.name = ? AND p.indexed_at >= ?'''
+        params = [system, name, self._oldest_valid()]
+
+        if typ is not None:
+            query += ' AND o.type = ?'
+            params.append(typ)
+
+        return [SimpleNamespace(package=row[0], typ=row[1], name=row[2])
+                for row in self._db.execute(query + ' ORDER BY o.package, o.type', params)]
+
+    def find(self, system, prefix):
+        """Returns objects whose names start with the prefix with their
+           packages in valid entries
+        """
+
+        query = '''SELECT o.package, o.type, o.name FROM objects o
+                   JOIN packages p ON p.system = o.system AND p.name = o.package
+                   WHERE o.system = ? AND o.name >= ? AND p.indexed_at >= ?'''
+        params = [system, prefix, self._oldest_valid()]
+
+        if prefix:
+            # a range instead of LIKE to make use of the index of names
+            query += ' AND o.name < ?'
+            params.append(prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+        return [SimpleNamespace(package=row[0], typ=row[1], name=row[2])
+                for row in self._db.execute(query + ' ORDER BY o.name, o.type, o.package', params)]
@@ -1,10 +1,10 @@
 """ADT Repository wrappers"""
 
 from types import SimpleNamespace
-import xml.sax
 from xml.sax.handler import ContentHandler
 
 from sap import get_logger
+from sap.adt.xmlparser import parse_string, debug_log
 
 
 def mod_log():
@@ -19,6 +19,8 @@ class NodeStructureXMLHandler(ContentHandler):
     def __init__(self):
         super(NodeStructureXMLHandler, self).__init__()
 
+        self._debug = debug_log(mod_log())
+
         self.tree_content = list()
         self.categories = list()
         self.object_types = list()
@@ -32,41 +34,41 @@ class NodeStructureXMLHandler(ContentHandler):
         self._property = None
 
     def startElement(self, name, attrs):
-        mod_log().debug('XML: start: %s', name)
+        self._debug('XML: start: %s', name)
 
         if name in ['asx:abap', 'asx:values', 'DATA', 'TREE_CONTENT', 'CATEGORIES', 'OBJECT_TYPES']:
             return
 
         if name in self._lists.keys():
-            mod_log().debug('XML: new object: %s', name)
+            self._debug('XML: new object: %s', name)
             self._object = SimpleNamespace()
         else:
-            mod_log().debug('XML: object property: %s', name)
+            self._debug('XML: object property: %s', name)
             self._property = name
 
     def characters(self, content):
         if self._property is None:
             return
 
-        mod_log().debug('XML: object property value: %s', content)
+        self._debug('XML: object property value: %s', content)
         setattr(self._object, self._property, content)
 
     def endElement(self, name):
         if name != self._property:
             try:
                 self._lists[name].append(self._object)
-                mod_log().debug('XML: complete object: %s', name)
+                self._debug('XML: complete object: %s', name)
                 self._object = None
             except KeyError:
                 pass
         else:
             if not hasattr(self._object, self._property):
-                mod_log().debug('XML: object property value: <empty>')
+                self._debug('XML: object property value: <empty>')
                 setattr(self._object, self._property, '')
 
             self._property = None
 
-        mod_log().debug('XML: end: %s', name)
+        self._debug('XML: end: %s', name)
 
 
 def nodekeys_list_table(nodekeys):
@@ -112,6 +114,6 @@ class Repository:
             return SimpleNamespace(objects=[], types=[], categories=[])
 
         parser = NodeStructureXMLHandler()
-        xml.sax.parseString(resp.text, parser)
+        parse_string(resp.text, parser)
 
         return SimpleNamespace(objects=parser.tree_content, types=parser.object_types, categories=parser.categories)
@@ -0,0 +1,87 @@
+"""Persistent store of HTTP session cookies and CSRF tokens"""
+
+import os
+import json
+import tempfile
+import threading
+
+from sap import get_logger
+
+
+def mod_log():
+    """ADT Module logger"""
+
+    return get_logger()
+
+
+# pylint: disable=too-few-public-methods
+class SessionState:
+    """Cookies and CSRF token of an HTTP session"""
+
+    def __init__(self, cookies, csrf_token):
+        self.cookies = cookies
+        self.csrf_token = csrf_token
+
+
+class SessionStore:
+    """JSON file readable only by its owner where sessions are stored
+       under keys identifying the user and the system.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        """Session file path"""
+
+        return self._path
+
+    def _read(self):
+        try:
+            with open(self._path, 'r', encoding='utf-8') as source:
+                return json.load(source)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as ex:
+            mod_log().info('Ignoring broken session file %s: %s', self._path, str(ex))
+            return {}
+
+    def _write(self, sessions):
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+
+        # mkstemp creates the file with the mode 0600
+        handle, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(handle, 'w', encoding='utf-8') as dest:
+            json.dump(sessions, dest)
+
+        os.replace(tmp_path, self._path)
+
+    def load(self, key):
+        """Returns the stored SessionState or None"""
+
+        with self._lock:
+            data = self._read().get(key)
+
+        if data is None:
+            return None
+
+        return SessionState(data['cookies'], data['csrf_token'])
+
+    def save(self, key, state):
+        """Stores the SessionState"""
+
+        with self._lock:
+            sessions = self._read()
+            sessions[key] = {'cookies': state.cookies, 'csrf_token': state.csrf_token}
+            self._write(sessions)
+
+    def remove(self, key):
+        """Forgets the stored session"""
+
+        with self._lock:
+            sessions = self._read()
+            if sessions.pop(key, None) is not None:
+                self._write(sessions)
@@ -222,9 +222,9 @@ def activation_params(pre_audit_requested=True):
     return {'method': 'activate', 'preauditRequested': str(pre_audit_requested).lower()}
 
 
-def _send_activate(adt_object, request, params):
+def _send_activate(connection, request, params):
 
-    return adt_object.connection.execute(
+    return connection.execute(
         'POST',
         'activation',
         params=params,
@@ -236,18 +236,49 @@ def _send_activate(adt_object, request, params):
     )
 
 
-def activate(adt_object):
-    """Activates the given object"""
+def _activate_references(connection, references):
+    """Activates the referenced objects and their inactive children
+       returned by the preaudit and returns the last response
+    """
 
-    request = IOCObjecReferences([IOCReference(uri=adt_object.full_adt_uri, name=adt_object.name.upper())])
-    resp = _send_activate(adt_object, request, activation_params(pre_audit_requested=True))
+    request = IOCObjecReferences(references)
+    resp = _send_activate(connection, request, activation_params(pre_audit_requested=True))
 
     if 'application/vnd.sap.adt.inactivectsobjects.v1+xml' in resp.headers.get('Content-Type', ''):
         ioc = Marshal.deserialize(resp.text, IOCList())
         get_logger().debug(ioc.entries)
         request = IOCObjecReferences([entry.object.reference for entry in ioc.entries
                                       if entry.object is not None and entry.object.deleted == 'false'])
-        resp = _send_activate(adt_object, request, activation_params(pre_audit_requested=False))
+        resp = _send_activate(connection, request, activation_params(pre_audit_requested=False))
+
+    return resp
+
+
+def _object_reference(adt_object):
+    return IOCReference(uri=adt_object.full_adt_uri, name=adt_object.name.upper())
+
+
+def activate(adt_object):
+    """Activates the given object"""
+
+    resp = _activate_references(adt_object.connection, [_object_reference(adt_object)])
 
     if resp.text:
         raise SAPCliError(f'Could not activate the object {adt_object.name}: {resp.text}')
+
+
+def activate_many(adt_objects):
+    """Activates the given objects together in one activation request
+       (two requests if the preaudit returns inactive objects)
+    """
+
+    adt_objects = list(adt_objects)
+    if not adt_objects:
+        return
+
+    references = [_object_reference(adt_object) for adt_object in adt_objects]
+    resp = _activate_references(adt_objects[0].connection, references)
+
+    if resp.text:
+        names = ', '.join(adt_object.name for adt_object in adt_objects)
+        raise SAPCliError(f'Could not activate the objects {names}: {resp.text}')
@@ -0,0 +1,259 @@
+"""XML parser backends feeding xml.sax.handler.ContentHandler like objects
+
+The handlers implement only the methods startElement(name, attrs),
+endElement(name) and characters(content) and get qualified element and
+attribute names (e.g. adtcore:name) as the namespace unaware xml.sax parser
+reports them.
+
+Backends:
+  - expat: pyexpat parser calling the handler directly (default)
+  - lxml: lxml.etree.iterparse if lxml is installed; undeclared namespace
+          prefixes are accepted as by the other backends
+  - sax: the pure standard library xml.sax.parseString
+"""
+
+import os
+import logging
+from io import BytesIO
+from functools import lru_cache
+
+import xml.sax
+from xml.sax.xmlreader import Locator
+
+from sap import get_logger
+
+
+BACKENDS = ('expat', 'lxml', 'sax')
+
+
+def mod_log():
+    """XML Parser Module logger"""
+
+    return get_logger()
+
+
+def _ignore(*_args):
+    pass
+
+
+def debug_log(logger):
+    """Returns the method debug of the logger or a function doing nothing
+       if debug messages are disabled, so handlers do not check the log
+       level in every callback
+    """
+
+    if logger.isEnabledFor(logging.DEBUG):
+        return logger.debug
+
+    return _ignore
+
+
+class ErrorLocator(Locator):
+    """Position of a parser error"""
+
+    def __init__(self, line, column):
+        self._line = line
+        self._column = column
+
+    def getLineNumber(self):
+        return self._line
+
+    def getColumnNumber(self):
+        return self._column
+
+
+def parse_error(ex, line, column):
+    """Converts a backend error into xml.sax.SAXParseException"""
+
+    return xml.sax.SAXParseException(str(ex), ex, ErrorLocator(line, column))
+
+
+def parse_with_sax(xml_text, handler):
+    """Parses the XML with xml.sax.parseString"""
+
+    xml.sax.parseString(xml_text, handler)
+
+
+def parse_with_expat(xml_text, handler):
+    """Parses the XML with the pyexpat parser"""
+
+    # pylint: disable=import-outside-toplevel
+    from xml.parsers import expat
+
+    parser = expat.ParserCreate()
+    # report adjacent text in one call like lxml does
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.startElement
+    parser.EndElementHandler = handler.endElement
+    parser.CharacterDataHandler = handler.characters
+
+    try:
+        parser.Parse(xml_text, True)
+    except expat.ExpatError as ex:
+        raise parse_error(ex, ex.lineno, ex.offset) from ex
+
+
+class _LxmlEventEmitter:
+    """Converts lxml.etree.iterparse events into ContentHandler calls"""
+
+    def __init__(self, handler):
+        self._handler = handler
+        # [element, last finished child, qualified name] of the open elements
+        self._stack = []
+        self._declarations = {}
+
+    @staticmethod
+    def _qualified(name, prefixes):
+        if name[0] != '{':
+            return name
+
+        uri, local = name[1:].split('}', 1)
+        prefix = prefixes.get(uri)
+
+        return f'{prefix}:{local}' if prefix else local
+
+    def _text(self, content):
+        if content:
+            self._handler.characters(content)
+
+    def _flush_parent(self):
+        if not self._stack:
+            return
+
+        parent = self._stack[-1]
+        if parent[1] is None:
+            self._text(parent[0].text)
+        else:
+            self._text(parent[1].tail)
+            parent[1].clear()
+
+    def declare(self, prefix, uri):
+        """Remembers a namespace declaration of the next element"""
+
+        self._declarations[prefix] = uri
+
+    def start(self, element):
+        """Emits startElement"""
+
+        self._flush_parent()
+
+        attrs = {}
+        for prefix, uri in self._declarations.items():
+            attrs[f'xmlns:{prefix}' if prefix else 'xmlns'] = uri
+        self._declarations = {}
+
+        if element.attrib:
+            prefixes = {uri: prefix for prefix, uri in element.nsmap.items()}
+
+            for key, value in element.attrib.items():
+                attrs[self._qualified(key, prefixes)] = value
+
+        local = element.tag.rsplit('}', 1)[-1]
+        name = f'{element.prefix}:{local}' if element.prefix else local
+
+        self._handler.startElement(name, attrs)
+        self._stack.append([element, None, name])
+
+    def end(self, element):
+        """Emits characters and endElement"""
+
+        _, last_child, name = self._stack.pop()
+        if last_child is None:
+            self._text(element.text)
+        else:
+            self._text(last_child.tail)
+            last_child.clear()
+
+        self._handler.endElement(name)
+
+        if self._stack:
+            self._stack[-1][1] = element
+
+
+def parse_with_lxml(xml_text, handler):
+    """Parses the XML with lxml.etree.iterparse"""
+
+    # pylint: disable=import-outside-toplevel,import-error
+    from lxml import etree
+
+    if isinstance(xml_text, str):
+        xml_text = xml_text.encode('utf-8')
+
+    emitter = _LxmlEventEmitter(handler)
+
+    # lxml is namespace aware and rejects undeclared prefixes which
+    # the other backends pass through as parts of qualified names;
+    # in the recover mode, lxml keeps such names too and only logs them
+    context = etree.iterparse(BytesIO(xml_text), events=('start-ns', 'start', 'end'), recover=True)
+
+    try:
+        for event, data in context:
+            if event == 'start-ns':
+                emitter.declare(*data)
+            elif event == 'start':
+                emitter.start(data)
+            else:
+                emitter.end(data)
+    except etree.XMLSyntaxError as ex:
+        raise parse_error(ex, ex.lineno, ex.offset) from ex
+
+    for error in context.error_log:
+        if error.domain != etree.ErrorDomains.NAMESPACE and error.level >= etree.ErrorLevels.ERROR:
+            raise xml.sax.SAXParseException(error.message, None, ErrorLocator(error.line, error.column))
+
+
+@lru_cache(maxsize=None)
+def _lxml_available():
+    try:
+        # pylint: disable=import-outside-toplevel,import-error,unused-import
+        from lxml import etree  # noqa: F401
+    except ImportError:
+        return False
+
+    return True
+
+
+@lru_cache(maxsize=None)
+def _expat_available():
+    try:
+        # pylint: disable=import-outside-toplevel,unused-import
+        from xml.parsers import expat  # noqa: F401
+    except ImportError:
+        return False
+
+    return True
+
+
+_BACKEND_FUNCTIONS = {
+    'expat': parse_with_expat,
+    'lxml': parse_with_lxml,
+    'sax': parse_with_sax
+}
+
+
+def resolve_backend(name=None):
+    """Returns the name of an available backend - the given one,
+       the one configured by the environment variable SAP_XML_PARSER or expat
+    """
+
+    if name is None:
+        name = os.environ.get('SAP_XML_PARSER', 'expat').lower()
+
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown XML parser backend: {name}')
+
+    if name == 'lxml' and not _lxml_available():
+        mod_log().debug('lxml is not installed - falling back to expat')
+        name = 'expat'
+
+    if name == 'expat' and not _expat_available():
+        mod_log().debug('pyexpat is not available - falling back to sax')
+        name = 'sax'
+
+    return name
+
+
+def parse_string(xml_text, handler, backend=None):
+    """Parses the XML string or bytes and feeds the handler"""
+
+    _BACKEND_FUNCTIONS[resolve_backend(backend)](xml_text, handler)
@@ -5,6 +5,10 @@ This module provides a facade for use of adt and rfc from cli.
 Dependency modules are lazy loaded to enable partial modular installation.
 """
 
+import os
+
+from sap.errors import SAPCliError
+
 
 class CommandsCache:
     """Cached of available commands"""
@@ -44,15 +48,63 @@ class CommandsCache:
         return CommandsCache.adt
 
 
+def environ_int(name, default, minimum=0):
+    """Returns the integer value of the environment variable or the default
+       value if the variable is not set or empty
+    """
+
+    value = os.environ.get(name)
+    if not value:
+        return default
+
+    try:
+        number = int(value)
+    except ValueError:
+        number = None
+
+    if number is None or number < minimum:
+        raise SAPCliError(
+            f'The environment variable {name} must be an integer >= {minimum}: {value}')
+
+    return number
+
+
 def adt_connection_from_args(args):
     """Returns ADT connection constructed from the passed args (Namespace)
     """
 
     import sap.adt
 
+    cache = None
+    cache_dir = os.environ.get('SAP_HTTP_CACHE_DIR')
+    if cache_dir:
+        import sap.adt.cache
+
+        max_size = environ_int('SAP_HTTP_CACHE_SIZE', None, minimum=1)
+        max_size = max_size * 1024 * 1024 if max_size else sap.adt.cache.DEFAULT_MAX_SIZE
+
+        cache = sap.adt.cache.ResponseCache(cache_dir, max_size=max_size)
+
+    session_store = None
+    session_file = os.environ.get('SAP_SESSION_FILE')
+    if session_file:
+        import sap.adt.session
+
+        session_store = sap.adt.session.SessionStore(session_file)
+
+    max_retries = environ_int('SAP_HTTP_MAX_RETRIES', 3)
+    pool_size = environ_int('SAP_HTTP_POOL_SIZE', sap.adt.core.DEFAULT_POOL_SIZE, minimum=1)
+    connect_retries = environ_int('SAP_HTTP_CONNECT_RETRIES', 0)
+
+    # concurrent workers of the commands with --jobs must not wait
+    # for a connection nor open a new one after every request
+    pool_size = max(pool_size, getattr(args, 'jobs', 1))
+
     return sap.adt.Connection(
         args.ashost, args.client, args.user, args.password,
-        port=args.port, ssl=args.ssl, verify=args.verify)
+        port=args.port, ssl=args.ssl, verify=args.verify, cache=cache,
+        session_store=session_store, max_retries=max_retries,
+        pool_size=pool_size, connect_retries=connect_retries)
 
 
 def get_commands():
@@ -1,11 +1,16 @@
 """ADT proxy for ABAP Unit"""
 
 import sys
+import json
+import subprocess
 from xml.sax.saxutils import escape
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import sap.adt
 import sap.adt.aunit
+import sap.adt.package
 import sap.cli.core
+import sap.cli.object
 from sap.errors import SAPCliError
 
 
@@ -68,7 +73,7 @@ def print_junit4(run_results, args, stream):
     """Print results to stream in the form of JUnit"""
 
     print('<?xml version="1.0" encoding="UTF-8" ?>', file=stream)
-    print(f'<testsuites name="{args.name}">', file=stream)
+    print(f'<testsuites name="{" ".join(args.name)}">', file=stream)
 
     critical = 0
     for program in run_results.programs:
@@ -142,13 +147,189 @@ def print_raw(aunit_xml, run_results):
     return critical
 
 
+def split_packages(connection, packages, jobs=1):
+    """Returns programs, classes and function groups of the packages
+       and their sub-packages; other objects are reported as skipped
+    """
+
+    factories = {
+        'PROG/P': sap.adt.Program,
+        'CLAS/OC': sap.adt.Class,
+        'FUGR/F': sap.adt.FunctionGroup,
+    }
+
+    objects = []
+    for package in packages:
+        for _, _, package_objects in sap.adt.package.walk(package, jobs=jobs):
+            for obj in package_objects:
+                try:
+                    objects.append(factories[obj.typ](connection, obj.name))
+                except KeyError:
+                    print(f'Skipped object: {obj.typ} {obj.name}', file=sys.stderr)
+
+    return objects
+
+
+def changed_object_names(revision):
+    """Returns names of objects whose source files in the current git
+       repository differ from the given revision and were not deleted
+    """
+
+    try:
+        diff = subprocess.run(['git', 'diff', '--name-only', '--diff-filter=d', revision, '--'],
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    except FileNotFoundError as ex:
+        raise SAPCliError(f'Could not run git: {ex}') from ex
+    except subprocess.CalledProcessError as ex:
+        raise SAPCliError(f'Could not list files changed since {revision}: {ex.stderr.strip()}') from ex
+
+    names = set()
+    for filepath in diff.stdout.splitlines():
+        try:
+            name, _ = sap.cli.object.object_name_from_source_file(filepath)
+        except sap.cli.core.InvalidCommandLineError:
+            # not an object file - e.g. .abapgit.xml
+            continue
+
+        # abapGit replaces slashes of namespaces with hashes
+        names.add(name.upper().replace('#', '/'))
+
+    return names
+
+
+def load_dependency_map(path):
+    """Reads the JSON object mapping object names to lists of names
+       of objects whose tests must run if the object has changed
+    """
+
+    try:
+        with open(path, 'r', encoding='utf-8') as source:
+            dependencies = json.load(source)
+    except (OSError, ValueError) as ex:
+        raise SAPCliError(f'Could not read the dependency map {path}: {ex}') from ex
+
+    return {name.upper(): [dependent.upper() for dependent in dependents]
+            for name, dependents in dependencies.items()}
+
+
+def add_dependent_objects(names, dependencies):
+    """Returns the names extended with all direct and indirect dependents"""
+
+    selected = set(names)
+    toexplore = list(names)
+
+    while toexplore:
+        for dependent in dependencies.get(toexplore.pop(), []):
+            if dependent not in selected:
+                selected.add(dependent)
+                toexplore.append(dependent)
+
+    return selected
+
+
+def build_test_runs(objects, jobs, run_size=None):
+    """Splits the objects into lists of objects tested in one test run
+       keeping their order; without run_size the objects are spread
+       evenly over the given number of jobs
+    """
+
+    if not objects:
+        return []
+
+    if run_size is None:
+        run_size = -(-len(objects) // jobs)
+
+    return [objects[start:start + run_size] for start in range(0, len(objects), run_size)]
+
+
+def format_test_run(test_run):
+    """Returns the list of tested objects as a string"""
+
+    return ', '.join(str(obj) for obj in test_run)
+
+
+def execute_test_run(aunit, test_run):
+    """Executes the test run and returns the response and the caught error"""
+
+    try:
+        return (aunit.execute(test_run), None)
+    except sap.cli.core.OBJECT_ERRORS as ex:
+        return (None, ex)
+
+
+def execute_test_runs_parallel(aunit, test_runs, jobs):
+    """Executes concurrent test runs and returns the responses of
+       the successful runs and the number of failed runs.
+
+       Errors are reported in the order of the given test runs to keep
+       the output deterministic.
+    """
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(execute_test_run, aunit, test_run): idx for idx, test_run in enumerate(test_runs)}
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            idx = futures[future]
+            print(f'[{done}/{len(test_runs)}] {format_test_run(test_runs[idx])}', file=sys.stderr)
+            results[idx] = future.result()
+
+    responses = []
+    failed = 0
+    for idx, test_run in enumerate(test_runs):
+        response, error = results[idx]
+
+        if error is not None:
+            print(f'Failed to run ABAP Unit tests of {format_test_run(test_run)}: {error}', file=sys.stderr)
+            failed += 1
+        else:
+            responses.append(response)
+
+    return (responses, failed)
+
+
+def build_tested_objects(connection, typ, args):
+    """Returns the objects given on the command line where packages are
+       split and only changed objects are kept if requested
+    """
+
+    objects = [typ(connection, name) for name in args.name]
+
+    if (args.split_package or args.changed_since is not None) and args.type == 'package':
+        objects = split_packages(connection, objects, jobs=args.jobs)
+
+    if args.changed_since is not None:
+        selected = changed_object_names(args.changed_since)
+
+        if args.dependency_map is not None:
+            selected = add_dependent_objects(selected, load_dependency_map(args.dependency_map))
+
+        objects = [obj for obj in objects if obj.name.upper() in selected]
+        print(f'Objects changed since {args.changed_since}: {len(objects)}', file=sys.stderr)
+
+    return objects
+
+
+@CommandGroup.argument_jobs('Number of test runs executed concurrently')
+@CommandGroup.argument('--run-size', type=sap.cli.core.positive_int, default=None,
+                       help='Maximum number of objects tested in one test run; default=all objects spread over jobs')
+@CommandGroup.argument('--dependency-map', default=None,
+                       help='JSON file mapping object names to names of objects to test if the object has changed')
+@CommandGroup.argument('--changed-since', default=None, metavar='REVISION',
+                       help='Test only objects whose files differ from the git revision; implies --split-package')
+@CommandGroup.argument('--split-package', action='store_true', default=False,
+                       help='Test programs and classes of the packages and their sub-packages instead of the packages')
 @CommandGroup.argument('--output', choices=['raw', 'human', 'junit4'], default='human')
-@CommandGroup.argument('name')
+@CommandGroup.argument('name', nargs='+')
 @CommandGroup.argument('type', choices=['program', 'class', 'package'])
 @CommandGroup.command()
 def run(connection, args):
     """Prints it out based on command line configuration.
 
+       The objects are tested in one test run per job and the results
+       are merged into one report. The exit code is the number of
+       critical tests plus the number of failed test runs.
+
        Exceptions:
          - SAPCliError:
            - when the given type does not belong to the type white list
@@ -160,18 +341,39 @@ def run(connection, args):
     except KeyError:
         raise SAPCliError(f'Unknown type: {args.type}')
 
+    if args.split_package and args.type != 'package':
+        raise sap.cli.core.InvalidCommandLineError('Only packages can be split')
+
+    if args.dependency_map is not None and args.changed_since is None:
+        raise sap.cli.core.InvalidCommandLineError('The dependency map can be used only with --changed-since')
+
+    objects = build_tested_objects(connection, typ, args)
+    test_runs = build_test_runs(objects, args.jobs, run_size=args.run_size)
+
+    if args.output == 'raw' and len(test_runs) > 1:
+        # concatenated XML documents would not be well-formed
+        raise sap.cli.core.InvalidCommandLineError(
+            f'The raw output needs all objects in one test run but there are {len(test_runs)}: '
+            'use --jobs 1 without --run-size')
+
     aunit = sap.adt.AUnit(connection)
-    obj = typ(connection, args.name)
-    response = aunit.execute(obj)
-    run_results = sap.adt.aunit.parse_run_results(response.text)
+    failed = 0
+
+    if args.jobs > 1:
+        responses, failed = execute_test_runs_parallel(aunit, test_runs, args.jobs)
+    else:
+        responses = [aunit.execute(test_run) for test_run in test_runs]
+
+    run_results = sap.adt.aunit.merge_run_results(
+        sap.adt.aunit.parse_run_results(response.text) for response in responses)
 
     if args.output == 'human':
-        return print_results_to_stream(run_results, sys.stdout)
+        return print_results_to_stream(run_results, sys.stdout) + failed
 
     if args.output == 'raw':
-        return print_raw(response.text, run_results)
+        return print_raw(''.join(response.text for response in responses), run_results) + failed
 
     if args.output == 'junit4':
-        return print_junit4(run_results, args, sys.stdout)
+        return print_junit4(run_results, args, sys.stdout) + failed
 
     raise SAPCliError(f'Unsupported output type: {args.output}')
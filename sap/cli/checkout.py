@@ -2,6 +2,10 @@
 
 import os
 import sys
+import json
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import sap.adt
 import sap.cli.core
@@ -19,6 +23,67 @@ class CommandGroup(sap.cli.core.CommandGroup):
         super(CommandGroup, self).__init__('checkout')
 
 
+MANIFEST_FILE = '.sapcli-manifest.json'
+
+
+class CheckoutManifest:
+    """Versions of downloaded source files stored in a JSON file
+       to allow skipping of files which have not changed since
+       the last checkout.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._basedir = os.path.dirname(path)
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, 'r', encoding='utf-8') as source:
+                self._versions = json.load(source)
+        except FileNotFoundError:
+            self._versions = {}
+        except (OSError, ValueError) as ex:
+            # e.g. truncated by an interrupted checkout - download everything
+            print(f'Ignoring broken manifest {path}: {ex}', file=sys.stderr)
+            self._versions = {}
+
+    @property
+    def path(self):
+        """Manifest file path"""
+
+        return self._path
+
+    def _key(self, filename):
+        return os.path.relpath(os.path.abspath(filename), self._basedir)
+
+    def is_current(self, filename, version):
+        """Returns True if the file exists and was downloaded
+           in the given version
+        """
+
+        if version is None or not os.path.isfile(filename):
+            return False
+
+        with self._lock:
+            return self._versions.get(self._key(filename)) == version
+
+    def update(self, filename, version):
+        """Records the downloaded version of the file"""
+
+        if version is None:
+            return
+
+        with self._lock:
+            self._versions[self._key(filename)] = version
+
+    def save(self):
+        """Writes the manifest to its file"""
+
+        with self._lock:
+            with open(self._path, 'w', encoding='utf-8') as dest:
+                json.dump(self._versions, dest, indent=1, sort_keys=True)
+
+
 def build_filename(object_name, typsfx, fileext, destdir=None):
     """Creates file name"""
 
@@ -43,12 +108,35 @@ def dump_attributes_to_file(object_name, abap_attributes, typsfx, ag_serializer,
         writer.close()
 
 
-def download_abap_source(object_name, source_object, typsfx, destdir=None):
-    """Reads the text and saves it in the corresponding file"""
+# pylint: disable=too-many-arguments
+def download_abap_source(object_name, source_object, typsfx, destdir=None, version=None, manifest=None):
+    """Streams the text to a temporary file which then replaces
+       the corresponding file, so the file is never left half-written
+
+       If the manifest says the file has already been downloaded in the
+       given version, the text is not read at all.
+    """
 
     filename = build_filename(object_name, typsfx, 'abap', destdir=destdir)
-    with open(filename, 'w') as dest:
-        dest.write(source_object.text)
+
+    if manifest is not None and manifest.is_current(filename, version):
+        return
+
+    partname = filename + '.part'
+
+    try:
+        with open(partname, 'wb') as dest:
+            source_object.download_text(dest)
+
+        os.replace(partname, filename)
+    except BaseException:
+        if os.path.exists(partname):
+            os.remove(partname)
+
+        raise
+
+    if manifest is not None:
+        manifest.update(filename, version)
 
 
 def build_class_abap_attributes(clas):
@@ -70,27 +158,83 @@ def build_class_abap_attributes(clas):
     return vseoclass
 
 
-def checkout_class(connection, name, destdir=None):
-    """Download entire class"""
+def checkout_class(connection, name, destdir=None, manifest=None, jobs=1):
+    """Download entire class
+
+       ADT does not offer a request returning all class sources at once,
+       hence the includes are downloaded by at most jobs concurrent
+       requests. The class metadata are read in parallel with the includes
+       too unless the manifest needs the versions of the includes before
+       the download.
+
+       Checkout of many objects runs the classes in its own workers and
+       leaves jobs=1 to keep the number of opened connections bounded.
+    """
 
     clas = sap.adt.Class(connection, name)
-    clas.fetch()
 
-    download_abap_source(name, clas, '.clas', destdir=destdir)
-    download_abap_source(name, clas.definitions, '.clas.locals_def', destdir=destdir)
-    download_abap_source(name, clas.implementations, '.clas.locals_imp', destdir=destdir)
-    download_abap_source(name, clas.test_classes, '.clas.testclasses', destdir=destdir)
+    sources = [('main', clas, '.clas'),
+               ('definitions', clas.definitions, '.clas.locals_def'),
+               ('implementations', clas.implementations, '.clas.locals_imp'),
+               ('testclasses', clas.test_classes, '.clas.testclasses')]
+
+    if jobs > 1:
+        download_class_sources_parallel(clas, sources, destdir, min(jobs, len(sources) + 1), manifest)
+    else:
+        clas.fetch()
+        versions = class_source_versions(clas, manifest)
+
+        for include, source, typsfx in sources:
+            download_abap_source(name, source, typsfx, destdir=destdir,
+                                 version=versions.get(include), manifest=manifest)
 
     vseoclass = build_class_abap_attributes(clas)
     dump_attributes_to_file(name, (vseoclass,), '.clas', 'LCL_OBJECT_CLAS', destdir=destdir)
 
 
+def class_source_versions(clas, manifest):
+    """Returns the versions of the fetched class includes
+       if the manifest needs them
+    """
+
+    if manifest is None:
+        return {}
+
+    versions = clas.include_versions
+    versions.setdefault('main', clas.changed_at)
+
+    return versions
+
+
+def download_class_sources_parallel(clas, sources, destdir, jobs, manifest):
+    """Downloads the class sources (include, source, type suffix) and
+       reads the class metadata by a pool of workers
+    """
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        if manifest is None:
+            versions = {}
+            futures = [executor.submit(clas.fetch)]
+        else:
+            clas.fetch()
+            versions = class_source_versions(clas, manifest)
+            futures = []
+
+        futures.extend(executor.submit(download_abap_source, clas.name, source, typsfx, destdir=destdir,
+                                       version=versions.get(include), manifest=manifest)
+                       for include, source, typsfx in sources)
+
+        for future in futures:
+            future.result()
+
+
+@CommandGroup.argument_jobs('Number of class includes downloaded concurrently')
 @CommandGroup.argument('name')
 @CommandGroup.command('class')
 def abapclass(connection, args):
     """Download all class sources command wrapper"""
 
-    checkout_class(connection, args.name.upper())
+    checkout_class(connection, args.name.upper(), jobs=args.jobs)
 
 
 def build_program_abap_attributes(adt_program):
@@ -112,13 +256,14 @@ def build_program_abap_attributes(adt_program):
     return (progdir, tpool)
 
 
-def checkout_program(connection, name, destdir=None):
+def checkout_program(connection, name, destdir=None, manifest=None):
     """Download program sources"""
 
     adt_program = sap.adt.Program(connection, name)
     adt_program.fetch()
 
-    download_abap_source(name, adt_program, '.prog', destdir=destdir)
+    download_abap_source(name, adt_program, '.prog', destdir=destdir,
+                         version=adt_program.changed_at, manifest=manifest)
 
     progdir, tpool = build_program_abap_attributes(adt_program)
     dump_attributes_to_file(name, (progdir, tpool), '.prog', 'LCL_OBJECT_PROG', destdir=destdir)
@@ -148,13 +293,14 @@ def build_interface_abap_attributes(adt_intf):
     return vseointerf
 
 
-def checkout_interface(connection, name, destdir=None):
+def checkout_interface(connection, name, destdir=None, manifest=None):
     """Download interface sources"""
 
     intf = sap.adt.Interface(connection, name)
     intf.fetch()
 
-    download_abap_source(name, intf, '.intf', destdir=destdir)
+    download_abap_source(name, intf, '.intf', destdir=destdir,
+                         version=intf.changed_at, manifest=manifest)
 
     vseointerf = build_interface_abap_attributes(intf)
     dump_attributes_to_file(name, (vseointerf,), '.prog', 'LCL_OBJECT_INTF', destdir=destdir)
@@ -168,8 +314,105 @@ def interface(connection, args):
     checkout_interface(connection, args.name.upper())
 
 
-def checkout_objects(connection, objects, destdir=None):
-    """Checkout all objects from the give list"""
+# pylint: disable=too-many-arguments
+def checkout_object(checkouter, connection, obj, destdir, manifest):
+    """Calls the checkouter and returns the caught error or None"""
+
+    try:
+        checkouter(connection, obj.name, destdir, manifest=manifest)
+    except sap.cli.core.OBJECT_ERRORS as ex:
+        return ex
+
+    return None
+
+
+class CheckoutPool:
+    """Pool of workers downloading objects over the shared connection
+       which can live as long as the whole command, so objects of all
+       packages are downloaded by the same workers.
+
+       Progress and errors are reported per submitted list of objects;
+       the errors in the order of the list once all its objects are done.
+    """
+
+    def __init__(self, connection, jobs, manifest=None):
+        self._connection = connection
+        self._manifest = manifest
+        self._executor = ThreadPoolExecutor(max_workers=jobs)
+        self._lock = threading.Lock()
+        self._futures = []
+        self._failed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def failed(self):
+        """The number of objects that could not be checked out"""
+
+        with self._lock:
+            return self._failed
+
+    def submit(self, tasks, destdir):
+        """Schedules download of the tasks (object, checkouter) into destdir"""
+
+        batch = {'done': 0, 'errors': {}}
+
+        for idx, (obj, checkouter) in enumerate(tasks):
+            future = self._executor.submit(checkout_object, checkouter, self._connection, obj, destdir,
+                                           self._manifest)
+            future.add_done_callback(functools.partial(self._report, tasks, batch, idx))
+            self._futures.append(future)
+
+    def _report(self, tasks, batch, idx, future):
+        error = future.exception()
+        if error is None:
+            error = future.result()
+
+        obj = tasks[idx][0]
+
+        with self._lock:
+            batch['done'] += 1
+            print(f'[{batch["done"]}/{len(tasks)}] {obj.typ} {obj.name}', file=sys.stderr)
+
+            if error is not None:
+                batch['errors'][idx] = error
+
+            if batch['done'] < len(tasks):
+                return
+
+            for failed_idx in sorted(batch['errors']):
+                obj = tasks[failed_idx][0]
+                print(f'Failed to checkout {obj.typ} {obj.name}: {batch["errors"][failed_idx]}', file=sys.stderr)
+
+            self._failed += len(batch['errors'])
+
+    def close(self):
+        """Waits for all submitted objects and re-raises unexpected errors"""
+
+        self._executor.shutdown(wait=True)
+
+        for future in self._futures:
+            future.result()
+
+
+# pylint: disable=too-many-arguments
+def checkout_objects(connection, objects, destdir=None, jobs=1, manifest=None, pool=None):
+    """Checkout all objects from the give list and returns the number of
+       objects that could not be checked out.
+
+       If jobs is greater than 1, the objects are downloaded concurrently
+       and a failure of one object does not stop the others.
+
+       If pool is given, the objects are only submitted to it and
+       the failures are counted by the pool.
+
+       If manifest is given, sources whose version has not changed since
+       the last checkout are not downloaded again.
+    """
 
     # This could be a global variable but it breaks mock patching in tests
     checkouters = {
@@ -181,12 +424,28 @@ def checkout_objects(connection, objects, destdir=None):
     if not os.path.isdir(destdir):
         os.makedirs(destdir)
 
+    tasks = []
     for obj in objects:
         try:
-            checkouters[obj.typ](connection, obj.name, destdir)
+            tasks.append((obj, checkouters[obj.typ]))
         except KeyError:
             print(f'Unsupported object: {obj.typ} {obj.name}', file=sys.stderr)
 
+    if pool is not None:
+        pool.submit(tasks, destdir)
+        return 0
+
+    if jobs > 1:
+        with CheckoutPool(connection, jobs, manifest=manifest) as own_pool:
+            own_pool.submit(tasks, destdir)
+
+        return own_pool.failed
+
+    for obj, checkouter in tasks:
+        checkouter(connection, obj.name, destdir, manifest=manifest)
+
+    return 0
+
 
 def make_repo_dir_for_package(args):
     """Creates and populates the directory to checkout the package into."""
@@ -225,22 +484,19 @@ def checkout_package(connection, name, destdir=None):
     dump_attributes_to_file('package', (devc,), '.devc', 'LCL_OBJECT_DEVC', destdir=destdir)
 
 
-# @CommandGroup.argument('--folder-logic', choices=['full', 'prefix'], default='prefix')
-@CommandGroup.argument('--recursive', action='store_true', default=False)
-@CommandGroup.argument('--starting-folder', default='src')
-@CommandGroup.argument('directory', nargs='?', default=None,
-                       help='To checkout the package into it; default=<PACKAGE NAME>')
-@CommandGroup.argument('name')
-@CommandGroup.command()
-def package(connection, args):
-    """Download sources of objects from the given ABAP package"""
-
-    repo_dir = make_repo_dir_for_package(args)
-    source_code_dir = os.path.join(repo_dir, args.starting_folder)
+def checkout_package_tree(connection, args, source_code_dir, manifest=None, pool=None):
+    """Checks out the package and with args.recursive its sub-packages
+       and returns the number of objects that could not be checked out
+       unless the objects are submitted to the pool
+    """
 
     explored = sap.adt.Package(connection, args.name)
+    failed = 0
+
+    # sub-packages are read ahead only if they are checked out too
+    walk_jobs = args.jobs if args.recursive else 1
 
-    for package_name_hier, _, objects in sap.adt.package.walk(explored):
+    for package_name_hier, _, objects in sap.adt.package.walk(explored, jobs=walk_jobs):
         destdir = os.path.abspath(source_code_dir)
 
         if len(package_name_hier) == 1:
@@ -254,8 +510,59 @@ def package(connection, args):
         else:
             package_name = package_name_hier[-1]
 
-        checkout_objects(connection, objects, destdir=destdir)
+        failed += checkout_objects(connection, objects, destdir=destdir, jobs=args.jobs, manifest=manifest,
+                                   pool=pool)
         checkout_package(connection, package_name.upper(), destdir=destdir)
 
+        if manifest is not None:
+            manifest.save()
+
         if not args.recursive:
             break
+
+    return failed
+
+
+# @CommandGroup.argument('--folder-logic', choices=['full', 'prefix'], default='prefix')
+@CommandGroup.argument_jobs('Number of objects downloaded concurrently')
+@CommandGroup.argument('--incremental', action='store_true', default=False,
+                       help=f'Skip sources not changed since the last checkout recorded in {MANIFEST_FILE}')
+@CommandGroup.argument('--recursive', action='store_true', default=False)
+@CommandGroup.argument('--starting-folder', default='src')
+@CommandGroup.argument('directory', nargs='?', default=None,
+                       help='To checkout the package into it; default=<PACKAGE NAME>')
+@CommandGroup.argument('name')
+@CommandGroup.command()
+def package(connection, args):
+    """Download sources of objects from the given ABAP package"""
+
+    repo_dir = make_repo_dir_for_package(args)
+    source_code_dir = os.path.join(repo_dir, args.starting_folder)
+
+    manifest = None
+    if args.incremental:
+        manifest = CheckoutManifest(os.path.join(repo_dir, MANIFEST_FILE))
+
+    pool = None
+    if args.jobs > 1:
+        # one pool for all packages, so the workers do not wait for
+        # the slowest object of every package
+        pool = CheckoutPool(connection, args.jobs, manifest=manifest)
+
+    try:
+        failed = checkout_package_tree(connection, args, source_code_dir, manifest=manifest, pool=pool)
+    finally:
+        if pool is not None:
+            pool.close()
+
+    if pool is not None:
+        failed += pool.failed
+
+        if manifest is not None:
+            manifest.save()
+
+    if failed:
+        print(f'Failed objects: {failed}', file=sys.stderr)
+        return 1
+
+    return 0
@@ -1,5 +1,7 @@
 """CLI basic functionality"""
 
+import argparse
+
 from sap.errors import SAPCliError
 
 
@@ -10,6 +12,25 @@ class InvalidCommandLineError(SAPCliError):
     pass
 
 
+# Errors of a single object which workers of concurrent commands report
+# without stopping the others; requests' exceptions are derived from IOError
+OBJECT_ERRORS = (SAPCliError, OSError)
+
+
+def positive_int(value):
+    """ArgParser type of positive integer arguments like --jobs"""
+
+    try:
+        number = int(value)
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(f'invalid int value: \'{value}\'') from ex
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be positive: {value}')
+
+    return number
+
+
 class CommandDeclaration:
     """Command forward declaration"""
 
@@ -36,6 +57,15 @@ class CommandDeclaration:
 
         self.insert_argument(position, '--corrnr', nargs='?', default=None)
 
+    def declare_jobs(self, help_text, position=None):
+        """Declares the ArgParser argument -j/--jobs with the default 1"""
+
+        if position is None:
+            position = len(self.arguments)
+
+        self.insert_argument(position, '-j', '--jobs', type=positive_int, default=1,
+                             help=f'{help_text}; default=1')
+
     def install_arguments(self, parser):
         """Installs declared arguments to a ArgParser"""
 
@@ -162,3 +192,17 @@ class CommandGroup:
             return func
 
         return p_argument
+
+    @classmethod
+    def argument_jobs(cls, help_text):
+        """Decorator adding the jobs argument to a cli command"""
+
+        def p_argument(func):
+            """A closure that actually processes the decorated function
+            """
+
+            cls.get_command_declaration(func).declare_jobs(help_text)
+
+            return func
+
+        return p_argument
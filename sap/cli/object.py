@@ -1,8 +1,11 @@
 """ADT Object CLI templates"""
 
+import io
 import sys
 import os
 import collections
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 
 import sap.cli.core
 from sap.cli.core import InvalidCommandLineError
@@ -37,39 +40,225 @@ def object_name_from_source_file(filesystem_path):
     return parts
 
 
-def write_args_to_objects(command, connection, args, metadata=None):
+def write_args_to_sources(command, connection, args, metadata=None):
     """Converts parameters of the action 'write object' into a iteration of
-       objects with the text lines content
+       objects with paths of their source files where - stands for stdin
     """
 
     name = args.name
-    text_lines = None
 
     if name == '-':
         for filepath in args.source:
             if filepath == '-':
                 raise InvalidCommandLineError('Source file cannot be - when Object name is - too')
 
-            obj = command.instance_from_file_path(connection, filepath, args, metadata=metadata)
-
-            with open(filepath, 'r') as filesrc:
-                text_lines = filesrc.readlines()
-
-            yield (obj, text_lines)
+            yield (command.instance_from_file_path(connection, filepath, args, metadata=metadata), filepath)
 
     elif len(args.source) == 1:
-        if args.source[0] == '-':
-            text_lines = sys.stdin.readlines()
-        else:
-            with open(args.source[0], 'r') as filesrc:
-                text_lines = filesrc.readlines()
-
-        yield (command.instance(connection, args.name, args, metadata=metadata), text_lines)
+        yield (command.instance(connection, args.name, args, metadata=metadata), args.source[0])
 
     else:
         raise InvalidCommandLineError('Source file can be a list only when Object name is -')
 
 
+class UnixLineEndings:
+    """Binary file-like reader of a source stream converting the line
+       endings CRLF and CR to LF chunk by chunk as universal newlines
+       of text files used to do
+    """
+
+    BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, stream, close=True):
+        self._stream = stream
+        self._close = close
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            data = self.read(UnixLineEndings.BLOCK_SIZE)
+            if not data:
+                break
+
+            yield data
+
+    def read(self, size=-1):
+        """Reads at most size bytes of the wrapped stream or everything
+           for negative size and returns them with converted line endings
+        """
+
+        data = self._stream.read(size)
+
+        # do not split CRLF between two chunks
+        while size is not None and size > 0 and data.endswith(b'\r'):
+            more = self._stream.read(1)
+            if not more:
+                break
+
+            data += more
+
+        return data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+    def readable(self):
+        """Returns True"""
+
+        # pylint: disable=no-self-use
+        return True
+
+    def seekable(self):
+        """Returns True if the wrapped stream can be rewound"""
+
+        return self._stream.seekable()
+
+    def tell(self):
+        """Returns the position in the wrapped stream"""
+
+        return self._stream.tell()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Seeks to a position returned by tell(); the converted length
+           is not known in advance so seeking relative to the end
+           or the current position is not supported
+        """
+
+        if whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('Only absolute positions returned by tell() are supported')
+
+        return self._stream.seek(offset)
+
+    def close(self):
+        """Closes the wrapped stream unless it is owned by somebody else"""
+
+        if self._close:
+            self._stream.close()
+
+
+def open_source(filepath):
+    """Opens the source file or stdin for - as a binary stream with Unix
+       line endings
+    """
+
+    if filepath == '-':
+        return UnixLineEndings(sys.stdin.buffer, close=False)
+
+    return UnixLineEndings(open(filepath, 'rb'))
+
+
+def write_args_to_objects(command, connection, args, metadata=None):
+    """Converts parameters of the action 'write object' into a iteration of
+       objects with binary streams of their contents which are valid only
+       until the next iteration
+    """
+
+    for obj, filepath in write_args_to_sources(command, connection, args, metadata=metadata):
+        with open_source(filepath) as stream:
+            yield (obj, stream)
+
+
+def normalize_source(text):
+    """Returns the text with Unix line endings and without trailing line breaks"""
+
+    return text.replace('\r\n', '\n').replace('\r', '\n').rstrip('\n')
+
+
+def is_source_unchanged(obj, content):
+    """Returns True if the UTF-8 encoded content equals the object's text
+       on the server when line endings are not taken into account
+    """
+
+    local = normalize_source(content.decode('utf-8', errors='replace'))
+    return local == normalize_source(obj.text)
+
+
+def write_source(session, obj, stream, corrnr, skip_unchanged=False):
+    """Writes the binary stream to the object locked in the lock session
+       and returns False if the write was skipped because the object's text
+       has not been changed
+    """
+
+    content = stream
+    if skip_unchanged:
+        content = stream.read()
+
+        if is_source_unchanged(obj, content):
+            return False
+
+    with session.open_editor(obj, corrnr=corrnr) as editor:
+        editor.write(content)
+
+    return True
+
+
+def write_object_sources(tasks, corrnr, skip_unchanged=False):
+    """Writes the sources of the tasks (index, object, file path) one after
+       another and returns the list of tuples (index, caught error)
+       and the list of indexes of skipped unchanged sources
+    """
+
+    errors = []
+    skipped = []
+
+    try:
+        with sap.adt.LockSession() as session:
+            for idx, obj, filepath in tasks:
+                try:
+                    with open_source(filepath) as stream:
+                        if not write_source(session, obj, stream, corrnr, skip_unchanged=skip_unchanged):
+                            skipped.append(idx)
+                except sap.cli.core.OBJECT_ERRORS as ex:
+                    errors.append((idx, ex))
+    except sap.cli.core.OBJECT_ERRORS as ex:
+        # the object could not be unlocked
+        failed = set(idx for idx, _ in errors) | set(skipped)
+        errors.extend((idx, ex) for idx, _, _ in tasks if idx not in failed)
+
+    return (errors, skipped)
+
+
+def group_sources_by_object(obj_sources):
+    """Returns the ordered dictionary of lists of tuples (index, object,
+       file path) by names of the objects of the list of tuples (object,
+       file path) because sources of the same object share its lock
+    """
+
+    groups = collections.OrderedDict()
+    for idx, (obj, filepath) in enumerate(obj_sources):
+        groups.setdefault(obj.name, []).append((idx, obj, filepath))
+
+    return groups
+
+
+def write_objects_parallel(obj_sources, corrnr, jobs, skip_unchanged=False):
+    """Writes the sources of the list of tuples (object, file path) by a pool
+       of workers and returns the dictionary of caught errors by indexes
+       of the failed sources and the set of indexes of skipped sources.
+
+       Sources of the same object are written one after another by a single
+       worker in one lock session because they share the object's lock.
+    """
+
+    groups = group_sources_by_object(obj_sources)
+
+    errors = {}
+    skipped = set()
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(write_object_sources, tasks, corrnr, skip_unchanged=skip_unchanged)
+                   for tasks in groups.values()]
+
+        for future in futures:
+            group_errors, group_skipped = future.result()
+            errors.update(group_errors)
+            skipped.update(group_skipped)
+
+    return (errors, skipped)
+
+
 class CommandGroupObjectTemplate(sap.cli.core.CommandGroup):
     """Template Class converting command line parameters to ADT Object methods
        calls.
@@ -131,6 +320,9 @@ class CommandGroupObjectTemplate(sap.cli.core.CommandGroup):
                                   help='a path or - for reading stdin; multiple allowed only when name is -')
         write_cmd.append_argument('-a', '--activate', action='store_true',
                                   default=False, help='activate after write')
+        write_cmd.declare_jobs('number of objects written concurrently')
+        write_cmd.append_argument('--skip-unchanged', action='store_true', default=False,
+                                  help='do not write and activate sources equal to the server ones')
         write_cmd.declare_corrnr()
 
         return write_cmd
@@ -192,39 +384,92 @@ class CommandGroupObjectTemplate(sap.cli.core.CommandGroup):
         obj = self.instance(connection, args.name, args)
         print(obj.text)
 
+    def write_objects_serially(self, connection, args, toactivate, unchanged):
+        """Writes the sources one after another in the order of the command
+           line and stops on the first error; consecutive sources of the same
+           object are written in one lock session
+        """
+
+        obj_streams = write_args_to_objects(self, connection, args)
+
+        for _, tasks in itertools.groupby(obj_streams, key=lambda obj_stream: obj_stream[0].name):
+            with sap.adt.LockSession() as session:
+                for obj, stream in tasks:
+                    sap.cli.printout('*', str(obj))
+
+                    if write_source(session, obj, stream, args.corrnr, skip_unchanged=args.skip_unchanged):
+                        toactivate[obj.name] = obj
+                    else:
+                        unchanged.append(obj)
+
+        return 0
+
+    def write_objects_concurrently(self, connection, args, toactivate, unchanged):
+        """Writes the sources by args.jobs workers and returns the number
+           of sources that could not be written
+        """
+
+        obj_sources = list(write_args_to_sources(self, connection, args))
+
+        for obj, _ in obj_sources:
+            sap.cli.printout('*', str(obj))
+
+        errors, skipped = write_objects_parallel(obj_sources, args.corrnr, args.jobs,
+                                                 skip_unchanged=args.skip_unchanged)
+        failed = set(obj_sources[idx][0].name for idx in errors)
+
+        for idx, (obj, _) in enumerate(obj_sources):
+            if idx in skipped:
+                unchanged.append(obj)
+            elif obj.name not in failed:
+                toactivate[obj.name] = obj
+
+        for idx in sorted(errors):
+            print(f'Failed to write {obj_sources[idx][1]}: {errors[idx]}', file=sys.stderr)
+
+        return len(errors)
+
     def write_object_text(self, connection, args):
         """Changes source code of the given program include"""
 
         toactivate = collections.OrderedDict()
+        unchanged = []
 
         sap.cli.printout('Writing:')
 
-        for obj, text in write_args_to_objects(self, connection, args):
-            sap.cli.printout('*', str(obj))
+        if args.jobs > 1:
+            failures = self.write_objects_concurrently(connection, args, toactivate, unchanged)
+        else:
+            failures = self.write_objects_serially(connection, args, toactivate, unchanged)
 
-            with obj.open_editor(corrnr=args.corrnr) as editor:
-                editor.write(''.join(text))
+        if unchanged:
+            sap.cli.printout('Unchanged:')
 
-            toactivate[obj.name] = obj
+            for obj in unchanged:
+                sap.cli.printout('*', str(obj))
 
-        if args.activate:
+        if args.activate and toactivate:
             sap.cli.printout('Activating:')
 
-            for name, obj in toactivate.items():
+            for name in toactivate:
                 sap.cli.printout('*', name)
 
-                sap.adt.wb.activate(obj)
+            sap.adt.wb.activate_many(toactivate.values())
+
+        return 1 if failures else 0
 
     def activate_objects(self, connection, args):
-        """Actives the given object."""
+        """Actives the given objects in one activation request."""
 
         sap.cli.printout('Activating:')
 
+        objects = []
         for name in args.name:
             sap.cli.printout('*', name)
 
-            obj = self.instance(connection, name, args)
-            sap.adt.wb.activate(obj)
+            objects.append(self.instance(connection, name, args))
+
+        sap.adt.wb.activate_many(objects)
 
 
 # pylint: disable=abstract-method
@@ -1,6 +1,10 @@
 """ADT proxy for ABAP Package (Developmen Class)"""
 
+import os
+import sys
+
 import sap.adt
+from sap.adt.packageindex import PackageIndex, DEFAULT_TTL
 import sap.cli.core
 
 
@@ -45,29 +49,138 @@ def create(connection, args):
     package.create(corrnr=args.corrnr)
 
 
+def open_package_index(args):
+    """Returns PackageIndex configured by the parameter --index or
+       the environment variable SAP_PACKAGE_INDEX or None
+    """
+
+    path = args.index or os.environ.get('SAP_PACKAGE_INDEX')
+    if not path:
+        return None
+
+    return PackageIndex(path, ttl=args.ttl)
+
+
+def require_package_index(args):
+    """Returns PackageIndex or raises InvalidCommandLineError"""
+
+    index = open_package_index(args)
+    if index is None:
+        raise sap.cli.core.InvalidCommandLineError(
+            'No package index: use the parameter --index or the environment variable SAP_PACKAGE_INDEX')
+
+    return index
+
+
+def walk_package(connection, args, index):
+    """Returns sap.adt.package.walk of the package args.name or its copy
+       from the index which is updated first if needed
+    """
+
+    package = sap.adt.Package(connection, args.name)
+
+    if index is None:
+        walk_jobs = args.jobs if args.recursive else 1
+        return sap.adt.package.walk(package, jobs=walk_jobs)
+
+    system = connection.system_key
+    name = args.name.upper()
+
+    if args.refresh or not index.is_fresh(system, name):
+        index.update(system, name, sap.adt.package.walk(package, jobs=args.jobs))
+
+    return index.walk(system, name)
+
+
+@CommandGroup.argument('--ttl', type=int, default=DEFAULT_TTL,
+                       help=f'Seconds after which the indexed packages are read again; default={DEFAULT_TTL}')
+@CommandGroup.argument('--refresh', action='store_true', default=False,
+                       help='Read the package again even if it is in the index')
+@CommandGroup.argument('--index', default=None,
+                       help='Package index file answering the listing without reading the package')
+@CommandGroup.argument_jobs('Number of sub-packages read concurrently with --recursive')
 @CommandGroup.argument('-r', '--recursive', default=False, action='store_true', help='List sub-packages')
 @CommandGroup.argument('name')
 @CommandGroup.command('list')
 def list_package(connection, args):
     """List information about package contents"""
 
-    package = sap.adt.Package(connection, args.name)
+    index = open_package_index(args)
+
+    try:
+        print_package_contents(walk_package(connection, args, index), args.recursive)
+    finally:
+        if index is not None:
+            index.close()
 
-    for pkg, subpackages, objects in sap.adt.package.walk(package):
+    return 0
+
+
+def print_package_contents(walk_iter, recursive):
+    """Prints out results of sap.adt.package.walk"""
+
+    for pkg, subpackages, objects in walk_iter:
         basedir = '/'.join(pkg)
         if basedir:
             basedir += '/'
 
-        if not args.recursive:
+        if not recursive:
             for subpkg in subpackages:
                 print(f'{basedir}{subpkg}')
 
         for obj in objects:
             print(f'{basedir}{obj.name}')
 
-        if not args.recursive:
+        if not recursive:
             break
         elif not subpackages and not objects:
             print(f'{basedir}')
 
+
+@CommandGroup.argument('--ttl', type=int, default=DEFAULT_TTL,
+                       help=f'Seconds after which the indexed packages are ignored; default={DEFAULT_TTL}')
+@CommandGroup.argument('--index', default=None, help='Package index file')
+@CommandGroup.argument('--type', default=None, help='Object type (e.g. CLAS/OC)')
+@CommandGroup.argument('name')
+@CommandGroup.command()
+def owner(connection, args):
+    """Prints out the package of the object found in the package index"""
+
+    index = require_package_index(args)
+
+    try:
+        objects = index.owners(connection.system_key, args.name.upper(), typ=args.type)
+    finally:
+        index.close()
+
+    if not objects:
+        print(f'The object {args.name.upper()} was not found in the package index', file=sys.stderr)
+        return 1
+
+    for obj in objects:
+        print(f'{obj.package} {obj.typ} {obj.name}')
+
+    return 0
+
+
+@CommandGroup.argument('--ttl', type=int, default=DEFAULT_TTL,
+                       help=f'Seconds after which the indexed packages are ignored; default={DEFAULT_TTL}')
+@CommandGroup.argument('--index', default=None, help='Package index file')
+@CommandGroup.argument('prefix')
+@CommandGroup.command()
+def find(connection, args):
+    """Prints out objects whose names start with the prefix found in
+       the package index
+    """
+
+    index = require_package_index(args)
+
+    try:
+        objects = index.find(connection.system_key, args.prefix.upper())
+    finally:
+        index.close()
+
+    for obj in objects:
+        print(f'{obj.package} {obj.typ} {obj.name}')
+
     return 0
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""Local stand-in of the ADT HTTP endpoints used by sapcli
+
+Usage: PYTHONPATH=. python3 test/benchmark/adt_server.py [--port N] [--latency MS] [--packages N] [--objects N]
+
+The server generates a package tree on the fly: the root package $BENCH
+has the given number of sub-packages $BENCH_P<N> and every package holds
+the given number of objects - programs ZBENCH_P<N>_<M>, classes
+ZCL_BENCH_P<N>_<M> and interfaces ZIF_BENCH_P<N>_<M> in turns.
+
+Every request is answered after the configured latency which simulates
+the round trip to a remote system. Sources are accepted for any object name,
+locks are never refused and activations always succeed.
+"""
+
+import re
+import sys
+import time
+import threading
+import collections
+from argparse import ArgumentParser
+from types import SimpleNamespace
+from urllib.parse import urlsplit, parse_qs, unquote
+from socketserver import ThreadingMixIn
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+ROOT_PACKAGE = '$BENCH'
+
+ADT_PATH = '/sap/bc/adt/'
+
+OBJECT_TYPES = (
+    ('PROG/P', 'ZBENCH_P{0}_{1}', 'programs/programs'),
+    ('CLAS/OC', 'ZCL_BENCH_P{0}_{1}', 'oo/classes'),
+    ('INTF/OI', 'ZIF_BENCH_P{0}_{1}', 'oo/interfaces'),
+)
+
+NODE_IDS = {'PROG/P': '000002', 'CLAS/OC': '000005', 'DEVC/K': '000007', 'INTF/OI': '000011'}
+
+OBJECT_PATH = r'(?P<collection>programs/programs|programs/includes|oo/classes|oo/interfaces)/(?P<name>[^/]+)'
+
+
+def default_config(**kwargs):
+    """Returns the server configuration with defaults for missing values"""
+
+    config = SimpleNamespace(latency=0.0, packages=4, objects=30, lines=200, transports=20)
+    config.__dict__.update(kwargs)
+    return config
+
+
+def package_names(config):
+    """Returns names of all packages in the tree"""
+
+    return [ROOT_PACKAGE] + [f'{ROOT_PACKAGE}_P{idx}' for idx in range(1, config.packages + 1)]
+
+
+def package_objects(config, package):
+    """Returns tuples (type, name, collection) of objects in the package"""
+
+    pkgidx = 0 if package == ROOT_PACKAGE else int(package.rsplit('_P', 1)[1])
+
+    objects = []
+    for objidx in range(config.objects):
+        typ, pattern, collection = OBJECT_TYPES[objidx % len(OBJECT_TYPES)]
+        objects.append((typ, pattern.format(pkgidx, objidx), collection))
+
+    return objects
+
+
+def source_code(name, lines):
+    """ABAP source of the given number of lines"""
+
+    body = '\n'.join(f'  WRITE: / \'{name} line {idx}\'.' for idx in range(lines))
+    return f'* Generated source of {name}\n{body}\n'
+
+
+def tree_node(typ, name, uri):
+    """Node of nodestructure"""
+
+    return f'''<SEU_ADT_REPOSITORY_OBJ_NODE>
+<OBJECT_TYPE>{typ}</OBJECT_TYPE>
+<OBJECT_NAME>{name}</OBJECT_NAME>
+<TECH_NAME>{name}</TECH_NAME>
+<OBJECT_URI>{ADT_PATH}{uri}</OBJECT_URI>
+<EXPANDABLE>X</EXPANDABLE>
+<NODE_ID/>
+<DESCRIPTION>Benchmark object {name}</DESCRIPTION>
+<DESCRIPTION_TYPE/>
+</SEU_ADT_REPOSITORY_OBJ_NODE>'''
+
+
+def nodestructure_xml(nodes, types):
+    """Response of repository/nodestructure"""
+
+    object_types = '\n'.join(f'''<SEU_ADT_OBJECT_TYPE_INFO>
+<OBJECT_TYPE>{typ}</OBJECT_TYPE>
+<CATEGORY_TAG>source_library</CATEGORY_TAG>
+<OBJECT_TYPE_LABEL/>
+<NODE_ID>{NODE_IDS[typ]}</NODE_ID>
+</SEU_ADT_OBJECT_TYPE_INFO>''' for typ in types)
+
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<asx:abap xmlns:asx="http://www.sap.com/abapxml" version="1.0"><asx:values><DATA>
+<TREE_CONTENT>
+{''.join(nodes)}
+</TREE_CONTENT>
+<CATEGORIES/>
+<OBJECT_TYPES>
+{object_types}
+</OBJECT_TYPES>
+</DATA></asx:values></asx:abap>'''
+
+
+def package_xml(name):
+    """Response of packages/NAME"""
+
+    return f'''<?xml version="1.0" encoding="utf-8"?>
+<pak:package xmlns:pak="http://www.sap.com/adt/packages" xmlns:adtcore="http://www.sap.com/adt/core" adtcore:masterLanguage="EN" adtcore:name="{name}" adtcore:type="DEVC/K" adtcore:version="active" adtcore:description="Benchmark package {name}" adtcore:language="EN">
+<pak:attributes pak:packageType="development"/>
+<pak:superPackage/>
+<pak:applicationComponent pak:name="-"/>
+<pak:transport>
+<pak:softwareComponent pak:name="LOCAL"/>
+<pak:transportLayer pak:name=""/>
+</pak:transport>
+</pak:package>'''
+
+
+def object_xml(typ, name):
+    """Response of the object URI"""
+
+    common = (f'adtcore:responsible="DEVELOPER" adtcore:masterLanguage="EN" adtcore:masterSystem="BNC" '
+              f'adtcore:name="{name}" adtcore:type="{typ}" adtcore:changedAt="2019-03-07T20:22:01Z" '
+              f'adtcore:version="active" adtcore:description="Benchmark object {name}" adtcore:language="EN"')
+
+    package_ref = '<adtcore:packageRef adtcore:type="DEVC/K" adtcore:name="$BENCH"/>'
+
+    if typ == 'PROG/P':
+        return f'''<?xml version="1.0" encoding="utf-8"?>
+<program:abapProgram xmlns:program="http://www.sap.com/adt/programs/programs" xmlns:abapsource="http://www.sap.com/adt/abapsource" xmlns:adtcore="http://www.sap.com/adt/core" program:programType="executableProgram" abapsource:sourceUri="source/main" abapsource:fixPointArithmetic="true" {common}>
+{package_ref}
+<program:logicalDatabase><program:ref adtcore:name="D$S"/></program:logicalDatabase>
+</program:abapProgram>'''
+
+    if typ == 'CLAS/OC':
+        includes = ''.join(f'<class:include class:includeType="{include}" abapsource:sourceUri="includes/{include}" '
+                           f'adtcore:type="CLAS/I" adtcore:changedAt="2019-03-07T20:22:01Z"/>'
+                           for include in ('definitions', 'implementations', 'testclasses'))
+
+        return f'''<?xml version="1.0" encoding="utf-8"?>
+<class:abapClass xmlns:class="http://www.sap.com/adt/oo/classes" xmlns:abapoo="http://www.sap.com/adt/oo" xmlns:abapsource="http://www.sap.com/adt/abapsource" xmlns:adtcore="http://www.sap.com/adt/core" class:final="true" class:visibility="public" abapoo:modeled="false" abapsource:fixPointArithmetic="true" {common}>
+{package_ref}
+{includes}
+</class:abapClass>'''
+
+    return f'''<?xml version="1.0" encoding="utf-8"?>
+<intf:abapInterface xmlns:intf="http://www.sap.com/adt/oo/interfaces" xmlns:abapoo="http://www.sap.com/adt/oo" xmlns:abapsource="http://www.sap.com/adt/abapsource" xmlns:adtcore="http://www.sap.com/adt/core" abapoo:modeled="false" abapsource:sourceUri="source/main" abapsource:fixPointArithmetic="false" {common}>
+{package_ref}
+</intf:abapInterface>'''
+
+
+def aunit_results_xml(names):
+    """Response of abapunit/testruns with passed tests of the programs"""
+
+    methods = ''.join(f'<testMethod adtcore:name="TEST_{idx}" executionTime="0" unit="s"/>' for idx in range(5))
+    programs = '\n'.join(f'''<program adtcore:uri="{ADT_PATH}oo/classes/{name.lower()}" adtcore:name="{name}">
+<testClasses><testClass adtcore:name="LTCL_TEST" adtcore:type="CLAS/OL" durationCategory="short" riskLevel="harmless">
+<testMethods>{methods}</testMethods>
+</testClass></testClasses>
+</program>''' for name in names)
+
+    return f'''<?xml version="1.0" encoding="utf-8"?>
+<aunit:runResult xmlns:aunit="http://www.sap.com/adt/aunit" xmlns:adtcore="http://www.sap.com/adt/core">
+{programs}
+</aunit:runResult>'''
+
+
+def transports_xml(config, user):
+    """Response of cts/transportrequests"""
+
+    objects = ''.join(f'<tm:abap_object tm:pgmid="R3TR" tm:type="PROG" tm:name="ZBENCH_P0_{idx}" '
+                      f'tm:wbtype="PROG/P" tm:obj_desc="Program" tm:lock_status="X"/>'
+                      for idx in range(config.objects))
+
+    requests = '\n'.join(f'''<tm:request tm:number="BNCK9{idx:05}" tm:owner="{user}" tm:desc="Request {idx}"
+tm:status="D"><tm:task tm:number="BNCK9{idx:05}T" tm:owner="{user}" tm:desc="Task {idx}" tm:status="D">{objects}</tm:task>
+</tm:request>''' for idx in range(config.transports))
+
+    return f'''<?xml version="1.0" encoding="utf-8"?>
+<tm:root xmlns:tm="http://www.sap.com/cts/adt/tm" tm:useraction="newrequest">
+<tm:workbench tm:category="Workbench"><tm:target tm:name="LOCAL"><tm:modifiable tm:status="D">
+{requests}
+</tm:modifiable></tm:target></tm:workbench>
+</tm:root>'''
+
+
+class ADTRequestHandler(BaseHTTPRequestHandler):
+    """Dispatches requests to methods according to the table ROUTES"""
+
+    protocol_version = 'HTTP/1.1'
+
+    query = None
+    body = None
+
+    ROUTES = (
+        ('GET', r'core/discovery', 'discovery'),
+        ('POST', r'repository/nodestructure', 'nodestructure'),
+        ('GET', r'packages/(?P<name>[^/]+)', 'package'),
+        ('GET', OBJECT_PATH, 'adt_object'),
+        ('GET', OBJECT_PATH + r'/+(?P<source>source/main|includes/\w+)', 'source'),
+        ('PUT', OBJECT_PATH + r'/+(?P<source>source/main|includes/\w+)', 'write'),
+        ('POST', OBJECT_PATH, 'lock'),
+        ('POST', r'activation', 'activation'),
+        ('POST', r'abapunit/testruns', 'aunit'),
+        ('GET', r'cts/transportrequests', 'transports'),
+    )
+
+    # pylint: disable=invalid-name
+    def do_GET(self):
+        """Handles GET"""
+
+        self.dispatch()
+
+    # pylint: disable=invalid-name
+    def do_POST(self):
+        """Handles POST"""
+
+        self.dispatch()
+
+    # pylint: disable=invalid-name
+    def do_PUT(self):
+        """Handles PUT"""
+
+        self.dispatch()
+
+    # pylint: disable=redefined-builtin
+    def log_message(self, format, *args):
+        """Keeps the benchmark output clean"""
+
+    def read_body(self):
+        """Reads the request body sent with Content-Length or chunked"""
+
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';', 1)[0], 16)
+                chunk = self.rfile.read(size + 2)
+                if size == 0:
+                    break
+
+                chunks.append(chunk[:-2])
+
+            return b''.join(chunks)
+
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def reply(self, text='', status=200, content_type='application/xml', headers=None):
+        """Sends the response after the configured latency"""
+
+        body = text.encode('utf-8')
+
+        time.sleep(self.server.config.latency)
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        self.wfile.write(body)
+
+    def dispatch(self):
+        """Finds the route of the request and calls its method"""
+
+        url = urlsplit(self.path)
+        self.query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.body = self.read_body()
+
+        path = url.path[len(ADT_PATH):] if url.path.startswith(ADT_PATH) else None
+
+        for method, pattern, handler in ADTRequestHandler.ROUTES:
+            match = re.fullmatch(pattern, path or '')
+            if method == self.command and match:
+                self.server.count(handler)
+                getattr(self, handler)(**{key: unquote(value) for key, value in match.groupdict().items()})
+                return
+
+        self.server.count('unknown')
+        self.reply(f'Not found: {self.command} {self.path}', status=404, content_type='text/plain')
+
+    def discovery(self):
+        """Returns a CSRF token"""
+
+        self.reply('<app:service xmlns:app="http://www.w3.org/2007/app"/>', headers={'x-csrf-token': 'benchmark'})
+
+    def nodestructure(self):
+        """Returns sub-packages for the root node or objects for other nodes"""
+
+        config = self.server.config
+        parent = self.query['parent_name']
+
+        if parent not in package_names(config):
+            self.reply(nodestructure_xml([], []))
+        elif b'<TV_NODEKEY>000000</TV_NODEKEY>' in self.body:
+            subpackages = package_names(config)[1:] if parent == ROOT_PACKAGE else []
+            nodes = [tree_node('DEVC/K', name, f'packages/{name.lower()}') for name in subpackages]
+            self.reply(nodestructure_xml(nodes, sorted(NODE_IDS)))
+        else:
+            nodes = [tree_node(typ, name, f'{collection}/{name.lower()}')
+                     for typ, name, collection in package_objects(config, parent)]
+            self.reply(nodestructure_xml(nodes, [typ for typ, _, _ in OBJECT_TYPES]))
+
+    def package(self, name):
+        """Returns package attributes"""
+
+        self.reply(package_xml(name.upper()))
+
+    def adt_object(self, collection, name):
+        """Returns object attributes"""
+
+        typ = {'programs/programs': 'PROG/P', 'oo/classes': 'CLAS/OC', 'oo/interfaces': 'INTF/OI'}.get(collection)
+        if typ is None:
+            self.reply(status=404)
+        else:
+            self.reply(object_xml(typ, name.upper()))
+
+    # pylint: disable=unused-argument
+    def source(self, collection, name, source):
+        """Returns generated source code"""
+
+        self.reply(source_code(name.upper(), self.server.config.lines), content_type='text/plain; charset=utf-8')
+
+    # pylint: disable=unused-argument
+    def write(self, collection, name, source):
+        """Accepts source code"""
+
+        self.reply(content_type='text/plain')
+
+    # pylint: disable=unused-argument
+    def lock(self, collection, name):
+        """Locks or unlocks the object"""
+
+        if self.query.get('_action') == 'LOCK':
+            self.reply(f'<asx:abap xmlns:asx="http://www.sap.com/abapxml"><asx:values><DATA>'
+                       f'<LOCK_HANDLE>{name.upper()}LOCK</LOCK_HANDLE></DATA></asx:values></asx:abap>',
+                       content_type='application/vnd.sap.as+xml; charset=utf-8; dataname=com.sap.adt.lock.Result')
+        else:
+            self.reply()
+
+    def activation(self):
+        """Activates everything"""
+
+        self.reply()
+
+    def aunit(self):
+        """Returns passed tests of all classes in the tree"""
+
+        config = self.server.config
+        names = [name for package in package_names(config)
+                 for typ, name, _ in package_objects(config, package) if typ == 'CLAS/OC']
+
+        self.reply(aunit_results_xml(names))
+
+    def transports(self):
+        """Returns transport requests of the user"""
+
+        self.reply(transports_xml(self.server.config, self.query.get('user', 'DEVELOPER')))
+
+
+class ADTServer(ThreadingMixIn, HTTPServer):
+    """HTTP server counting the handled requests"""
+
+    daemon_threads = True
+
+    def __init__(self, address, config):
+        super(ADTServer, self).__init__(address, ADTRequestHandler)
+
+        self.config = config
+        self.requests = collections.Counter()
+        self._lock = threading.Lock()
+
+    def count(self, handler):
+        """Records the handled request"""
+
+        with self._lock:
+            self.requests[handler] += 1
+
+    def reset(self):
+        """Resets the counters"""
+
+        with self._lock:
+            self.requests.clear()
+
+
+def start_server(config, host='127.0.0.1', port=0):
+    """Starts the server in a background thread and returns it"""
+
+    server = ADTServer((host, port), config)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return server
+
+
+def main(argv):
+    """Serves until interrupted"""
+
+    parser = ArgumentParser(description='ADT stand-in server')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0, help='milliseconds added to every response')
+    parser.add_argument('--packages', type=int, default=4, help='number of sub-packages of $BENCH')
+    parser.add_argument('--objects', type=int, default=30, help='number of objects in every package')
+    parser.add_argument('--lines', type=int, default=200, help='number of lines of generated sources')
+    parser.add_argument('--transports', type=int, default=20, help='number of transport requests')
+    args = parser.parse_args(argv[1:])
+
+    config = default_config(latency=args.latency / 1000, packages=args.packages, objects=args.objects,
+                            lines=args.lines, transports=args.transports)
+
+    server = ADTServer(('127.0.0.1', args.port), config)
+    print(f'Serving ADT on http://127.0.0.1:{args.port}{ADT_PATH}', file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(dict(server.requests), file=sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Measures end-to-end throughput of sapcli commands against a local ADT
+stand-in server (see adt_server.py)
+
+Usage: PYTHONPATH=. python3 test/benchmark/sapcli_throughput.py [--latency MS] [--jobs N] [SCENARIO ...]
+
+Every scenario runs bin/sapcli in a new process and reports the wall time,
+the number of HTTP requests the server handled, requests per second and
+the peak resident memory of the sapcli process.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+from argparse import ArgumentParser
+
+from adt_server import start_server, default_config, package_names, ROOT_PACKAGE
+
+
+SAPCLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'bin', 'sapcli')
+
+
+def checkout_scenario(args, workdir):
+    """checkout package $BENCH --recursive"""
+
+    return ['checkout', 'package', ROOT_PACKAGE, os.path.join(workdir, 'checkout'),
+            '--recursive', '--jobs', str(args.jobs)]
+
+
+def write_scenario(args, workdir):
+    """program write - FILE ... --activate"""
+
+    sources = os.path.join(workdir, 'write')
+    os.makedirs(sources, exist_ok=True)
+
+    files = []
+    for idx in range(args.objects * len(package_names(args))):
+        filename = os.path.join(sources, f'zbench_w_{idx}.abap')
+        with open(filename, 'w') as dest:
+            dest.write('\n'.join(f'WRITE: / \'line {line}\'.' for line in range(args.lines)))
+
+        files.append(filename)
+
+    return ['program', 'write', '-'] + files + ['--activate', '--jobs', str(args.jobs)]
+
+
+# pylint: disable=unused-argument
+def aunit_scenario(args, workdir):
+    """aunit run package $BENCH"""
+
+    return ['aunit', 'run', 'package', ROOT_PACKAGE]
+
+
+def aunit_split_scenario(args, workdir):
+    """aunit run package $BENCH --split-package"""
+
+    return ['aunit', 'run', 'package', ROOT_PACKAGE, '--split-package', '--jobs', str(args.jobs)]
+
+
+# pylint: disable=unused-argument
+def cts_scenario(args, workdir):
+    """cts list transport -rr"""
+
+    return ['cts', 'list', 'transport', '-rr']
+
+
+SCENARIOS = {
+    'checkout': checkout_scenario,
+    'write': write_scenario,
+    'aunit': aunit_scenario,
+    'aunit-split': aunit_split_scenario,
+    'cts': cts_scenario,
+}
+
+
+def run_sapcli(argv, env, workdir):
+    """Runs sapcli and returns the exit code, wall time and peak RSS in MiB"""
+
+    with open(os.path.join(workdir, 'stdout'), 'w') as stdout, open(os.path.join(workdir, 'stderr'), 'w') as stderr:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, SAPCLI] + argv, env=env, stdout=stdout, stderr=stderr)
+        _, status, rusage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in KiB on Linux
+    return (os.waitstatus_to_exitcode(status) if hasattr(os, 'waitstatus_to_exitcode') else status >> 8,
+            elapsed, rusage.ru_maxrss / 1024)
+
+
+def measure(scenario, args, server, env):
+    """Runs the scenario args.repeat times and returns the number of requests,
+       wall time and peak RSS of the fastest run or None if sapcli failed
+    """
+
+    runs = []
+
+    for _ in range(args.repeat):
+        workdir = tempfile.mkdtemp(prefix='sapcli-bench-')
+
+        try:
+            command = scenario(args, workdir)
+            server.reset()
+            exitcode, elapsed, maxrss = run_sapcli(command, env, workdir)
+
+            if exitcode != 0:
+                with open(os.path.join(workdir, 'stderr')) as stderr:
+                    print(f'{" ".join(command[:3])} failed with {exitcode}:\n{stderr.read()}', file=sys.stderr)
+
+                return None
+
+            runs.append((sum(server.requests.values()), elapsed, maxrss))
+        finally:
+            shutil.rmtree(workdir)
+
+    return min(runs, key=lambda run: run[1])
+
+
+def main(argv):
+    """Prints a table of measurements"""
+
+    parser = ArgumentParser(description='Throughput of sapcli commands')
+    parser.add_argument('scenarios', nargs='*', default=[],
+                        help='scenarios to run; default=all')
+    parser.add_argument('--latency', type=float, default=20, help='milliseconds added to every response')
+    parser.add_argument('--packages', type=int, default=4, help='number of sub-packages of $BENCH')
+    parser.add_argument('--objects', type=int, default=30, help='number of objects in every package')
+    parser.add_argument('--lines', type=int, default=200, help='number of lines of sources')
+    parser.add_argument('--transports', type=int, default=20, help='number of transport requests')
+    parser.add_argument('--jobs', type=int, default=1, help='value of the sapcli option --jobs')
+    parser.add_argument('--repeat', type=int, default=1, help='number of runs; the fastest one is reported')
+    args = parser.parse_args(argv[1:])
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'unknown scenarios: {", ".join(sorted(unknown))}')
+
+    config = default_config(latency=args.latency / 1000, packages=args.packages, objects=args.objects,
+                            lines=args.lines, transports=args.transports)
+    server = start_server(config)
+
+    env = dict(os.environ)
+    env.update({
+        'SAP_ASHOST': server.server_address[0],
+        'SAP_PORT': str(server.server_address[1]),
+        'SAP_SSL': 'no',
+        'SAP_CLIENT': '001',
+        'SAP_USER': 'DEVELOPER',
+        'SAP_PASSWORD': 'Benchmark',
+        'PYTHONPATH': os.pathsep.join(filter(None, (os.path.join(os.path.dirname(SAPCLI), '..'),
+                                                    env.get('PYTHONPATH')))),
+    })
+
+    print(f'{"scenario":<12}{"requests":>10}{"seconds":>10}{"req/s":>10}{"max RSS MiB":>14}')
+
+    failed = 0
+    for name in args.scenarios or sorted(SCENARIOS):
+        best = measure(SCENARIOS[name], args, server, env)
+
+        if best is None:
+            failed += 1
+        else:
+            requests, elapsed, maxrss = best
+            print(f'{name:<12}{requests:>10}{elapsed:>10.3f}{requests / elapsed:>10.1f}{maxrss:>14.1f}')
+
+    server.shutdown()
+    server.server_close()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
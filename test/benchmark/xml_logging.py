@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Measures the cost of debug logging in the ADT XML response handlers
+
+Usage: PYTHONPATH=. python3 test/benchmark/xml_logging.py [--size N] [--repeat N]
+
+The mode "unguarded" makes the handlers call the logger in every callback
+as they did before the check of the log level was moved to the handlers'
+constructors.
+"""
+
+import io
+import sys
+import timeit
+import logging
+from argparse import ArgumentParser
+
+import requests
+
+from sap import get_logger
+from sap.adt.aunit import AUnitResponseHandler
+from sap.adt.repository import NodeStructureXMLHandler
+from sap.adt.marshalling import Marshal
+from sap.adt.wb import IOCList
+from sap.adt.core import log_response
+from sap.adt.xmlparser import parse_string
+
+
+def aunit_results_xml(size):
+    """AUnit results with size programs"""
+
+    method = '''<testMethod adtcore:name="DO_THE_TEST_{0}"><alerts>
+<alert kind="failedAssertion" severity="critical"><title>Critical Assertion Error: 'I am supposed to fail'</title>
+<details><detail text="True expected"/></details>
+<stack><stackEntry adtcore:description="Include: &lt;ZCL_THEKING&gt; Line: &lt;19&gt;"/></stack>
+</alert></alerts></testMethod>'''
+
+    methods = '\n'.join(method.format(i) for i in range(10))
+    program = f'''<program adtcore:name="ZCL_PROGRAM_{{0}}"><testClasses>
+<testClass adtcore:name="LTCL_TEST"><testMethods>{methods}</testMethods></testClass>
+</testClasses></program>'''
+
+    programs = '\n'.join(program.format(i) for i in range(size))
+    return f'''<?xml version="1.0" encoding="utf-8"?>
+<aunit:runResult xmlns:aunit="http://www.sap.com/adt/aunit" xmlns:adtcore="http://www.sap.com/adt/core">
+{programs}
+</aunit:runResult>'''
+
+
+def node_structure_xml(size):
+    """Node structure with size * 10 objects"""
+
+    node = '''<SEU_ADT_REPOSITORY_OBJ_NODE>
+<OBJECT_TYPE>CLAS/OC</OBJECT_TYPE><OBJECT_NAME>ZCL_OBJECT_{0}</OBJECT_NAME><TECH_NAME>ZCL_OBJECT_{0}</TECH_NAME>
+<OBJECT_URI>/sap/bc/adt/oo/classes/zcl_object_{0}</OBJECT_URI><EXPANDABLE/><IS_FINAL/><IS_ABSTRACT/>
+<DESCRIPTION>Object number {0}</DESCRIPTION><DESCRIPTION_TYPE/>
+</SEU_ADT_REPOSITORY_OBJ_NODE>'''
+
+    nodes = '\n'.join(node.format(i) for i in range(size * 10))
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<asx:abap xmlns:asx="http://www.sap.com/abapxml" version="1.0"><asx:values><DATA>
+<TREE_CONTENT>{nodes}</TREE_CONTENT><CATEGORIES/><OBJECT_TYPES/>
+</DATA></asx:values></asx:abap>'''
+
+
+def inactive_objects_xml(size):
+    """Inactive objects with size * 10 entries"""
+
+    entry = '''<ioc:entry><ioc:object ioc:user="" ioc:deleted="false">
+<ioc:ref xmlns:adtcore="http://www.sap.com/adt/core" adtcore:uri="/sap/bc/adt/oo/classes/zcl_object_{0}" adtcore:type="CLAS/OC" adtcore:name="ZCL_OBJECT_{0}"/>
+</ioc:object><ioc:transport/></ioc:entry>'''
+
+    entries = '\n'.join(entry.format(i) for i in range(size * 10))
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<ioc:inactiveObjects xmlns:ioc="http://www.sap.com/abapxml/inactiveCtsObjects">
+{entries}
+</ioc:inactiveObjects>'''
+
+
+def parse_with(handler_class, unguarded):
+    """Returns a function parsing the XML with a new handler"""
+
+    def parse(xml_text):
+        handler = handler_class()
+        if unguarded:
+            # pylint: disable=protected-access
+            handler._debug = True
+        parse_string(xml_text, handler)
+
+    return parse
+
+
+def deserialize_inactive_objects(xml_text):
+    """Deserializes inactive objects"""
+
+    Marshal.deserialize(xml_text, IOCList())
+
+
+def response(text):
+    """Returns a requests response with the text as its body"""
+
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.encoding = 'utf-8'
+    # pylint: disable=protected-access
+    resp._content = text.encode('utf-8')
+    return resp
+
+
+def main(argv):
+    """Prints a table of timings"""
+
+    parser = ArgumentParser(description='Debug logging in XML handlers')
+    parser.add_argument('--size', type=int, default=200, help='size of generated responses')
+    parser.add_argument('--repeat', type=int, default=3, help='number of measured runs')
+    args = parser.parse_args(argv[1:])
+
+    logger = get_logger()
+    logger.addHandler(logging.StreamHandler(io.StringIO()))
+
+    documents = {
+        'aunit': (aunit_results_xml(args.size), AUnitResponseHandler),
+        'nodestructure': (node_structure_xml(args.size), NodeStructureXMLHandler),
+    }
+
+    inactive_objects = inactive_objects_xml(args.size)
+
+    print(f'{"case":<24}{"bytes":>10}{"unguarded":>12}{"guarded":>12}{"debug":>12}')
+
+    def measure(func, xml_text):
+        return min(timeit.repeat(lambda: func(xml_text), number=1, repeat=args.repeat))
+
+    for name, (xml_text, handler_class) in documents.items():
+        logger.setLevel(logging.WARNING)
+        unguarded = measure(parse_with(handler_class, True), xml_text)
+        guarded = measure(parse_with(handler_class, False), xml_text)
+
+        logger.setLevel(logging.DEBUG)
+        debug = measure(parse_with(handler_class, False), xml_text)
+
+        print(f'{name:<24}{len(xml_text):>10}{unguarded:>12.4f}{guarded:>12.4f}{debug:>12.4f}')
+
+    logger.setLevel(logging.WARNING)
+    guarded = measure(deserialize_inactive_objects, inactive_objects)
+    logger.setLevel(logging.DEBUG)
+    debug = measure(deserialize_inactive_objects, inactive_objects)
+    print(f'{"inactive objects":<24}{len(inactive_objects):>10}{"":>12}{guarded:>12.4f}{debug:>12.4f}')
+
+    resp = response(aunit_results_xml(args.size))
+    logger.setLevel(logging.WARNING)
+    unguarded = measure(lambda r: logger.debug('%s', r.text), resp)
+    guarded = measure(lambda r: log_response('GET', 'url', r), resp)
+    logger.setLevel(logging.DEBUG)
+    debug = measure(lambda r: log_response('GET', 'url', r), resp)
+    print(f'{"response body log":<24}{len(resp.content):>10}{unguarded:>12.4f}{guarded:>12.4f}{debug:>12.4f}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -1,5 +1,7 @@
 from typing import Dict, NamedTuple
 
+import requests
+
 import sap.adt
 
 
@@ -34,9 +36,46 @@ class Connection(sap.adt.Connection):
 
     def execute(self, method, adt_uri, params=None, headers=None, body=None):
         final_uri = '/' + self.uri + '/' + adt_uri
+
+        if hasattr(body, 'read'):
+            body = body.read()
+
         self.execs.append(Request(method, final_uri, headers, body, params))
 
         return next(self._resp_iter)
 
     def mock_methods(self):
         return  [(e.method, e.adt_uri) for e in self.execs]
+
+
+def make_http_response(status_code, text='', headers=None, cookies=None):
+    """Builds requests.Response for tests patching requests.Session.send"""
+
+    response = requests.Response()
+    response.status_code = status_code
+    response.encoding = 'utf-8'
+    response._content = text.encode('utf-8')
+    response.headers.update(headers or {})
+    for name, value in (cookies or {}).items():
+        response.cookies.set(name, value)
+    return response
+
+
+class SessionSend:
+    """Replacement of requests.Session.send returning the given responses
+       or raising the given exceptions
+    """
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def __call__(self, session, request, **kwargs):
+        self.requests.append(request)
+        response = self.responses.pop(0)
+
+        if isinstance(response, Exception):
+            raise response
+
+        session.cookies.update(response.cookies)
+        return response
@@ -7,6 +7,8 @@ from unittest.mock import patch, Mock
 from io import StringIO
 from types import SimpleNamespace
 
+import sap.errors
+
 import importlib.util
 from importlib.machinery import SourceFileLoader
 
@@ -261,5 +263,40 @@ class TestParseCommandLineWithCorrnr(unittest.TestCase):
         self.assertEqual(args.corrnr, '420WEEDTIME')
 
 
+class TestMain(unittest.TestCase):
+
+    def run_main(self, verbose_count):
+        connection = SimpleNamespace(statistics='HTTP requests: 1')
+        args = SimpleNamespace(verbose_count=verbose_count,
+                               connection_factory=lambda args: connection,
+                               execute=lambda connection, args: 0)
+
+        with patch('sapcli.parse_command_line', return_value=args), \
+             patch('sys.stderr', new_callable=StringIO) as fake_stderr:
+            exit_code = sapcli.main(['sapcli'])
+
+        self.assertEqual(exit_code, 0)
+        return fake_stderr.getvalue()
+
+    def test_main_verbose_statistics(self):
+        self.assertEqual(self.run_main(1), 'HTTP requests: 1\n')
+
+    def test_main_no_statistics(self):
+        self.assertEqual(self.run_main(0), '')
+
+    def test_main_invalid_configuration(self):
+        def fake_factory(args):
+            raise sap.errors.SAPCliError('SAP_HTTP_POOL_SIZE is wrong')
+
+        args = SimpleNamespace(verbose_count=0, connection_factory=fake_factory)
+
+        with patch('sapcli.parse_command_line', return_value=args), \
+             patch('sys.stderr', new_callable=StringIO) as fake_stderr:
+            exit_code = sapcli.main(['sapcli'])
+
+        self.assertEqual(exit_code, sapcli.ExitCodes.INVALID_CONFIGURATION)
+        self.assertEqual(fake_stderr.getvalue(), 'SAP_HTTP_POOL_SIZE is wrong\n')
+
+
 if __name__ == '__main__':
     unittest.main()
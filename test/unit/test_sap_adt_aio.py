@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import asyncio
+import unittest
+
+import sap.adt
+from sap.adt.aio import AsyncConnection
+
+from mock import Connection, Response
+from fixtures_adt import LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK
+from fixtures_adt_program import GET_EXECUTABLE_PROGRAM_ADT_XML
+from fixtures_adt_repository import PACKAGE_ROOT_NODESTRUCTURE_OK_RESPONSE
+
+
+def run(coroutine_function, connection):
+    async def main():
+        async with AsyncConnection(connection, max_workers=2) as async_connection:
+            return await coroutine_function(async_connection)
+
+    return asyncio.run(main())
+
+
+class TestAsyncConnection(unittest.TestCase):
+
+    def test_execute_and_get_text(self):
+        connection = Connection([Response(text='pong', status_code=200, headers={}),
+                                 Response(text='REPORT ztest.', status_code=200, headers={})])
+
+        async def scenario(async_connection):
+            response = await async_connection.execute('GET', 'ping', params={'count': 1})
+            text = await async_connection.get_text('programs/programs/ztest/source/main')
+            return (response.text, text)
+
+        self.assertEqual(run(scenario, connection), ('pong', 'REPORT ztest.'))
+        self.assertEqual(connection.mock_methods(), [('GET', '/sap/bc/adt/ping'),
+                                                     ('GET', '/sap/bc/adt/programs/programs/ztest/source/main')])
+        self.assertEqual(connection.execs[0].params, {'count': 1})
+
+    def test_concurrent_object_reads(self):
+        connection = Connection([Response(text='REPORT ztest.', status_code=200, headers={})] * 3)
+        programs = [sap.adt.Program(connection, f'ZTEST{idx}') for idx in range(3)]
+
+        async def scenario(async_connection):
+            return await asyncio.gather(*(async_connection.text(program) for program in programs))
+
+        self.assertEqual(run(scenario, connection), ['REPORT ztest.'] * 3)
+        self.assertEqual(sorted(connection.mock_methods()),
+                         [('GET', f'/sap/bc/adt/programs/programs/ztest{idx}/source/main') for idx in range(3)])
+
+    def test_fetch_lock_unlock(self):
+        connection = Connection([Response(text=GET_EXECUTABLE_PROGRAM_ADT_XML, status_code=200, headers={}),
+                                 LOCK_RESPONSE_OK,
+                                 EMPTY_RESPONSE_OK])
+        program = sap.adt.Program(connection, 'ZHELLO_WORLD')
+
+        async def scenario(async_connection):
+            fetched = await async_connection.fetch(program)
+            handle = await async_connection.lock(program)
+            await async_connection.unlock(program, handle)
+            return (fetched, handle)
+
+        fetched, handle = run(scenario, connection)
+
+        self.assertIs(fetched, program)
+        self.assertEqual(program.description, 'Say hello!')
+        self.assertEqual(handle, 'win')
+        self.assertEqual([method for method, _ in connection.mock_methods()], ['GET', 'POST', 'POST'])
+
+    def test_create(self):
+        connection = Connection([EMPTY_RESPONSE_OK])
+        program = sap.adt.Program(connection, 'ZHELLO_WORLD', package='$TEST')
+
+        async def scenario(async_connection):
+            await async_connection.create(program, corrnr='NPL000008')
+
+        run(scenario, connection)
+
+        self.assertEqual(connection.mock_methods(), [('POST', '/sap/bc/adt/programs/programs')])
+        self.assertEqual(connection.execs[0].params, {'corrNr': 'NPL000008'})
+
+    def test_read_node(self):
+        connection = Connection([PACKAGE_ROOT_NODESTRUCTURE_OK_RESPONSE])
+
+        async def scenario(async_connection):
+            return await async_connection.read_node(sap.adt.Package(connection, '$VICTORY'))
+
+        node = run(scenario, connection)
+
+        self.assertEqual(connection.mock_methods(), [('POST', '/sap/bc/adt/repository/nodestructure')])
+        self.assertEqual(node.objects[0].OBJECT_NAME, '$VICTORY_TESTS')
+
+
+if __name__ == '__main__':
+    unittest.main()
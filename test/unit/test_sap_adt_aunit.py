@@ -47,6 +47,15 @@ class TestAUnitParseResults(unittest.TestCase):
         self.assertEqual([(alert.kind, alert.severity, alert.title) for alert in run_results.alerts],
                          [('noTestClasses', 'tolerable', 'The task definition does not refer to any test')])
 
+    def test_merge_run_results(self):
+        run_results = sap.adt.aunit.merge_run_results(
+            sap.adt.aunit.parse_run_results(xml)
+            for xml in (AUNIT_NO_TEST_RESULTS_XML, AUNIT_RESULTS_XML, AUNIT_NO_TEST_RESULTS_XML))
+
+        self.assertEqual([alert.kind for alert in run_results.alerts], ['noTestClasses'])
+        self.assertEqual([program.name for program in run_results.programs],
+                         ['ZCL_THEKING_MANUAL_HARDCORE', 'ZEXAMPLE_TESTS'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+import requests
+
+import sap.adt
+from sap.adt.cache import CacheEntry, ResponseCache
+
+
+def make_response(status_code, text='', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.encoding = 'utf-8'
+    response._content = text.encode('utf-8')
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def prepare_request(self, request):
+        return request.prepare()
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        return self.responses.pop(0)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_entry_without_validators(self):
+        self.assertIsNone(CacheEntry.from_response(make_response(200, 'data')))
+
+    def test_put_get(self):
+        cache = ResponseCache(self.tmpdir.name)
+
+        entry = CacheEntry.from_response(make_response(200, 'REPORT ztest.', {'ETag': '"1"', 'Content-Type': 'text/plain'}))
+        cache.put('https://example.com/program', 'text/plain', entry)
+
+        self.assertIsNone(cache.get('https://example.com/program', 'application/xml'))
+
+        cached = cache.get('https://example.com/program', 'text/plain')
+        self.assertEqual(cached.text, 'REPORT ztest.')
+        self.assertEqual(cached.conditional_headers(), {'If-None-Match': '"1"'})
+
+    def test_evict_least_recently_used(self):
+        cache = ResponseCache(self.tmpdir.name, max_size=600)
+
+        cache.put('first', '', CacheEntry('1' * 150, etag='1'))
+        first_path = cache._entry_path('first', '')
+        os.utime(first_path, (0, 0))
+
+        cache.put('second', '', CacheEntry('2' * 150, etag='2'))
+        second_path = cache._entry_path('second', '')
+        os.utime(second_path, (1, 1))
+
+        # makes the first entry recently used
+        cache.get('first', '')
+
+        cache.put('third', '', CacheEntry('3' * 150, etag='3'))
+
+        self.assertIsNotNone(cache.get('first', ''))
+        self.assertIsNone(cache.get('second', ''))
+        self.assertIsNotNone(cache.get('third', ''))
+
+
+class TestConnectionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+        self.connection = sap.adt.Connection('localhost', '357', 'anzeiger', 'password',
+                                             cache=ResponseCache(self.tmpdir.name))
+
+    def test_get_not_modified(self):
+        session = FakeSession([make_response(200, 'REPORT ztest.', {'ETag': '"1"', 'Content-Type': 'text/plain'}),
+                               make_response(304, '', {'ETag': '"1"'})])
+
+        with patch.object(self.connection, '_get_session', return_value=session):
+            first = self.connection.get_text('programs/programs/ztest/source/main')
+            second = self.connection.execute('GET', 'programs/programs/ztest/source/main', headers={'Accept': 'text/plain'})
+
+        self.assertEqual(first, 'REPORT ztest.')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.text, 'REPORT ztest.')
+        self.assertEqual(second.headers['Content-Type'], 'text/plain')
+
+        self.assertNotIn('If-None-Match', session.requests[0].headers)
+        self.assertEqual(session.requests[1].headers['If-None-Match'], '"1"')
+
+    def test_get_modified(self):
+        session = FakeSession([make_response(200, 'REPORT ztest.', {'Last-Modified': 'Wed, 24 Apr 2019 18:19:16 GMT'}),
+                               make_response(200, 'REPORT zchanged.', {'Last-Modified': 'Thu, 25 Apr 2019 18:19:16 GMT'}),
+                               make_response(304)])
+
+        with patch.object(self.connection, '_get_session', return_value=session):
+            self.connection.get_text('programs/programs/ztest/source/main')
+            changed = self.connection.get_text('programs/programs/ztest/source/main')
+            cached = self.connection.get_text('programs/programs/ztest/source/main')
+
+        self.assertEqual(changed, 'REPORT zchanged.')
+        self.assertEqual(cached, 'REPORT zchanged.')
+        self.assertEqual(session.requests[1].headers['If-Modified-Since'], 'Wed, 24 Apr 2019 18:19:16 GMT')
+        self.assertEqual(session.requests[2].headers['If-Modified-Since'], 'Thu, 25 Apr 2019 18:19:16 GMT')
+
+    def test_download_text_not_modified(self):
+        streamed = make_response(200, headers={'ETag': '"1"'})
+        streamed._content = False
+        streamed.raw = BytesIO(b'REPORT ztest.')
+
+        session = FakeSession([streamed, make_response(304, '', {'ETag': '"1"'})])
+
+        first = BytesIO()
+        second = BytesIO()
+        with patch.object(self.connection, '_get_session', return_value=session):
+            self.connection.download_text('programs/programs/ztest/source/main', first)
+            self.connection.download_text('programs/programs/ztest/source/main', second)
+
+        self.assertEqual(first.getvalue(), b'REPORT ztest.')
+        self.assertEqual(second.getvalue(), b'REPORT ztest.')
+        self.assertEqual(session.requests[1].headers['If-None-Match'], '"1"')
+
+    def test_cached_response_iter_content(self):
+        entry = CacheEntry('REPORT ztest.', etag='"1"')
+        response = entry.to_response(make_response(304))
+
+        self.assertEqual(b''.join(response.iter_content(4)), b'REPORT ztest.')
+        response.close()
+
+    def test_post_not_cached(self):
+        session = FakeSession([make_response(200, 'OK', {'ETag': '"1"'}),
+                               make_response(200, 'OK', {'ETag': '"1"'})])
+
+        with patch.object(self.connection, '_get_session', return_value=session):
+            self.connection.execute('POST', 'activation')
+            self.connection.execute('POST', 'activation')
+
+        self.assertNotIn('If-None-Match', session.requests[1].headers)
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
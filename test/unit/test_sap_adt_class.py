@@ -66,7 +66,7 @@ class TestADTClass(unittest.TestCase):
         self.assertEqual(put_request.params['lockHandle'], 'win')
 
         self.maxDiff = None
-        self.assertEqual(put_request.body, FIXTURE_CLASS_MAIN_CODE)
+        self.assertEqual(put_request.body, FIXTURE_CLASS_MAIN_CODE.encode('utf-8'))
 
     def test_adt_class_write_with_corrnr(self):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, None])
@@ -105,6 +105,27 @@ class TestADTClass(unittest.TestCase):
     def test_adt_class_read_tests(self):
         self.include_read_test(TEST_CLASSES_READ_RESPONSE_OK, lambda clas: clas.test_classes, 'includes/testclasses')
 
+    def test_adt_class_include_text_memoized(self):
+        conn = Connection([DEFINITIONS_READ_RESPONSE_OK, LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, None,
+                           IMPLEMENTATIONS_READ_RESPONSE_OK])
+
+        clas = sap.adt.Class(conn, 'ZCL_HELLO_WORLD')
+        clas.definitions.memoize_text()
+
+        self.assertEqual(clas.definitions.text, DEFINITIONS_READ_RESPONSE_OK.text)
+        self.assertEqual(clas.definitions.text, DEFINITIONS_READ_RESPONSE_OK.text)
+
+        with clas.definitions.open_editor() as editor:
+            editor.write('* new content')
+
+        self.assertEqual(clas.definitions.text, IMPLEMENTATIONS_READ_RESPONSE_OK.text)
+        self.assertEqual([(e.method, e.adt_uri) for e in conn.execs],
+                         [('GET', '/sap/bc/adt/oo/classes/zcl_hello_world/includes/definitions'),
+                          ('POST', '/sap/bc/adt/oo/classes/zcl_hello_world'),
+                          ('PUT', '/sap/bc/adt/oo/classes/zcl_hello_world/includes/definitions'),
+                          ('POST', '/sap/bc/adt/oo/classes/zcl_hello_world'),
+                          ('GET', '/sap/bc/adt/oo/classes/zcl_hello_world/includes/definitions')])
+
     def include_write_test(self, getter, includes_uri):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, None])
 
@@ -123,7 +144,7 @@ class TestADTClass(unittest.TestCase):
         self.assertEqual(put_request.params['lockHandle'], 'win')
 
         self.maxDiff = None
-        self.assertEqual(put_request.body, '* new content')
+        self.assertEqual(put_request.body, b'* new content')
 
     def test_adt_class_write_definitions(self):
         self.include_write_test(lambda clas: clas.definitions, 'includes/definitions')
@@ -168,6 +189,12 @@ class TestADTClass(unittest.TestCase):
         self.assertEqual(clas.description, 'You cannot stop me!')
         self.assertEqual(clas.modeled, False)
         self.assertEqual(clas.fix_point_arithmetic, True)
+        self.assertEqual(clas.changed_at, '2019-03-07T20:22:01Z')
+        self.assertEqual(clas.include_versions, {'definitions': '2019-03-07T20:22:01Z',
+                                                 'implementations': '2019-03-07T20:22:01Z',
+                                                 'macros': '2019-02-02T13:01:06Z',
+                                                 'testclasses': '2019-02-02T13:01:06Z',
+                                                 'main': '2019-02-02T13:01:06Z'})
 
 
 if __name__ == '__main__':
@@ -1,8 +1,19 @@
 #!/usr/bin/env python3
 
+import logging
 import unittest
+from io import BytesIO
+from unittest.mock import patch, call, PropertyMock
+from concurrent.futures import ThreadPoolExecutor
 
+import requests
+
+import sap
 import sap.adt
+from sap.adt.core import log_response
+from sap.adt.errors import HTTPRequestError
+
+from mock import make_http_response, SessionSend
 
 
 class TestADTConnection(unittest.TestCase):
@@ -31,6 +42,262 @@ class TestADTConnection(unittest.TestCase):
 
         self.assertEqual(connection._base_url, 'http://localhost:8000/sap/bc/adt')
 
+    def test_adt_connection_session_created_once(self):
+        connection = sap.adt.Connection('localhost', '357', 'anzeiger', 'password')
+
+        with patch.object(connection, '_create_session') as fake_create:
+            fake_create.return_value = 'session'
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                sessions = list(executor.map(lambda _: connection._get_session(), range(8)))
+
+        fake_create.assert_called_once_with()
+        self.assertEqual(sessions, ['session'] * 8)
+
+
+class TestADTConnectionRecovery(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = sap.adt.Connection('localhost', '357', 'anzeiger', 'password', backoff_factor=1)
+
+        patcher = patch('sap.adt.core.time.sleep')
+        self.fake_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def execute(self, responses, method='GET', body=None):
+        session_send = SessionSend(responses)
+
+        def read_body(session, request, **kwargs):
+            if hasattr(request.body, 'read'):
+                request.body = request.body.read()
+
+            return session_send(session, request, **kwargs)
+
+        with patch.object(requests.Session, 'send', autospec=True, side_effect=read_body):
+            response = self.connection.execute(method, 'programs/programs/ztest', body=body)
+
+        return (response, session_send.requests)
+
+    def test_retry_stream_body_rewound(self):
+        body = BytesIO(b'report ztest.')
+        body.seek(0)
+
+        response, requests_sent = self.execute([make_http_response(200, headers={'x-csrf-token': 'token'}),
+                                                make_http_response(503),
+                                                make_http_response(200, 'success')],
+                                               method='PUT', body=body)
+
+        self.assertEqual(response.text, 'success')
+        self.assertEqual([request.body for request in requests_sent[1:]], [b'report ztest.', b'report ztest.'])
+
+    def test_no_retry_generator_body(self):
+        with self.assertRaises(HTTPRequestError):
+            self.execute([make_http_response(200, headers={'x-csrf-token': 'token'}),
+                          make_http_response(503)],
+                         method='PUT', body=(chunk for chunk in [b'report ', b'ztest.']))
+
+        self.fake_sleep.assert_not_called()
+
+    def test_retry_gateway_errors_with_backoff(self):
+        response, requests_sent = self.execute([make_http_response(200, headers={'x-csrf-token': 'token'}),
+                                                make_http_response(503),
+                                                make_http_response(502),
+                                                make_http_response(200, 'success')])
+
+        self.assertEqual(response.text, 'success')
+        self.assertEqual(len(requests_sent), 4)
+        self.assertEqual(self.fake_sleep.call_args_list, [call(1), call(2)])
+
+    def test_retry_connection_error(self):
+        response, _ = self.execute([make_http_response(200, headers={'x-csrf-token': 'token'}),
+                                    requests.exceptions.ConnectionError('reset'),
+                                    make_http_response(200, 'success')])
+
+        self.assertEqual(response.text, 'success')
+        self.fake_sleep.assert_called_once_with(1)
+
+    def test_retry_bounded(self):
+        with self.assertRaises(HTTPRequestError) as caught:
+            self.execute([make_http_response(200, headers={'x-csrf-token': 'token'})]
+                         + [make_http_response(504) for _ in range(4)])
+
+        self.assertEqual(caught.exception.response.status_code, 504)
+        self.assertEqual(self.fake_sleep.call_args_list, [call(1), call(2), call(4)])
+
+    def test_no_retry_post(self):
+        with self.assertRaises(HTTPRequestError):
+            self.execute([make_http_response(200, headers={'x-csrf-token': 'token'}),
+                          make_http_response(503)],
+                         method='POST')
+
+        self.fake_sleep.assert_not_called()
+
+    def test_session_timeout_replayed(self):
+        response, requests_sent = self.execute([make_http_response(200, headers={'x-csrf-token': 'first'}),
+                                                make_http_response(440, 'Session timed out'),
+                                                make_http_response(200, headers={'x-csrf-token': 'second'}),
+                                                make_http_response(200, 'success')],
+                                               method='POST')
+
+        self.assertEqual(response.text, 'success')
+        self.assertEqual([(request.method, request.headers['x-csrf-token']) for request in requests_sent],
+                         [('GET', 'Fetch'), ('POST', 'first'), ('GET', 'Fetch'), ('POST', 'second')])
+        self.fake_sleep.assert_not_called()
+
+
+class TestADTConnectionStatistics(unittest.TestCase):
+
+    def test_adapter_configuration(self):
+        connection = sap.adt.Connection('localhost', '357', 'anzeiger', 'password', pool_size=16, connect_retries=2)
+
+        with patch.object(sap.adt.Connection, '_fetch_csrf_token'):
+            session = connection._get_session()
+
+        adapter = session.get_adapter('https://localhost:443/sap/bc/adt')
+        self.assertEqual(adapter._pool_maxsize, 16)
+        self.assertEqual(adapter.max_retries.total, 2)
+
+    def test_traffic_counters(self):
+        connection = sap.adt.Connection('localhost', '357', 'anzeiger', 'password')
+
+        def adapter_send(adapter, request, **kwargs):
+            response = responses.pop(0)
+            response.request = request
+            return response
+
+        responses = [make_http_response(200, headers={'x-csrf-token': 'token'}),
+                     make_http_response(200, 'REPORT ztest.')]
+
+        with patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True, side_effect=adapter_send):
+            connection.execute('PUT', 'programs/programs/ztest/source/main', body='REPORT ztest.')
+
+        pool = connection._session.get_adapter('https://localhost').poolmanager.connection_from_url('https://localhost')
+        pool.num_connections = 1
+
+        stats = connection.statistics
+        self.assertEqual(stats.requests_sent, 2)
+        self.assertEqual(stats.connections_opened, 1)
+        self.assertEqual(stats.connections_reused, 1)
+        self.assertEqual(stats.bytes_sent, len('REPORT ztest.'))
+        self.assertEqual(stats.bytes_received, len('REPORT ztest.'))
+        self.assertEqual(str(stats), 'HTTP requests: 2, connections opened: 1, connections reused: 1, '
+                                     'bytes sent: 13, bytes received: 13')
+
+    def test_traffic_counters_stream(self):
+        connection = sap.adt.Connection('localhost', '357', 'anzeiger', 'password')
+
+        def adapter_send(adapter, request, **kwargs):
+            response = responses.pop(0)
+            response.request = request
+            return response
+
+        responses = [make_http_response(200, headers={'x-csrf-token': 'token'}),
+                     make_http_response(200)]
+
+        with patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True, side_effect=adapter_send):
+            connection.execute('PUT', 'programs/programs/ztest/source/main', body=BytesIO(b'REPORT ztest.'))
+
+        self.assertEqual(connection.statistics.bytes_sent, len('REPORT ztest.'))
+
+    def test_traffic_counters_chunked(self):
+        connection = sap.adt.Connection('localhost', '357', 'anzeiger', 'password')
+
+        def adapter_send(adapter, request, **kwargs):
+            if request.body is not None:
+                sent.append(b''.join(request.body))
+
+            response = responses.pop(0)
+            response.request = request
+            return response
+
+        sent = []
+        responses = [make_http_response(200, headers={'x-csrf-token': 'token'}),
+                     make_http_response(200)]
+
+        with patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True, side_effect=adapter_send):
+            connection.execute('PUT', 'programs/programs/ztest/source/main',
+                               body=(chunk for chunk in (b'REPORT ', b'ztest.')))
+
+        self.assertEqual(sent, [b'REPORT ztest.'])
+        self.assertEqual(connection.statistics.bytes_sent, len('REPORT ztest.'))
+
+    def test_download_text_streamed(self):
+        connection = sap.adt.Connection('localhost', '357', 'anzeiger', 'password')
+
+        streamed = make_http_response(200, headers={'Content-Length': '13'})
+        streamed._content = False
+        streamed.raw = BytesIO(b'REPORT ztest.')
+
+        def adapter_send(adapter, request, **kwargs):
+            sent.append(kwargs['stream'])
+            response = responses.pop(0)
+            response.request = request
+            return response
+
+        sent = []
+        responses = [make_http_response(200, headers={'x-csrf-token': 'token'}), streamed]
+
+        dest = BytesIO()
+        with patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True, side_effect=adapter_send):
+            connection.download_text('programs/programs/ztest/source/main', dest, chunk_size=4)
+
+        self.assertEqual(dest.getvalue(), b'REPORT ztest.')
+        self.assertEqual(sent, [False, True])
+        self.assertEqual(connection.statistics.bytes_received, 13)
+
+    def test_download_text_streamed_error(self):
+        connection = sap.adt.Connection('localhost', '357', 'anzeiger', 'password')
+
+        streamed = make_http_response(404)
+        streamed._content = False
+        streamed.raw = BytesIO(b'Not found')
+
+        def adapter_send(adapter, request, **kwargs):
+            response = responses.pop(0)
+            response.request = request
+            return response
+
+        responses = [make_http_response(200, headers={'x-csrf-token': 'token'}), streamed]
+
+        with patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True, side_effect=adapter_send), \
+             patch.object(streamed, 'close') as fake_close, \
+             self.assertRaises(HTTPRequestError) as caught:
+            connection.download_text('programs/programs/ztest/source/main', BytesIO())
+
+        fake_close.assert_called_once_with()
+        self.assertEqual(caught.exception.response.text, 'Not found')
+
+
+class TestLogResponse(unittest.TestCase):
+
+    def test_body_not_read_without_debug(self):
+        response = make_http_response(200, 'body')
+
+        with patch.object(requests.Response, 'content', new_callable=PropertyMock) as fake_content:
+            with patch.object(sap.get_logger(), 'isEnabledFor', return_value=False):
+                log_response('GET', 'http://example.org', response)
+
+        fake_content.assert_not_called()
+
+    def test_body_not_read_stream(self):
+        response = make_http_response(200, 'body', headers={'Content-Length': '4'})
+
+        with patch.object(requests.Response, 'content', new_callable=PropertyMock) as fake_content:
+            with self.assertLogs(sap.get_logger(), level=logging.DEBUG) as logs:
+                log_response('GET', 'http://example.org', response, stream=True)
+
+        fake_content.assert_not_called()
+        self.assertEqual(logs.records[0].getMessage(), 'Response GET http://example.org: streamed 4 bytes')
+
+    def test_body_truncated(self):
+        response = make_http_response(200, 'a' * 100)
+
+        with self.assertLogs(sap.get_logger(), level=logging.DEBUG) as logs:
+            log_response('GET', 'http://example.org', response, limit=10)
+
+        self.assertEqual(logs.records[0].getMessage(),
+                         'Response GET http://example.org:\n++++\naaaaaaaaaa\n... (90 more bytes)\n++++')
+
 
 if __name__ == '__main__':
     unittest.main()
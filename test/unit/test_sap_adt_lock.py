@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import Mock
+
+import sap.adt
+from sap.errors import SAPCliError
+
+from fixtures_adt import LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK
+from mock import Connection
+
+
+class TestLockSession(unittest.TestCase):
+
+    def test_class_includes_share_lock(self):
+        conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
+        clas = sap.adt.Class(conn, 'ZCL_HELLO_WORLD')
+
+        with sap.adt.LockSession() as session:
+            for obj in (clas, clas.definitions, clas.implementations):
+                with session.open_editor(obj, corrnr='420') as editor:
+                    editor.write('* new content')
+
+        self.assertEqual(conn.mock_methods(), [('POST', '/sap/bc/adt/oo/classes/zcl_hello_world'),
+                                               ('PUT', '/sap/bc/adt/oo/classes/zcl_hello_world/source/main'),
+                                               ('PUT', '/sap/bc/adt/oo/classes/zcl_hello_world/includes/definitions'),
+                                               ('PUT', '/sap/bc/adt/oo/classes/zcl_hello_world/includes/implementations'),
+                                               ('POST', '/sap/bc/adt/oo/classes/zcl_hello_world')])
+
+        self.assertEqual([request.params for request in conn.execs[1:4]], [{'lockHandle': 'win', 'corrNr': '420'}] * 3)
+        self.assertEqual(conn.execs[4].params, {'_action': 'UNLOCK', 'lockHandle': 'win'})
+
+    def test_unlock_all_reverse_order(self):
+        first = Mock(uri='first')
+        first.lock.return_value = 'first_handle'
+        second = Mock(uri='second')
+        second.lock.return_value = 'second_handle'
+
+        unlocked = []
+        first.unlock.side_effect = unlocked.append
+        second.unlock.side_effect = unlocked.append
+
+        session = sap.adt.LockSession()
+        self.assertEqual(session.lock(first), 'first_handle')
+        self.assertEqual(session.lock(second), 'second_handle')
+        self.assertEqual(session.lock(first), 'first_handle')
+        session.close()
+
+        first.lock.assert_called_once_with()
+        self.assertEqual(unlocked, ['second_handle', 'first_handle'])
+
+        session.close()
+        self.assertEqual(len(unlocked), 2)
+
+    def test_unlock_error_raised_after_others(self):
+        first = Mock(uri='first')
+        second = Mock(uri='second')
+        second.unlock.side_effect = SAPCliError('not locked')
+
+        session = sap.adt.LockSession()
+        session.lock(first)
+        session.lock(second)
+
+        with self.assertRaises(SAPCliError) as caught:
+            session.close()
+
+        self.assertEqual(str(caught.exception), 'not locked')
+        first.unlock.assert_called_once_with(first.lock.return_value)
+
+    def test_unlock_error_does_not_hide_error(self):
+        obj = Mock(uri='obj')
+        obj.unlock.side_effect = SAPCliError('not locked')
+
+        with self.assertRaises(SAPCliError) as caught:
+            with sap.adt.LockSession() as session:
+                session.lock(obj)
+                raise SAPCliError('write failed')
+
+        self.assertEqual(str(caught.exception), 'write failed')
+        obj.unlock.assert_called_once_with(obj.lock.return_value)
+
+    def test_unlock_error_raised_on_exit(self):
+        obj = Mock(uri='obj')
+        obj.unlock.side_effect = SAPCliError('not locked')
+
+        with self.assertRaises(SAPCliError) as caught:
+            with sap.adt.LockSession() as session:
+                session.lock(obj)
+
+        self.assertEqual(str(caught.exception), 'not locked')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,13 @@
 #!/bin/python
 
+import io
 import unittest
 
 from sap import get_logger
 from sap.adt import ADTObject, ADTObjectType, ADTCoreData, OrderedClassMembers
 from sap.adt.objects import XMLNamespace
 from sap.adt.annotations import xml_element, xml_attribute
-from sap.adt.marshalling import Marshal, Element, adt_object_to_element_name, ElementHandler
+from sap.adt.marshalling import Marshal, StreamWriter, adt_object_to_element_name, ElementHandler, marshal_plan
 
 
 class Dummy(ADTObject):
@@ -67,6 +68,10 @@ class Dummy(ADTObject):
     def third(self):
         return '3333'
 
+    @xml_attribute('attr_fourth', serialize=False)
+    def fourth(self):
+        return '4444'
+
     @xml_element('first_elem')
     def value(self):
         return self._nested
@@ -275,33 +280,42 @@ class DummyContainer(ADTObject):
 class TestADTAnnotation(unittest.TestCase):
 
 
-    def test_tree_generation(self):
-        obj = Dummy()
-        marshal = Marshal()
-        xmltree = marshal._object_to_tree(obj)
+    def test_serialize_to_stream(self):
+        dest = io.StringIO()
+        self.assertIsNone(Marshal().serialize(Dummy(), dest=dest))
 
-        self.assertEqual(xmltree.name, 'dummyxmlns:dummyelem')
-        self.assertEqual(xmltree.attributes['attr_first'], '11111')
-        self.assertEqual(xmltree.attributes['attr_second'], '22222')
-        self.assertEqual(xmltree.attributes['attr_third'], '3333')
+        xml = dest.getvalue()
+        self.assertEqual(xml, Marshal().serialize(Dummy()))
 
-        self.assertEqual(xmltree.children[0].name, 'adtcore:packageRef')
+        self.assertIn(' attr_first="11111" attr_second="22222" attr_third="3333">\n<adtcore:packageRef/>\n', xml)
+        self.assertNotIn('attr_fourth', xml)
+        self.assertIn('<first_elem nst_fst="nst_fst_val" nst_scn="nst_scn_val">\n<child_nst sup_nst_fst="yetanother"/>\n</first_elem>', xml)
 
-        self.assertEqual(xmltree.children[1].name, 'first_elem')
-        self.assertEqual(xmltree.children[1].attributes['nst_fst'], 'nst_fst_val')
-        self.assertEqual(xmltree.children[1].attributes['nst_scn'], 'nst_scn_val')
+    def test_serialize_to_binary_stream(self):
+        dest = io.BytesIO()
+        Marshal().serialize(Dummy(), dest=dest)
 
-        self.assertEqual(xmltree.children[1].children[0].name, 'child_nst')
-        self.assertEqual(xmltree.children[1].children[0].attributes['sup_nst_fst'], 'yetanother')
+        self.assertFalse(dest.closed)
+        self.assertEqual(dest.getvalue(), Marshal().serialize(Dummy()).encode('utf-8'))
 
     def test_xml_formatting(self):
-        marshal = Marshal()
-        elem = Element('root')
-        elem.add_attribute('one', '1')
-        elem.add_attribute('two', '2')
-        child = elem.add_child('child')
-        xml = marshal._tree_to_xml(elem)
-        self.assertEqual(xml, '<?xml version="1.0" encoding="UTF-8"?>\n<root one="1" two="2">\n<child/>\n</root>')
+        dest = io.StringIO()
+        writer = StreamWriter(dest)
+        writer.declaration()
+        writer.start('root', {'one': '1', 'two': 2})
+        writer.start('child', {})
+        writer.end()
+        writer.start('child', {})
+        writer.end()
+        writer.end()
+        self.assertEqual(dest.getvalue(), '<?xml version="1.0" encoding="UTF-8"?>\n<root one="1" two="2">\n<child/>\n<child/>\n</root>')
+
+    def test_xml_attribute_escaping(self):
+        dest = io.StringIO()
+        writer = StreamWriter(dest)
+        writer.start('root', {'text': 'a < b & "c" > d\n'})
+        writer.end()
+        self.assertEqual(dest.getvalue(), '<root text="a &lt; b &amp; &quot;c&quot; &gt; d&#10;"/>')
 
     def test_element_handler(self):
         adt_object = DummyWithSetters()
@@ -393,6 +407,25 @@ class TestADTAnnotation(unittest.TestCase):
 <item number="3"/>
 </adtcore:container>''')
 
+    def test_marshal_plan(self):
+        plan = marshal_plan(Dummy)
+
+        self.assertIs(plan, marshal_plan(Dummy))
+
+        serialized = [attr.name for attr in plan.serialized_attributes]
+        self.assertEqual(serialized[-3:], ['attr_first', 'attr_second', 'attr_third'])
+        self.assertNotIn('attr_fourth', serialized)
+
+        serialized = [attr.name for attr in plan.serialized_elements]
+        self.assertEqual(serialized, ['adtcore:packageRef', 'first_elem', 'readonly_elem'])
+
+        self.assertIn('attr_fourth', plan.attributes)
+        self.assertNotIn('attr_third', plan.attributes)
+
+        elements = [attr.name for attr in plan.elements]
+        self.assertIn('first_elem', elements)
+        self.assertNotIn('readonly_elem', elements)
+
 
 if __name__ == '__main__':
     unittest.main()
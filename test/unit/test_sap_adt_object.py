@@ -221,6 +221,15 @@ class TestADTObject(unittest.TestCase):
             self.assertEqual(editor.lock_handle, 'clock')
             self.assertEqual(editor.corrnr, '123456')
 
+    def test_open_editor_without_unlock(self):
+        connection = Connection([])
+        victory = DummyADTObject(connection=connection, name='editor_no_unlock')
+
+        with victory.open_editor(lock_handle='clock', unlock=False) as editor:
+            self.assertEqual(editor.lock_handle, 'clock')
+
+        self.assertEqual(connection.execs, [])
+
     def test_push(self):
         connection = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
         victory = DummyADTObject(connection=connection, name='SOFTWARE_ENGINEER')
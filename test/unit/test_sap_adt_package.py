@@ -1,12 +1,13 @@
 #!/bin/python
 
 import unittest
+import threading
 from types import SimpleNamespace
 
 from sap import get_logger
 import sap.adt
 
-from mock import Connection, Response
+from mock import Connection, Response, Request
 
 from fixtures_adt_package import GET_PACKAGE_ADT_XML
 from fixtures_adt_repository import (PACKAGE_ROOT_NODESTRUCTURE_OK_RESPONSE,
@@ -151,5 +152,49 @@ class TestADTPackageWalk(unittest.TestCase):
                          SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD')])
 
 
+class NodeStructureConnection(Connection):
+    """Returns node structures by parent names and requested node keys
+       to the concurrently running threads
+    """
+
+    def __init__(self, responses):
+        super(NodeStructureConnection, self).__init__()
+
+        self._responses = responses
+        self._lock = threading.Lock()
+
+    def execute(self, method, adt_uri, params=None, headers=None, body=None):
+        with self._lock:
+            self.execs.append(Request(method, '/' + self.uri + '/' + adt_uri, headers, body, params))
+
+        return self._responses[(params['parent_name'], body)]
+
+
+class TestADTPackageWalkJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = NodeStructureConnection({
+            ('$VICTORY', PACKAGE_ROOT_REQUEST_XML): PACKAGE_ROOT_NODESTRUCTURE_OK_RESPONSE,
+            ('$VICTORY', PACKAGE_SOURCE_LIBRARY_REQUEST_XML): PACKAGE_SOURCE_LIBRARY_NODESTRUCUTRE_OK_RESPONSE,
+            ('$VICTORY_TESTS', PACKAGE_ROOT_REQUEST_XML): PACKAGE_EMPTY_NODESTRUCTURE_OK_RESPONSE})
+
+    def test_same_results_as_sequential(self):
+        sequential = list(sap.adt.package.walk(sap.adt.Package(self.connection, '$VICTORY')))
+        concurrent = list(sap.adt.package.walk(sap.adt.Package(self.connection, '$VICTORY'), jobs=4))
+
+        self.assertEqual(concurrent, sequential)
+        self.assertEqual([path for path, _, _ in concurrent], [[], ['$VICTORY_TESTS']])
+        self.assertEqual(len(self.connection.execs), 6)
+
+    def test_stop_iteration_early(self):
+        walk_iter = sap.adt.package.walk(sap.adt.Package(self.connection, '$VICTORY'), jobs=4)
+
+        root_path, subpackages, _ = next(walk_iter)
+        walk_iter.close()
+
+        self.assertEqual(root_path, [])
+        self.assertEqual(subpackages, ['$VICTORY_TESTS'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from types import SimpleNamespace
+
+from sap.adt.packageindex import PackageIndex
+
+
+SYSTEM = 'https://mockhost:443/sap/bc/adt?sap-client=001'
+
+VICTORY_WALK = [
+    ([], ['$VICTORY_TESTS', '$VICTORY_DOC'], [SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_WORLD'),
+                                              SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD')]),
+    (['$VICTORY_TESTS'], ['$VICTORY_UNIT'], [SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_TESTS')]),
+    (['$VICTORY_DOC'], [], []),
+    (['$VICTORY_TESTS', '$VICTORY_UNIT'], [], [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD')]),
+]
+
+
+class TestPackageIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'packages.db')
+
+        self.index = PackageIndex(self.path)
+        self.addCleanup(self.index.close)
+
+    def test_update_and_walk(self):
+        self.assertFalse(self.index.is_fresh(SYSTEM, '$VICTORY'))
+
+        self.index.update(SYSTEM, '$VICTORY', iter(VICTORY_WALK))
+
+        self.assertTrue(self.index.is_fresh(SYSTEM, '$VICTORY'))
+        self.assertTrue(self.index.is_fresh(SYSTEM, '$VICTORY_UNIT'))
+        self.assertFalse(self.index.is_fresh('other', '$VICTORY'))
+
+        self.assertEqual(list(PackageIndex(self.path).walk(SYSTEM, '$VICTORY')), VICTORY_WALK)
+
+    def test_walk_subpackage(self):
+        self.index.update(SYSTEM, '$VICTORY', iter(VICTORY_WALK))
+
+        self.assertEqual(list(self.index.walk(SYSTEM, '$VICTORY_TESTS')),
+                         [([], ['$VICTORY_UNIT'], [SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_TESTS')]),
+                          (['$VICTORY_UNIT'], [], [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD')])])
+
+    def test_update_replaces_tree(self):
+        self.index.update(SYSTEM, '$VICTORY', iter(VICTORY_WALK))
+        self.index.update(SYSTEM, '$VICTORY_TESTS', iter([([], [], [])]))
+
+        self.assertFalse(self.index.is_fresh(SYSTEM, '$VICTORY_UNIT'))
+        self.assertEqual(self.index.owners(SYSTEM, 'ZIF_HELLO_WORLD'), [])
+        self.assertEqual([path for path, _, _ in self.index.walk(SYSTEM, '$VICTORY')],
+                         [[], ['$VICTORY_TESTS'], ['$VICTORY_DOC']])
+
+    def test_owners(self):
+        self.index.update(SYSTEM, '$VICTORY', iter(VICTORY_WALK))
+
+        self.assertEqual(self.index.owners(SYSTEM, 'ZIF_HELLO_WORLD'),
+                         [SimpleNamespace(package='$VICTORY_UNIT', typ='INTF/OI', name='ZIF_HELLO_WORLD')])
+        self.assertEqual(self.index.owners(SYSTEM, 'ZIF_HELLO_WORLD', typ='CLAS/OC'), [])
+
+    def test_find(self):
+        self.index.update(SYSTEM, '$VICTORY', iter(VICTORY_WALK))
+
+        self.assertEqual([obj.name for obj in self.index.find(SYSTEM, 'ZCL_HELLO')],
+                         ['ZCL_HELLO_TESTS', 'ZCL_HELLO_WORLD'])
+        self.assertEqual(len(self.index.find(SYSTEM, '')), 4)
+        self.assertEqual(self.index.find(SYSTEM, 'ZCL_HELLO_%'), [])
+
+    def test_ttl(self):
+        self.index.update(SYSTEM, '$VICTORY', iter(VICTORY_WALK))
+
+        index = PackageIndex(self.path, ttl=60)
+        self.addCleanup(index.close)
+
+        with patch('sap.adt.packageindex.time.time', return_value=self.now() + 61):
+            self.assertFalse(index.is_fresh(SYSTEM, '$VICTORY'))
+            self.assertEqual(index.owners(SYSTEM, 'ZIF_HELLO_WORLD'), [])
+            self.assertEqual(index.find(SYSTEM, 'Z'), [])
+
+        never = PackageIndex(self.path, ttl=None)
+        self.addCleanup(never.close)
+
+        with patch('sap.adt.packageindex.time.time', return_value=self.now() + 10 ** 9):
+            self.assertTrue(never.is_fresh(SYSTEM, '$VICTORY'))
+
+    def now(self):
+        return self.index._package_row(SYSTEM, '$VICTORY')[2]
+
+
+if __name__ == '__main__':
+    unittest.main()
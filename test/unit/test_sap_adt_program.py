@@ -47,7 +47,7 @@ class TestADTProgram(unittest.TestCase):
         self.assertEqual(put_request.params, {'lockHandle': 'win'})
 
         self.maxDiff = None
-        self.assertEqual(put_request.body, FIXTURE_REPORT_CODE)
+        self.assertEqual(put_request.body, FIXTURE_REPORT_CODE.encode('utf-8'))
 
     def test_program_write_with_corrnr(self):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, None])
@@ -75,6 +75,41 @@ class TestADTProgram(unittest.TestCase):
         self.assertEqual(program.case_sensitive, True)
         self.assertEqual(program.application_database, 'S')
 
+    def test_program_text_not_memoized(self):
+        conn = Connection([Response(text='first', status_code=200, headers={}),
+                           Response(text='second', status_code=200, headers={})])
+        program = sap.adt.Program(conn, 'ZHELLO_WORLD')
+
+        self.assertEqual([program.text, program.text], ['first', 'second'])
+        self.assertEqual(len(conn.execs), 2)
+
+    def test_program_text_memoized(self):
+        conn = Connection([Response(text='first', status_code=200, headers={}),
+                           Response(text='second', status_code=200, headers={})])
+        program = sap.adt.Program(conn, 'ZHELLO_WORLD').memoize_text()
+
+        self.assertEqual([program.text, program.text], ['first', 'first'])
+        self.assertEqual(len(conn.execs), 1)
+
+        program.refresh()
+        self.assertEqual([program.text, program.text], ['second', 'second'])
+        self.assertEqual(len(conn.execs), 2)
+
+    def test_program_text_memo_invalidated_by_write(self):
+        conn = Connection([Response(text='first', status_code=200, headers={}),
+                           LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, None,
+                           Response(text=FIXTURE_REPORT_CODE, status_code=200, headers={})])
+        program = sap.adt.Program(conn, 'ZHELLO_WORLD').memoize_text()
+
+        self.assertEqual(program.text, 'first')
+
+        with program.open_editor() as editor:
+            editor.write(FIXTURE_REPORT_CODE)
+
+        self.assertEqual(program.text, FIXTURE_REPORT_CODE)
+        self.assertEqual(program.text, FIXTURE_REPORT_CODE)
+        self.assertEqual([request.method for request in conn.execs], ['GET', 'POST', 'PUT', 'POST', 'GET'])
+
 
 if __name__ == '__main__':
     unittest.main()
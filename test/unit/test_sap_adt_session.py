@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests
+
+import sap.adt
+from sap.adt.errors import HTTPRequestError
+from sap.adt.session import SessionState, SessionStore
+
+from mock import make_http_response, SessionSend
+
+
+class TestSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'sessions.json')
+
+    def test_save_load_remove(self):
+        store = SessionStore(self.path)
+        self.assertIsNone(store.load('user@host'))
+
+        store.save('user@host', SessionState({'SAP_SESSIONID_NPL_001': 'cookie'}, 'token'))
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+        state = SessionStore(self.path).load('user@host')
+        self.assertEqual(state.cookies, {'SAP_SESSIONID_NPL_001': 'cookie'})
+        self.assertEqual(state.csrf_token, 'token')
+
+        store.remove('user@host')
+        self.assertIsNone(store.load('user@host'))
+
+
+class TestConnectionSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = SessionStore(os.path.join(self.tmpdir.name, 'sessions.json'))
+
+    def new_connection(self):
+        return sap.adt.Connection('localhost', '357', 'anzeiger', 'password', session_store=self.store)
+
+    def test_session_stored_and_reused(self):
+        fake_send = SessionSend([make_http_response(200, headers={'x-csrf-token': 'first'},
+                                            cookies={'SAP_SESSIONID_NPL_357': 'cookie'}),
+                              make_http_response(200, 'REPORT ztest.'),
+                              make_http_response(200, 'REPORT ztest.')])
+
+        with patch.object(requests.Session, 'send', autospec=True, side_effect=fake_send):
+            self.new_connection().get_text('programs/programs/ztest/source/main')
+            self.new_connection().get_text('programs/programs/ztest/source/main')
+
+        self.assertEqual([request.path_url.split('?')[0] for request in fake_send.requests],
+                         ['/sap/bc/adt/core/discovery',
+                          '/sap/bc/adt/programs/programs/ztest/source/main',
+                          '/sap/bc/adt/programs/programs/ztest/source/main'])
+
+        self.assertEqual(fake_send.requests[2].headers['x-csrf-token'], 'first')
+        self.assertEqual(fake_send.requests[2].headers['Cookie'], 'SAP_SESSIONID_NPL_357=cookie')
+
+    def test_rejected_token_refetched(self):
+        self.store.save(self.new_connection().session_key, SessionState({'SAP_SESSIONID_NPL_357': 'expired'}, 'old'))
+
+        fake_send = SessionSend([make_http_response(403, 'CSRF token validation failed', headers={'x-csrf-token': 'Required'}),
+                              make_http_response(200, headers={'x-csrf-token': 'new'},
+                                            cookies={'SAP_SESSIONID_NPL_357': 'fresh'}),
+                              make_http_response(200)])
+
+        with patch.object(requests.Session, 'send', autospec=True, side_effect=fake_send):
+            self.new_connection().execute('POST', 'activation')
+
+        self.assertEqual([(request.method, request.headers['x-csrf-token']) for request in fake_send.requests],
+                         [('POST', 'old'), ('GET', 'Fetch'), ('POST', 'new')])
+
+        self.assertNotIn('Cookie', fake_send.requests[1].headers)
+
+        state = self.store.load(self.new_connection().session_key)
+        self.assertEqual(state.csrf_token, 'new')
+        self.assertEqual(state.cookies, {'SAP_SESSIONID_NPL_357': 'fresh'})
+
+    def test_other_forbidden_not_retried(self):
+        self.store.save(self.new_connection().session_key, SessionState({}, 'old'))
+
+        fake_send = SessionSend([make_http_response(403, 'No authorization')])
+
+        with patch.object(requests.Session, 'send', autospec=True, side_effect=fake_send), \
+             self.assertRaises(HTTPRequestError):
+            self.new_connection().execute('POST', 'activation')
+
+        self.assertEqual(len(fake_send.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -108,5 +108,64 @@ class TestADTWBActivate(unittest.TestCase):
         self.assertEqual(conn.execs[1].body, ACTIVATION_REFERENCES_XML)
 
 
+class TestADTWBActivateMany(unittest.TestCase):
+
+    def create_fake_objects(self, responses):
+        conn = Connection(responses=responses)
+
+        objects = []
+        for name in ('zone', 'ztwo'):
+            adt_object = Mock()
+            adt_object.full_adt_uri = f'/sap/bc/adt/programs/programs/{name}'
+            adt_object.name = name
+            adt_object.connection = conn
+            objects.append(adt_object)
+
+        return (conn, objects)
+
+    def test_adt_wb_activate_many_ok(self):
+        conn, objects = self.create_fake_objects([EMPTY_RESPONSE_OK])
+
+        sap.adt.wb.activate_many(iter(objects))
+
+        self.assertEqual(conn.mock_methods(), [('POST', '/sap/bc/adt/activation')])
+        self.assertEqual(conn.execs[0].params, {'method': 'activate', 'preauditRequested': 'true'})
+
+        self.maxDiff = None
+        self.assertEqual(conn.execs[0].body, '''<?xml version="1.0" encoding="UTF-8"?>
+<adtcore:objectReferences xmlns:adtcore="http://www.sap.com/adt/core">
+<adtcore:objectReference adtcore:uri="/sap/bc/adt/programs/programs/zone" adtcore:name="ZONE"/>
+<adtcore:objectReference adtcore:uri="/sap/bc/adt/programs/programs/ztwo" adtcore:name="ZTWO"/>
+</adtcore:objectReferences>''')
+
+    def test_adt_wb_activate_many_preaudit(self):
+        conn, objects = self.create_fake_objects([Response(status_code=200,
+                                                           text=INACTIVE_OBJECTS_XML,
+                                                           headers={'Content-Type': 'application/vnd.sap.adt.inactivectsobjects.v1+xml'}),
+                                                  EMPTY_RESPONSE_OK])
+
+        sap.adt.wb.activate_many(objects)
+
+        self.assertEqual(conn.mock_methods(), [('POST', '/sap/bc/adt/activation')] * 2)
+        self.assertEqual(conn.execs[1].params['preauditRequested'], 'false')
+
+        self.maxDiff = None
+        self.assertEqual(conn.execs[1].body, ACTIVATION_REFERENCES_XML)
+
+    def test_adt_wb_activate_many_fail(self):
+        conn, objects = self.create_fake_objects([Response(status_code=200,
+                                                           text=FIXTURES_EXP_ERROR_RESPONSE,
+                                                           headers={})])
+
+        with self.assertRaises(SAPCliError) as caught:
+            sap.adt.wb.activate_many(objects)
+
+        self.assertEqual(str(caught.exception),
+                         f'Could not activate the objects zone, ztwo: {FIXTURES_EXP_ERROR_RESPONSE}')
+
+    def test_adt_wb_activate_many_empty(self):
+        sap.adt.wb.activate_many([])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+import os
+import logging
+import unittest
+from unittest.mock import patch
+
+import xml.sax
+from xml.sax.handler import ContentHandler
+
+from sap.adt.xmlparser import parse_string, resolve_backend, debug_log, _LxmlEventEmitter, _lxml_available
+
+
+XML_DOCUMENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<adtcore:root xmlns:adtcore="http://www.sap.com/adt/core" adtcore:name="ROOT">
+<child value="1">text &amp; more</child>
+<child value="2"/>
+</adtcore:root>'''
+
+UNDECLARED_PREFIX_DOCUMENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<win:root win:name="ROOT"><win:child>text</win:child></win:root>'''
+
+
+class EventRecorder(ContentHandler):
+
+    def __init__(self):
+        super(EventRecorder, self).__init__()
+
+        self.events = []
+
+    def startElement(self, name, attrs):
+        self.events.append(('start', name, dict(attrs.items())))
+
+    def endElement(self, name):
+        self.events.append(('end', name))
+
+    def characters(self, content):
+        if self.events[-1][0] == 'text':
+            self.events[-1] = ('text', self.events[-1][1] + content)
+        else:
+            self.events.append(('text', content))
+
+
+class FakeLxmlElement:
+
+    def __init__(self, tag, prefix=None, nsmap=None, attrib=None, text=None, tail=None):
+        self.tag = tag
+        self.prefix = prefix
+        self.nsmap = nsmap or {}
+        self.attrib = attrib or {}
+        self.text = text
+        self.tail = tail
+
+    def clear(self):
+        self.text = None
+        self.tail = None
+
+
+class TestParseString(unittest.TestCase):
+
+    def parse(self, backend):
+        handler = EventRecorder()
+        parse_string(XML_DOCUMENT, handler, backend=backend)
+        return handler.events
+
+    def test_expat_same_as_sax(self):
+        events = self.parse('expat')
+
+        self.assertEqual(events, self.parse('sax'))
+        self.assertEqual(events[0], ('start', 'adtcore:root', {'xmlns:adtcore': 'http://www.sap.com/adt/core',
+                                                                'adtcore:name': 'ROOT'}))
+        self.assertIn(('text', 'text & more'), events)
+
+    def test_bytes_input(self):
+        handler = EventRecorder()
+        parse_string(XML_DOCUMENT.encode('utf-8'), handler, backend='expat')
+
+        self.assertEqual(handler.events, self.parse('sax'))
+
+    def test_expat_error(self):
+        with self.assertRaises(xml.sax.SAXParseException) as caught:
+            parse_string('<root>\n<child>\n</root>', EventRecorder(), backend='expat')
+
+        self.assertEqual(caught.exception.getLineNumber(), 3)
+
+    def test_default_backend(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(resolve_backend(), 'expat')
+
+        with patch.dict(os.environ, {'SAP_XML_PARSER': 'SAX'}):
+            self.assertEqual(resolve_backend(), 'sax')
+
+    def test_lxml_fallback(self):
+        with patch('sap.adt.xmlparser._lxml_available', return_value=False):
+            self.assertEqual(resolve_backend('lxml'), 'expat')
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            resolve_backend('dom')
+
+
+@unittest.skipUnless(_lxml_available(), 'lxml is not installed')
+class TestParseStringLxml(unittest.TestCase):
+
+    def parse(self, xml_text, backend):
+        handler = EventRecorder()
+        parse_string(xml_text, handler, backend=backend)
+        return handler.events
+
+    def test_lxml_same_as_sax(self):
+        self.assertEqual(self.parse(XML_DOCUMENT, 'lxml'), self.parse(XML_DOCUMENT, 'sax'))
+
+    def test_lxml_undeclared_prefix(self):
+        events = self.parse(UNDECLARED_PREFIX_DOCUMENT, 'lxml')
+
+        self.assertEqual(events, self.parse(UNDECLARED_PREFIX_DOCUMENT, 'expat'))
+        self.assertEqual(events[0], ('start', 'win:root', {'win:name': 'ROOT'}))
+
+    def test_lxml_error(self):
+        with self.assertRaises(xml.sax.SAXParseException) as caught:
+            parse_string('<root>\n<child>\n</root>', EventRecorder(), backend='lxml')
+
+        self.assertEqual(caught.exception.getLineNumber(), 3)
+
+
+class TestLxmlEventEmitter(unittest.TestCase):
+
+    def test_events_order(self):
+        handler = EventRecorder()
+        emitter = _LxmlEventEmitter(handler)
+
+        root = FakeLxmlElement('{http://www.sap.com/adt/core}root', prefix='adtcore',
+                               nsmap={'adtcore': 'http://www.sap.com/adt/core'},
+                               attrib={'{http://www.sap.com/adt/core}name': 'ROOT'}, text='\n')
+        first = FakeLxmlElement('child', attrib={'value': '1'}, text='text & more', tail='\n')
+        second = FakeLxmlElement('child', attrib={'value': '2'}, tail='\n')
+
+        emitter.declare('adtcore', 'http://www.sap.com/adt/core')
+        emitter.start(root)
+        emitter.start(first)
+        emitter.end(first)
+        emitter.start(second)
+        emitter.end(second)
+        emitter.end(root)
+
+        self.assertEqual(handler.events, self.parse_with_sax())
+
+    def parse_with_sax(self):
+        handler = EventRecorder()
+        parse_string(XML_DOCUMENT, handler, backend='sax')
+        return handler.events
+
+
+class TestDebugLog(unittest.TestCase):
+
+    def test_debug_enabled(self):
+        logger = logging.getLogger('test_sap_adt_xmlparser.enabled')
+        logger.setLevel(logging.DEBUG)
+
+        self.assertEqual(debug_log(logger), logger.debug)
+
+    def test_debug_disabled(self):
+        logger = logging.getLogger('test_sap_adt_xmlparser.disabled')
+        logger.setLevel(logging.INFO)
+
+        with patch.object(logger, 'debug') as fake_debug:
+            debug_log(logger)('message %s', 'arg')
+
+        fake_debug.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,14 @@
 #!/bin/python
 
+import os
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
+import sap.adt
 import sap.cli
 import sap.cli.core
+from sap.errors import SAPCliError
 
 
 class TestModule(unittest.TestCase):
@@ -24,6 +28,59 @@ class TestModule(unittest.TestCase):
                 msg='The second item should be of a command group - Command: ' + str(idx))
 
 
+class TestEnvironInt(unittest.TestCase):
+
+    def test_environ_int_default(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(sap.cli.environ_int('SAP_HTTP_POOL_SIZE', 10), 10)
+
+    def test_environ_int_value(self):
+        with patch.dict(os.environ, {'SAP_HTTP_POOL_SIZE': '20'}):
+            self.assertEqual(sap.cli.environ_int('SAP_HTTP_POOL_SIZE', 10), 20)
+
+    def test_environ_int_not_integer(self):
+        with patch.dict(os.environ, {'SAP_HTTP_POOL_SIZE': 'many'}), \
+             self.assertRaises(SAPCliError) as caught:
+            sap.cli.environ_int('SAP_HTTP_POOL_SIZE', 10)
+
+        self.assertEqual(str(caught.exception),
+                         'The environment variable SAP_HTTP_POOL_SIZE must be an integer >= 0: many')
+
+    def test_environ_int_below_minimum(self):
+        with patch.dict(os.environ, {'SAP_HTTP_POOL_SIZE': '0'}), \
+             self.assertRaises(SAPCliError) as caught:
+            sap.cli.environ_int('SAP_HTTP_POOL_SIZE', 10, minimum=1)
+
+        self.assertEqual(str(caught.exception),
+                         'The environment variable SAP_HTTP_POOL_SIZE must be an integer >= 1: 0')
+
+
+class TestADTConnectionFromArgs(unittest.TestCase):
+
+    def connection_pool_size(self, environ, **kwargs):
+        args = SimpleNamespace(ashost='fixtures', client='123', user='user', password='pass',
+                               port=443, ssl=True, verify=True, **kwargs)
+
+        with patch.dict(os.environ, environ, clear=True), \
+             patch('sap.adt.Connection') as fake_connection:
+            sap.cli.adt_connection_from_args(args)
+
+        return fake_connection.call_args[1]['pool_size']
+
+    def test_pool_size_default(self):
+        self.assertEqual(self.connection_pool_size({}), sap.adt.core.DEFAULT_POOL_SIZE)
+
+    def test_pool_size_environ(self):
+        self.assertEqual(self.connection_pool_size({'SAP_HTTP_POOL_SIZE': '4'}, jobs=2), 4)
+
+    def test_pool_size_jobs(self):
+        self.assertEqual(self.connection_pool_size({'SAP_HTTP_POOL_SIZE': '4'}, jobs=16), 16)
+
+    def test_invalid_max_retries(self):
+        with self.assertRaises(SAPCliError):
+            self.connection_pool_size({'SAP_HTTP_MAX_RETRIES': 'x'})
+
+
 class TestPrinting(unittest.TestCase):
 
     def test_get_console_returns_global(self):
@@ -3,7 +3,7 @@
 from argparse import ArgumentParser
 import unittest
 from unittest.mock import patch, mock_open, call
-from io import StringIO
+from io import StringIO, BytesIO, TextIOWrapper
 
 import sap.cli.abapclass
 
@@ -74,36 +74,36 @@ class TestClassWrite(unittest.TestCase):
 
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
 
-        with patch('sys.stdin', StringIO('class stdin definition')):
+        with patch('sys.stdin', TextIOWrapper(BytesIO('class stdin definition'.encode('utf-8')))):
             args.execute(conn, args)
 
         self.assertEqual(len(conn.execs), 3)
 
         self.maxDiff = None
-        self.assertEqual(conn.execs[1][3], 'class stdin definition')
+        self.assertEqual(conn.execs[1][3], b'class stdin definition')
 
     def test_class_read_from_file(self):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
         args = parse_args(['write', 'ZCL_WRITER', 'zcl_class.abap'])
 
-        with patch('sap.cli.object.open', mock_open(read_data='class file definition')) as m:
+        with patch('sap.cli.object.open', mock_open(read_data=b'class file definition')) as m:
             args.execute(conn, args)
 
-        m.assert_called_once_with('zcl_class.abap', 'r')
+        m.assert_called_once_with('zcl_class.abap', 'rb')
 
         self.assertEqual(len(conn.execs), 3)
 
         self.maxDiff = None
-        self.assertEqual(conn.execs[1][3], 'class file definition')
+        self.assertEqual(conn.execs[1][3], b'class file definition')
 
     def test_class_read_from_file_with_name(self):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
         args = parse_args(['write', '-', 'zcl_class.clas.abap'])
 
-        with patch('sap.cli.object.open', mock_open(read_data='class file definition')) as m:
+        with patch('sap.cli.object.open', mock_open(read_data=b'class file definition')) as m:
             args.execute(conn, args)
 
-        m.assert_called_once_with('zcl_class.clas.abap', 'r')
+        m.assert_called_once_with('zcl_class.clas.abap', 'rb')
 
         self.assertEqual(len(conn.execs), 3)
         self.assertEqual(conn.execs[1].adt_uri, '/sap/bc/adt/oo/classes/zcl_class/source/main')
@@ -121,7 +121,7 @@ class TestClassWrite(unittest.TestCase):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
         args = parse_args(['write', 'ZCL_WRITER', 'zcl_class.abap', '--corrnr', '420'])
 
-        with patch('sap.cli.object.open', mock_open(read_data='class file definition')) as m:
+        with patch('sap.cli.object.open', mock_open(read_data=b'class file definition')) as m:
             args.execute(conn, args)
 
         self.assertEqual(conn.execs[1].params['corrNr'], '420')
@@ -156,7 +156,7 @@ class TestClassIncludes(unittest.TestCase):
 
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
 
-        with patch('sys.stdin', StringIO('* new content')):
+        with patch('sys.stdin', TextIOWrapper(BytesIO('* new content'.encode('utf-8')))):
             args.execute(conn, args)
 
         self.assertEqual(len(conn.execs), 3)
@@ -183,7 +183,7 @@ class TestClassIncludes(unittest.TestCase):
 
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
 
-        with patch('sap.cli.object.open', mock_open(read_data='* new content')):
+        with patch('sap.cli.object.open', mock_open(read_data=b'* new content')):
             args.execute(conn, args)
 
         self.assertEqual(len(conn.execs), 3)
@@ -204,7 +204,7 @@ class TestClassIncludes(unittest.TestCase):
 
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
 
-        with patch('sys.stdin', StringIO('* new content')):
+        with patch('sys.stdin', TextIOWrapper(BytesIO('* new content'.encode('utf-8')))):
             args.execute(conn, args)
 
         self.assertEqual(conn.mock_methods(),
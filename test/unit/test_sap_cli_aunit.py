@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 
+import os
 import sys
+import json
+import tempfile
+import subprocess
 
 import unittest
 from unittest.mock import patch, call
@@ -15,6 +19,12 @@ from fixtures_adt import LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK
 from fixtures_adt_aunit import AUNIT_NO_TEST_RESULTS_XML, AUNIT_RESULTS_XML
 
 
+def run_args(typ, names, output='human', jobs=1, split_package=False, run_size=None, changed_since=None,
+             dependency_map=None):
+    return SimpleNamespace(type=typ, name=names, output=output, jobs=jobs, split_package=split_package,
+                           run_size=run_size, changed_since=changed_since, dependency_map=dependency_map)
+
+
 class TestAUnitWrite(unittest.TestCase):
 
     def assert_print_no_test_classes(self, mock_print):
@@ -36,7 +46,7 @@ class TestAUnitWrite(unittest.TestCase):
 
     def test_aunit_invalid(self):
         with self.assertRaises(SAPCliError) as cm:
-            sap.cli.aunit.run('wrongconn', SimpleNamespace(type='foo', output='human'))
+            sap.cli.aunit.run('wrongconn', run_args('foo', ['foo']))
 
         self.assertEqual(str(cm.exception), 'Unknown type: foo')
 
@@ -44,7 +54,7 @@ class TestAUnitWrite(unittest.TestCase):
         connection = Connection([Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML, headers={})])
 
         with patch('sap.cli.aunit.print') as mock_print:
-            sap.cli.aunit.run(connection, SimpleNamespace(type='program', name='yprogram', output='human'))
+            sap.cli.aunit.run(connection, run_args('program', ['yprogram']))
 
         self.assertEqual(len(connection.execs), 1)
         self.assertIn('programs/programs/yprogram', connection.execs[0].body)
@@ -54,7 +64,7 @@ class TestAUnitWrite(unittest.TestCase):
         connection = Connection([Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML, headers={})])
 
         with patch('sap.cli.aunit.print') as mock_print:
-            sap.cli.aunit.run(connection, SimpleNamespace(type='class', name='yclass', output='human'))
+            sap.cli.aunit.run(connection, run_args('class', ['yclass']))
 
         self.assertEqual(len(connection.execs), 1)
         self.assertIn('oo/classes/yclass', connection.execs[0].body)
@@ -64,7 +74,7 @@ class TestAUnitWrite(unittest.TestCase):
         connection = Connection([Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML, headers={})])
 
         with patch('sap.cli.aunit.print') as mock_print:
-            sap.cli.aunit.run(connection, SimpleNamespace(type='package', name='ypackage', output='human'))
+            sap.cli.aunit.run(connection, run_args('package', ['ypackage']))
 
         self.assertEqual(len(connection.execs), 1)
         self.assertIn('packages/ypackage', connection.execs[0].body)
@@ -74,7 +84,7 @@ class TestAUnitWrite(unittest.TestCase):
         connection = Connection([Response(status_code=200, text=AUNIT_RESULTS_XML, headers={})])
 
         with patch('sap.cli.aunit.print') as mock_print:
-            exit_code = sap.cli.aunit.run(connection, SimpleNamespace(type='package', name='ypackage', output='human'))
+            exit_code = sap.cli.aunit.run(connection, run_args('package', ['ypackage']))
 
         self.assertEqual(exit_code, 3)
         self.assertEqual(len(connection.execs), 1)
@@ -107,7 +117,7 @@ class TestAUnitWrite(unittest.TestCase):
         connection = Connection([Response(status_code=200, text=AUNIT_RESULTS_XML, headers={})])
 
         with patch('sap.cli.aunit.print') as mock_print:
-            exit_code = sap.cli.aunit.run(connection, SimpleNamespace(type='package', name='ypackage', output='raw'))
+            exit_code = sap.cli.aunit.run(connection, run_args('package', ['ypackage'], output='raw'))
 
         self.assertEqual(exit_code, 3)
         self.assertEqual(len(connection.execs), 1)
@@ -119,7 +129,7 @@ class TestAUnitWrite(unittest.TestCase):
         connection = Connection([Response(status_code=200, text=AUNIT_RESULTS_XML, headers={})])
 
         with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
-            exit_code = sap.cli.aunit.run(connection, SimpleNamespace(type='package', name='ypackage', output='junit4'))
+            exit_code = sap.cli.aunit.run(connection, run_args('package', ['ypackage'], output='junit4'))
 
         self.assertEqual(exit_code, 3)
         self.assertEqual(len(connection.execs), 1)
@@ -164,6 +174,223 @@ class TestAUnitWrite(unittest.TestCase):
 ''')
 
 
+    def test_aunit_multiple_classes(self):
+        connection = Connection([Response(status_code=200, text=AUNIT_RESULTS_XML, headers={}),
+                                 Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML, headers={})])
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            exit_code = sap.cli.aunit.run(connection, run_args('class', ['yclass', 'zclass'], run_size=1))
+
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(len(connection.execs), 2)
+        self.assertIn('oo/classes/yclass', connection.execs[0].body)
+        self.assertNotIn('oo/classes/zclass', connection.execs[0].body)
+        self.assertIn('oo/classes/zclass', connection.execs[1].body)
+        self.assertTrue(mock_stdout.getvalue().startswith(
+            '* [tolerable] [noTestClasses] - The task definition does not refer to any test\n'
+            'ZCL_THEKING_MANUAL_HARDCORE\n'))
+        self.assertTrue(mock_stdout.getvalue().endswith('Successful: 3\nTolerable:  0\nCritical:   3\n'))
+
+    @patch('sap.adt.AUnit.execute')
+    def test_aunit_parallel_failed_run(self, fake_execute):
+        def execute(test_run):
+            if test_run[0].name == 'ZFAIL':
+                raise SAPCliError('ICM timeout')
+
+            return Response(status_code=200, text=AUNIT_RESULTS_XML, headers={})
+
+        fake_execute.side_effect = execute
+
+        with patch('sys.stdout', new_callable=StringIO), \
+             patch('sys.stderr', new_callable=StringIO) as mock_stderr:
+            exit_code = sap.cli.aunit.run(Connection(), run_args('program', ['ZFAIL', 'ZPASS'], jobs=2))
+
+        self.assertEqual(exit_code, 4)
+        self.assertEqual(sorted(obj.name for ((obj,),), _ in fake_execute.call_args_list), ['ZFAIL', 'ZPASS'])
+        self.assertIn('Failed to run ABAP Unit tests of PROG/P ZFAIL: ICM timeout\n', mock_stderr.getvalue())
+
+    @patch('sap.adt.AUnit.execute')
+    @patch('sap.adt.package.walk')
+    def test_aunit_split_package(self, fake_walk, fake_execute):
+        fake_walk.return_value = iter(
+            (([],
+              ['$VICTORY_TESTS'],
+              [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD'),
+               SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_WORLD'),
+               SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD')]),
+             (['$VICTORY_TESTS'],
+              [],
+              [SimpleNamespace(typ='CLAS/OC', name='ZCL_TESTS')]))
+        )
+        fake_execute.return_value = Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML, headers={})
+
+        with patch('sys.stdout', new_callable=StringIO), \
+             patch('sys.stderr', new_callable=StringIO) as mock_stderr:
+            exit_code = sap.cli.aunit.run(Connection(), run_args('package', ['$VICTORY'], split_package=True))
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(fake_walk.call_args[0][0].name, '$VICTORY')
+        self.assertEqual([[str(obj) for obj in test_run] for (test_run,), _ in fake_execute.call_args_list],
+                         [['CLAS/OC ZCL_HELLO_WORLD', 'PROG/P Z_HELLO_WORLD', 'CLAS/OC ZCL_TESTS']])
+        self.assertEqual(mock_stderr.getvalue(), 'Skipped object: INTF/OI ZIF_HELLO_WORLD\n')
+
+    @patch('sap.adt.AUnit.execute')
+    @patch('sap.adt.package.walk')
+    def test_aunit_split_package_function_group(self, fake_walk, fake_execute):
+        fake_walk.return_value = iter(
+            (([],
+              [],
+              [SimpleNamespace(typ='FUGR/F', name='ZFG_HELLO_WORLD'),
+               SimpleNamespace(typ='FUGR/FF', name='Z_FN_HELLO_WORLD'),
+               SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD')]),)
+        )
+        fake_execute.return_value = Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML, headers={})
+
+        with patch('sys.stdout', new_callable=StringIO), \
+             patch('sys.stderr', new_callable=StringIO) as mock_stderr:
+            exit_code = sap.cli.aunit.run(Connection(), run_args('package', ['$VICTORY'], split_package=True))
+
+        self.assertEqual(exit_code, 0)
+
+        (test_run,), _ = fake_execute.call_args
+        self.assertIsInstance(test_run[0], sap.adt.FunctionGroup)
+        self.assertEqual([obj.name for obj in test_run], ['ZFG_HELLO_WORLD', 'Z_HELLO_WORLD'])
+        self.assertEqual(mock_stderr.getvalue(), 'Skipped object: FUGR/FF Z_FN_HELLO_WORLD\n')
+
+    def test_aunit_multiple_classes_one_run(self):
+        connection = Connection([Response(status_code=200, text=AUNIT_RESULTS_XML, headers={})])
+
+        with patch('sys.stdout', new_callable=StringIO):
+            exit_code = sap.cli.aunit.run(connection, run_args('class', ['yclass', 'zclass']))
+
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(len(connection.execs), 1)
+        self.assertIn('''
+        <adtcore:objectReference adtcore:uri="/sap/bc/adt/oo/classes/yclass"/>
+        <adtcore:objectReference adtcore:uri="/sap/bc/adt/oo/classes/zclass"/>
+''', connection.execs[0].body)
+
+    def test_build_test_runs(self):
+        objects = list(range(7))
+
+        self.assertEqual(sap.cli.aunit.build_test_runs(objects, 1), [objects])
+        self.assertEqual(sap.cli.aunit.build_test_runs(objects, 3), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(sap.cli.aunit.build_test_runs(objects, 1, run_size=2), [[0, 1], [2, 3], [4, 5], [6]])
+        self.assertEqual(sap.cli.aunit.build_test_runs([], 3), [])
+
+    def test_aunit_split_class(self):
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            sap.cli.aunit.run(Connection(), run_args('class', ['yclass'], split_package=True))
+
+    def test_aunit_raw_two_runs(self):
+        connection = Connection()
+
+        for args in (run_args('program', ['ZONE', 'ZTWO'], output='raw', jobs=2),
+                     run_args('program', ['ZONE', 'ZTWO'], output='raw', run_size=1)):
+            with self.assertRaises(sap.cli.core.InvalidCommandLineError) as caught:
+                sap.cli.aunit.run(connection, args)
+
+            self.assertEqual(str(caught.exception),
+                             'The raw output needs all objects in one test run but there are 2: '
+                             'use --jobs 1 without --run-size')
+
+        self.assertEqual(connection.execs, [])
+
+    def test_aunit_raw_jobs_one_run(self):
+        connection = Connection([Response(status_code=200, text=AUNIT_RESULTS_XML, headers={})])
+
+        with patch('sap.cli.aunit.print') as mock_print:
+            exit_code = sap.cli.aunit.run(connection, run_args('program', ['ZONE'], output='raw', jobs=2))
+
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(mock_print.call_args_list[-1], call(AUNIT_RESULTS_XML))
+
+
+
+class TestAUnitChangedSince(unittest.TestCase):
+
+    def fake_git_diff(self, fake_run, files):
+        fake_run.return_value = subprocess.CompletedProcess([], 0, stdout='\n'.join(files) + '\n', stderr='')
+
+    @patch('sap.cli.aunit.subprocess.run')
+    def test_changed_object_names(self, fake_run):
+        self.fake_git_diff(fake_run, ['.abapgit.xml',
+                                      'src/zcl_foo.clas.abap',
+                                      'src/zcl_foo.clas.testclasses.abap',
+                                      'src/#dmo#cl_bar.clas.locals_imp.abap',
+                                      'src/sub/zreport.prog.abap'])
+
+        names = sap.cli.aunit.changed_object_names('origin/master')
+
+        self.assertEqual(names, {'ZCL_FOO', '/DMO/CL_BAR', 'ZREPORT'})
+        self.assertEqual(fake_run.call_args[0][0], ['git', 'diff', '--name-only', '--diff-filter=d', 'origin/master', '--'])
+
+    @patch('sap.cli.aunit.subprocess.run')
+    def test_changed_object_names_git_error(self, fake_run):
+        fake_run.side_effect = subprocess.CalledProcessError(128, ['git'], stderr="fatal: bad revision 'HEAD~9'\n")
+
+        with self.assertRaises(SAPCliError) as caught:
+            sap.cli.aunit.changed_object_names('HEAD~9')
+
+        self.assertEqual(str(caught.exception), "Could not list files changed since HEAD~9: fatal: bad revision 'HEAD~9'")
+
+    def test_add_dependent_objects(self):
+        dependencies = {'ZIF_FOO': ['ZCL_FOO', 'ZCL_BAR'], 'ZCL_FOO': ['ZCL_FOO_TEST'], 'ZCL_FOO_TEST': ['ZIF_FOO']}
+
+        self.assertEqual(sap.cli.aunit.add_dependent_objects({'ZIF_FOO'}, dependencies),
+                         {'ZIF_FOO', 'ZCL_FOO', 'ZCL_BAR', 'ZCL_FOO_TEST'})
+        self.assertEqual(sap.cli.aunit.add_dependent_objects({'ZREPORT'}, dependencies), {'ZREPORT'})
+
+    @patch('sap.cli.aunit.subprocess.run')
+    @patch('sap.adt.AUnit.execute')
+    @patch('sap.adt.package.walk')
+    def test_aunit_package_changed_since(self, fake_walk, fake_execute, fake_run):
+        fake_walk.return_value = iter(
+            (([],
+              [],
+              [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD'),
+               SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_WORLD'),
+               SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_WORLD_TEST'),
+               SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD'),
+               SimpleNamespace(typ='PROG/P', name='Z_GOODBYE')]),)
+        )
+        fake_execute.return_value = Response(status_code=200, text=AUNIT_NO_TEST_RESULTS_XML, headers={})
+        self.fake_git_diff(fake_run, ['src/zif_hello_world.intf.abap', 'src/z_hello_world.prog.abap'])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dependency_map = os.path.join(tmpdir, 'dependencies.json')
+            with open(dependency_map, 'w', encoding='utf-8') as dest:
+                json.dump({'zif_hello_world': ['zcl_hello_world'], 'ZCL_HELLO_WORLD': ['ZCL_HELLO_WORLD_TEST']}, dest)
+
+            with patch('sys.stdout', new_callable=StringIO), \
+                 patch('sys.stderr', new_callable=StringIO) as mock_stderr:
+                exit_code = sap.cli.aunit.run(Connection(), run_args('package', ['$VICTORY'], changed_since='HEAD~1',
+                                                                     dependency_map=dependency_map))
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual([[obj.name for obj in test_run] for (test_run,), _ in fake_execute.call_args_list],
+                         [['ZCL_HELLO_WORLD', 'ZCL_HELLO_WORLD_TEST', 'Z_HELLO_WORLD']])
+        self.assertEqual(mock_stderr.getvalue(), 'Skipped object: INTF/OI ZIF_HELLO_WORLD\n'
+                                                 'Objects changed since HEAD~1: 3\n')
+
+    @patch('sap.cli.aunit.subprocess.run')
+    @patch('sap.adt.AUnit.execute')
+    def test_aunit_class_nothing_changed(self, fake_execute, fake_run):
+        self.fake_git_diff(fake_run, ['src/zcl_other.clas.abap'])
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
+             patch('sys.stderr', new_callable=StringIO):
+            exit_code = sap.cli.aunit.run(Connection(), run_args('class', ['ZCL_HELLO_WORLD'], changed_since='HEAD'))
+
+        self.assertEqual(exit_code, 0)
+        fake_execute.assert_not_called()
+        self.assertEqual(mock_stdout.getvalue(), 'Successful: 0\nTolerable:  0\nCritical:   0\n')
+
+    def test_aunit_dependency_map_without_changed_since(self):
+        with self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            sap.cli.aunit.run(Connection(), run_args('class', ['yclass'], dependency_map='dependencies.json'))
+
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,9 +2,10 @@
 
 import os
 import sys
+import tempfile
 from argparse import ArgumentParser
 import unittest
-from unittest.mock import Mock, PropertyMock, patch, mock_open, call
+from unittest.mock import Mock, patch, mock_open, call
 from types import SimpleNamespace
 from io import StringIO
 
@@ -12,7 +13,9 @@ import sap.cli.checkout
 import sap.platform.abap
 import sap.platform.abap.abapgit
 
-from mock import Connection
+import sap.adt.errors
+
+from mock import Connection, Response
 
 
 def parse_args(argv):
@@ -21,14 +24,23 @@ def parse_args(argv):
     return parser.parse_args(argv)
 
 
-def assert_wrote_file(unit_test, fake_open, file_name, contents, fileno=1):
+def assert_wrote_file(unit_test, fake_open, file_name, contents, fileno=1, mode='w'):
     start = (fileno - 1) * 4
-    unit_test.assertEqual(fake_open.mock_calls[start + 0], call(file_name, 'w'))
+    unit_test.assertEqual(fake_open.mock_calls[start + 0], call(file_name, mode))
     unit_test.assertEqual(fake_open.mock_calls[start + 1], call().__enter__())
     unit_test.assertEqual(fake_open.mock_calls[start + 2], call().write(contents))
     unit_test.assertEqual(fake_open.mock_calls[start + 3], call().__exit__(None, None, None))
 
 
+def assert_wrote_source(unit_test, fake_open, fake_replace, file_name, contents):
+    assert_wrote_file(unit_test, fake_open, file_name + '.part', contents.encode('utf-8'), mode='wb')
+    fake_replace.assert_called_once_with(file_name + '.part', file_name)
+
+
+def fake_source(source, text):
+    source.download_text.side_effect = lambda dest: dest.write(text.encode('utf-8'))
+
+
 class TestCheckoutCommandGroup(unittest.TestCase):
 
     def test_constructor(self):
@@ -47,7 +59,21 @@ class TestCheckout(unittest.TestCase):
         args = parse_args(['class', 'ZCL_UPPERCASE'])
         args.execute(conn, args)
 
-        self.assertEquals(fake_clas.mock_calls, [call(conn, 'ZCL_LOWERCASE'), call(conn, 'ZCL_UPPERCASE')])
+        self.assertEquals(fake_clas.mock_calls, [call(conn, 'ZCL_LOWERCASE', jobs=1), call(conn, 'ZCL_UPPERCASE', jobs=1)])
+
+    @patch('sap.cli.checkout.checkout_class')
+    def test_checkout_class_command_jobs(self, fake_clas):
+        conn = Connection()
+
+        args = parse_args(['class', 'zcl_hello_world', '--jobs', '5'])
+        args.execute(conn, args)
+
+        fake_clas.assert_called_once_with(conn, 'ZCL_HELLO_WORLD', jobs=5)
+
+    def test_checkout_class_invalid_jobs(self):
+        with patch('sys.stderr', new_callable=StringIO), \
+             self.assertRaises(SystemExit):
+            parse_args(['class', 'zcl_hello_world', '-j', '0'])
 
     @patch('sap.cli.checkout.checkout_interface')
     def test_checkout_uppercase_name_intf(self, fake_intf):
@@ -73,9 +99,7 @@ class TestCheckout(unittest.TestCase):
 
         self.assertEqual(fake_prog.mock_calls, [call(conn, 'ZLOWERCASE'), call(conn, 'ZUPPERCASE')])
 
-    @patch('sap.cli.checkout.XMLWriter')
-    @patch('sap.adt.Class')
-    def test_checkout_class(self, fake_clas, fake_writer):
+    def fake_class(self, fake_clas):
         fake_inst = Mock()
         fake_inst.name = 'ZCL_HELLO_WORLD'
         fake_inst.description = 'Cowabunga'
@@ -83,33 +107,48 @@ class TestCheckout(unittest.TestCase):
         fake_inst.active = 'active'
         fake_inst.modeled = False
         fake_inst.fix_point_arithmetic = True
-        fake_inst.text = 'class zcl_hello_world'
+        fake_source(fake_inst, 'class zcl_hello_world')
 
         fake_inst.definitions = Mock()
-        fake_inst.definitions.text = '* definitions'
+        fake_source(fake_inst.definitions, '* definitions')
 
         fake_inst.implementations = Mock()
-        fake_inst.implementations.text = '* implementations'
+        fake_source(fake_inst.implementations, '* implementations')
 
         fake_inst.test_classes = Mock()
-        fake_inst.test_classes.text = '* tests'
+        fake_source(fake_inst.test_classes, '* tests')
 
         fake_clas.return_value = fake_inst
+        return fake_inst
+
+    def assert_files(self, destdir, files):
+        for filename, contents in files.items():
+            with open(os.path.join(destdir, filename)) as source:
+                self.assertEqual(source.read(), contents, msg=filename)
+
+    @patch('sap.cli.checkout.XMLWriter')
+    @patch('sap.adt.Class')
+    def test_checkout_class(self, fake_clas, fake_writer):
+        clas = self.fake_class(fake_clas)
 
         fake_inst = Mock()
         fake_inst.add = Mock()
         fake_inst.close = Mock()
         fake_writer.return_value = fake_inst
 
-        args = parse_args(['class', 'ZCL_HELLO_WORLD'])
-        with patch('sap.cli.checkout.open', mock_open()) as fake_open:
-            args.execute(Connection(), args)
+        connection = Connection()
 
-        assert_wrote_file(self, fake_open, 'zcl_hello_world.clas.abap', 'class zcl_hello_world', fileno=1)
-        assert_wrote_file(self, fake_open, 'zcl_hello_world.clas.locals_def.abap', '* definitions', fileno=2)
-        assert_wrote_file(self, fake_open, 'zcl_hello_world.clas.locals_imp.abap', '* implementations', fileno=3)
-        assert_wrote_file(self, fake_open, 'zcl_hello_world.clas.testclasses.abap', '* tests', fileno=4)
-        self.assertEqual(fake_open.mock_calls[16], call('zcl_hello_world.clas.xml', 'w'))
+        with tempfile.TemporaryDirectory() as destdir:
+            sap.cli.checkout.checkout_class(connection, 'ZCL_HELLO_WORLD', destdir=destdir)
+
+            self.assert_files(destdir, {'zcl_hello_world.clas.abap': 'class zcl_hello_world',
+                                        'zcl_hello_world.clas.locals_def.abap': '* definitions',
+                                        'zcl_hello_world.clas.locals_imp.abap': '* implementations',
+                                        'zcl_hello_world.clas.testclasses.abap': '* tests'})
+            self.assertTrue(os.path.isfile(os.path.join(destdir, 'zcl_hello_world.clas.xml')))
+
+        fake_clas.assert_called_once_with(connection, 'ZCL_HELLO_WORLD')
+        clas.fetch.assert_called_once_with()
 
         args, kwargs = fake_writer.call_args
         ag_serializer = args[0]
@@ -126,10 +165,69 @@ class TestCheckout(unittest.TestCase):
         self.assertEqual(vseoclass.FIXPT, 'X')
         self.assertEqual(vseoclass.UNICODE, 'X')
 
+    @patch('sap.cli.checkout.XMLWriter')
+    @patch('sap.adt.Class')
+    @patch('sap.cli.checkout.ThreadPoolExecutor', wraps=sap.cli.checkout.ThreadPoolExecutor)
+    def test_checkout_class_jobs(self, fake_executor, fake_clas, fake_writer):
+        clas = self.fake_class(fake_clas)
+
+        with tempfile.TemporaryDirectory() as destdir:
+            sap.cli.checkout.checkout_class(Connection(), 'ZCL_HELLO_WORLD', destdir=destdir, jobs=20)
+
+            self.assert_files(destdir, {'zcl_hello_world.clas.abap': 'class zcl_hello_world',
+                                        'zcl_hello_world.clas.locals_def.abap': '* definitions',
+                                        'zcl_hello_world.clas.locals_imp.abap': '* implementations',
+                                        'zcl_hello_world.clas.testclasses.abap': '* tests'})
+
+        fake_executor.assert_called_once_with(max_workers=5)
+        clas.fetch.assert_called_once_with()
+
+    @patch('sap.cli.checkout.XMLWriter')
+    @patch('sap.adt.Class')
+    @patch('sap.cli.checkout.ThreadPoolExecutor')
+    def test_checkout_class_serial(self, fake_executor, fake_clas, fake_writer):
+        self.fake_class(fake_clas)
+
+        with tempfile.TemporaryDirectory() as destdir:
+            sap.cli.checkout.checkout_class(Connection(), 'ZCL_HELLO_WORLD', destdir=destdir)
+
+        fake_executor.assert_not_called()
+
+    @patch('sap.cli.checkout.XMLWriter')
+    @patch('sap.adt.Class')
+    def test_checkout_class_manifest(self, fake_clas, fake_writer):
+        clas = self.fake_class(fake_clas)
+        clas.changed_at = 'main_v1'
+        clas.include_versions = {'definitions': 'def_v1', 'implementations': 'imp_v2', 'testclasses': None}
+
+        with tempfile.TemporaryDirectory() as destdir:
+            manifest = sap.cli.checkout.CheckoutManifest(os.path.join(destdir, sap.cli.checkout.MANIFEST_FILE))
+
+            for filename, version in (('zcl_hello_world.clas.locals_def.abap', 'def_v1'),
+                                      ('zcl_hello_world.clas.locals_imp.abap', 'imp_v1')):
+                filepath = os.path.join(destdir, filename)
+                with open(filepath, 'w') as source:
+                    source.write('* old')
+
+                manifest.update(filepath, version)
+
+            sap.cli.checkout.checkout_class(Connection(), 'ZCL_HELLO_WORLD', destdir=destdir, manifest=manifest,
+                                            jobs=2)
+
+            self.assert_files(destdir, {'zcl_hello_world.clas.abap': 'class zcl_hello_world',
+                                        'zcl_hello_world.clas.locals_def.abap': '* old',
+                                        'zcl_hello_world.clas.locals_imp.abap': '* implementations',
+                                        'zcl_hello_world.clas.testclasses.abap': '* tests'})
+
+            self.assertTrue(manifest.is_current(os.path.join(destdir, 'zcl_hello_world.clas.abap'), 'main_v1'))
+            self.assertTrue(manifest.is_current(os.path.join(destdir, 'zcl_hello_world.clas.locals_imp.abap'), 'imp_v2'))
+
+        clas.definitions.download_text.assert_not_called()
+
     @patch('sap.cli.checkout.XMLWriter')
     @patch('sap.adt.Interface.fetch')
-    @patch('sap.adt.Interface.text', new_callable=PropertyMock)
-    def test_checkout_interface(self, fake_text, fake_fetch, fake_writer):
+    @patch('sap.adt.Interface.download_text')
+    def test_checkout_interface(self, fake_download, fake_fetch, fake_writer):
         fake_writer.return_value = fake_writer
         fake_writer.add = Mock()
 
@@ -141,15 +239,16 @@ class TestCheckout(unittest.TestCase):
         fake_inst.active = 'active'
         fake_inst.modeled = 'false'
 
-        fake_text.return_value = 'interface zif_hello_world'
+        fake_download.side_effect = lambda dest: dest.write(b'interface zif_hello_world')
 
         args = parse_args(['interface', 'ZIF_HELLO_WORLD'])
         with patch('sap.adt.Interface') as fake_intf, \
-             patch('sap.cli.checkout.open', mock_open()) as fake_open:
+             patch('sap.cli.checkout.open', mock_open()) as fake_open, \
+             patch('sap.cli.checkout.os.replace') as fake_replace:
             fake_intf.return_value = fake_inst
             args.execute(fake_conn, args)
 
-        assert_wrote_file(self, fake_open, 'zif_hello_world.intf.abap', 'interface zif_hello_world')
+        assert_wrote_source(self, fake_open, fake_replace, 'zif_hello_world.intf.abap', 'interface zif_hello_world')
 
         args, kwargs = fake_writer.call_args
         ag_serializer = args[0]
@@ -171,7 +270,7 @@ class TestCheckout(unittest.TestCase):
         fake_inst = Mock()
         fake_inst.name = 'Z_HELLO_WORLD'
         fake_inst.description = 'Cowabunga'
-        fake_inst.text = 'REPORT z_hello_world'
+        fake_source(fake_inst, 'REPORT z_hello_world')
         fake_inst.active = 'active'
         fake_inst.application_database = 'S'
         fake_inst.program_type = '1'
@@ -197,10 +296,11 @@ class TestCheckout(unittest.TestCase):
 
         conn = Connection()
         args = parse_args(['program', 'Z_HELLO_WORLD'])
-        with patch('sap.cli.checkout.open', mock_open()) as fake_open:
+        with patch('sap.cli.checkout.open', mock_open()) as fake_open, \
+             patch('sap.cli.checkout.os.replace') as fake_replace:
             args.execute(conn, args)
 
-        assert_wrote_file(self, fake_open, 'z_hello_world.prog.abap', 'REPORT z_hello_world')
+        assert_wrote_source(self, fake_open, fake_replace, 'z_hello_world.prog.abap', 'REPORT z_hello_world')
 
         fake_program.assert_called_once_with(conn, 'Z_HELLO_WORLD')
         fake_program.return_value.fetch.assert_called_once_with()
@@ -351,10 +451,10 @@ class TestCheckoutPackage(unittest.TestCase):
 
         exp_destdir = os.path.abspath(os.path.join(package_name, 'src'))
         exp_sub_destdir = os.path.abspath(os.path.join(package_name, 'src', sub_package_name.lower()))
-        fake_prog.assert_called_once_with(conn, 'Z_HELLO_WORLD', exp_destdir)
-        fake_intf.assert_called_once_with(conn, 'ZIF_HELLO_WORLD', exp_destdir)
-        self.assertEqual(fake_clas.mock_calls, [call(conn, 'ZCL_HELLO_WORLD', exp_destdir),
-                                                call(conn, 'ZCL_TESTS', exp_sub_destdir)])
+        fake_prog.assert_called_once_with(conn, 'Z_HELLO_WORLD', exp_destdir, manifest=None)
+        fake_intf.assert_called_once_with(conn, 'ZIF_HELLO_WORLD', exp_destdir, manifest=None)
+        self.assertEqual(fake_clas.mock_calls, [call(conn, 'ZCL_HELLO_WORLD', exp_destdir, manifest=None),
+                                                call(conn, 'ZCL_TESTS', exp_sub_destdir, manifest=None)])
 
         self.assertEqual(fake_print.mock_calls, [call('Unsupported object: 7777/3 Magic Unicorn', file=sys.stderr)])
 
@@ -378,6 +478,7 @@ class TestCheckoutPackage(unittest.TestCase):
         conn = Connection([])
 
         exp_objects = [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD')]
+        fake_checkout.return_value = 0
         fake_walk.return_value = iter((([], ['$TESTS'], exp_objects),
                                        (['$TESTS'], [], [])))
 
@@ -392,7 +493,8 @@ class TestCheckoutPackage(unittest.TestCase):
             args.execute(conn, args)
 
         exp_destdir = os.path.abspath(os.path.join(package_name, starting_folder))
-        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_destdir)
+        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_destdir, jobs=1, manifest=None,
+                                              pool=None)
 
     @patch('sap.cli.checkout.checkout_package')
     @patch('sap.cli.checkout.checkout_objects')
@@ -401,6 +503,7 @@ class TestCheckoutPackage(unittest.TestCase):
         conn = Connection([])
 
         exp_objects = [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD')]
+        fake_checkout.return_value = 0
         fake_walk.return_value = iter((([], [], exp_objects), ))
 
         package_name = '$VICTORY'
@@ -417,7 +520,8 @@ class TestCheckoutPackage(unittest.TestCase):
         fake_isdir.assert_called_once_with(exp_repodir)
 
         exp_sourcedir = os.path.abspath(os.path.join(exp_repodir, starting_folder))
-        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_sourcedir)
+        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_sourcedir, jobs=1, manifest=None,
+                                              pool=None)
 
     @patch('sap.platform.abap.to_xml')
     @patch('sap.cli.checkout.checkout_package')
@@ -426,6 +530,7 @@ class TestCheckoutPackage(unittest.TestCase):
     def test_checkout_package_create_repo(self, fake_walk, fake_checkout, fake_package, fake_to_xml):
         conn = Connection([])
         fake_walk.return_value = iter((([], [], []), ))
+        fake_checkout.return_value = 0
 
         package_name = '$VICTORY'
         starting_folder = os.path.join('backend', 'abap', 'src')
@@ -457,6 +562,7 @@ class TestCheckoutPackage(unittest.TestCase):
         conn = Connection([])
 
         exp_objects = [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD')]
+        fake_checkout.return_value = 0
         fake_walk.return_value = iter((([], [], exp_objects), ))
 
         package_name = '$VICTORY'
@@ -474,7 +580,8 @@ class TestCheckoutPackage(unittest.TestCase):
         fake_isdir.assert_called_once_with(exp_repodir)
 
         exp_sourcedir = os.path.join(exp_repodir, starting_folder)
-        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_sourcedir)
+        fake_checkout.assert_called_once_with(conn, exp_objects, destdir=exp_sourcedir, jobs=1, manifest=None,
+                                              pool=None)
 
     def test_checkout_objects_makedirs(self):
         conn = Connection([])
@@ -488,6 +595,136 @@ class TestCheckoutPackage(unittest.TestCase):
         fake_isdir.assert_called_once_with(starting_folder)
         fake_makedirs.assert_called_once_with(starting_folder)
 
+    @patch('sap.cli.checkout.checkout_class')
+    @patch('sap.cli.checkout.checkout_interface')
+    @patch('sap.cli.checkout.checkout_program')
+    def test_checkout_objects_parallel(self, fake_prog, fake_intf, fake_clas):
+        conn = Connection([])
+
+        fake_intf.side_effect = sap.adt.errors.HTTPRequestError(None, Response(text='Not found', status_code=404, headers={}))
+
+        objects = [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD'),
+                   SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_WORLD'),
+                   SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD'),
+                   SimpleNamespace(typ='7777/3', name='Magic Unicorn')]
+
+        with patch('os.path.isdir') as fake_isdir, \
+             patch('sap.cli.checkout.print') as fake_print:
+            fake_isdir.return_value = True
+            failed = sap.cli.checkout.checkout_objects(conn, objects, destdir='src', jobs=3)
+
+        self.assertEqual(failed, 1)
+
+        fake_prog.assert_called_once_with(conn, 'Z_HELLO_WORLD', 'src', manifest=None)
+        fake_intf.assert_called_once_with(conn, 'ZIF_HELLO_WORLD', 'src', manifest=None)
+        fake_clas.assert_called_once_with(conn, 'ZCL_HELLO_WORLD', 'src', manifest=None)
+
+        self.assertEqual(fake_print.mock_calls[0], call('Unsupported object: 7777/3 Magic Unicorn', file=sys.stderr))
+        progress = [c.args[0] for c in fake_print.mock_calls[1:4]]
+        self.assertEqual([line.split(' ', 1)[0] for line in progress], ['[1/3]', '[2/3]', '[3/3]'])
+        self.assertEqual(sorted(line.split(' ', 1)[1] for line in progress),
+                         ['CLAS/OC ZCL_HELLO_WORLD', 'INTF/OI ZIF_HELLO_WORLD', 'PROG/P Z_HELLO_WORLD'])
+        self.assertEqual(fake_print.mock_calls[4], call('Failed to checkout INTF/OI ZIF_HELLO_WORLD: 404\nNot found',
+                                                        file=sys.stderr))
+
+    @patch('sap.cli.checkout.checkout_package')
+    @patch('sap.cli.checkout.checkout_objects')
+    @patch('sap.adt.package.walk')
+    def test_checkout_package_jobs(self, fake_walk, fake_checkout, fake_package):
+        conn = Connection([])
+
+        exp_objects = [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD')]
+        fake_walk.return_value = iter((([], [], exp_objects), ))
+        fake_checkout.return_value = 1
+
+        args = parse_args(['package', '$VICTORY', '--jobs', '4'])
+        with patch('sap.cli.checkout.open', mock_open()) as fake_open, \
+             patch('sap.cli.checkout.print') as fake_print, \
+             patch('os.path.isdir') as fake_isdir:
+            fake_isdir.return_value = True
+            exit_code = args.execute(conn, args)
+
+        self.assertEqual(exit_code, 1)
+        fake_print.assert_called_once_with('Failed objects: 1', file=sys.stderr)
+
+        exp_destdir = os.path.abspath(os.path.join('$VICTORY', 'src'))
+        fake_checkout.assert_called_once()
+        self.assertEqual(fake_checkout.call_args[0], (conn, exp_objects))
+        self.assertEqual(fake_checkout.call_args[1]['destdir'], exp_destdir)
+        self.assertIsInstance(fake_checkout.call_args[1]['pool'], sap.cli.checkout.CheckoutPool)
+
+    @patch('sap.cli.checkout.checkout_package')
+    @patch('sap.cli.checkout.checkout_class')
+    @patch('sap.cli.checkout.checkout_program')
+    @patch('sap.adt.package.walk')
+    @patch('sap.cli.checkout.ThreadPoolExecutor', wraps=sap.cli.checkout.ThreadPoolExecutor)
+    def test_checkout_package_recursive_jobs(self, fake_executor, fake_walk, fake_prog, fake_clas, fake_package):
+        conn = Connection([])
+
+        fake_walk.return_value = iter(
+            (([],
+              ['$VICTORY_TESTS'],
+              [SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_WORLD'),
+               SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD')]),
+             (['$VICTORY_TESTS'],
+              [],
+              [SimpleNamespace(typ='CLAS/OC', name='ZCL_TESTS')]))
+        )
+
+        fake_prog.side_effect = sap.errors.SAPCliError('Locked')
+
+        args = parse_args(['package', '$VICTORY', '--recursive', '--jobs', '2'])
+        with patch('sap.cli.checkout.open', mock_open()), \
+             patch('sap.cli.checkout.print') as fake_print, \
+             patch('os.path.isdir') as fake_isdir:
+            fake_isdir.return_value = True
+            exit_code = args.execute(conn, args)
+
+        self.assertEqual(exit_code, 1)
+        fake_executor.assert_called_once_with(max_workers=2)
+
+        exp_destdir = os.path.abspath(os.path.join('$VICTORY', 'src'))
+        exp_sub_destdir = os.path.join(exp_destdir, '$victory_tests')
+        fake_prog.assert_called_once_with(conn, 'Z_HELLO_WORLD', exp_destdir, manifest=None)
+        self.assertEqual(sorted(fake_clas.call_args_list),
+                         [call(conn, 'ZCL_HELLO_WORLD', exp_destdir, manifest=None),
+                          call(conn, 'ZCL_TESTS', exp_sub_destdir, manifest=None)])
+
+        # progress and errors are reported per package
+        printed = [c[1][0] for c in fake_print.mock_calls]
+        progress = [line for line in printed if line.endswith('_WORLD') and line.startswith('[')]
+        self.assertEqual([line.split(' ', 1)[0] for line in progress], ['[1/2]', '[2/2]'])
+        self.assertEqual(sorted(line.split(' ', 1)[1] for line in progress),
+                         ['CLAS/OC ZCL_HELLO_WORLD', 'PROG/P Z_HELLO_WORLD'])
+        self.assertIn('[1/1] CLAS/OC ZCL_TESTS', printed)
+        self.assertGreater(printed.index('Failed to checkout PROG/P Z_HELLO_WORLD: Locked'),
+                           printed.index(progress[-1]))
+        self.assertEqual(printed[-1], 'Failed objects: 1')
+
+    @patch('sap.cli.checkout.checkout_package')
+    @patch('sap.cli.checkout.checkout_objects')
+    @patch('sap.adt.package.walk')
+    def test_checkout_package_incremental(self, fake_walk, fake_checkout, fake_package):
+        conn = Connection([])
+
+        exp_objects = [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD')]
+        fake_checkout.return_value = 0
+        fake_walk.return_value = iter((([], [], exp_objects),))
+
+        with tempfile.TemporaryDirectory() as repo_dir:
+            args = parse_args(['package', '$ROOT', repo_dir, '--incremental'])
+            args.execute(conn, args)
+
+            manifest = fake_checkout.call_args[1]['manifest']
+            self.assertIsInstance(manifest, sap.cli.checkout.CheckoutManifest)
+            self.assertEqual(manifest.path, os.path.join(os.path.abspath(repo_dir), '.sapcli-manifest.json'))
+            self.assertTrue(os.path.isfile(manifest.path))
+
+    def test_checkout_package_invalid_jobs(self):
+        with patch('sys.stderr', new_callable=StringIO), \
+             self.assertRaises(SystemExit):
+            parse_args(['package', '$VICTORY', '--jobs', '0'])
+
 
 class TestDOT_ABAP_GIT(unittest.TestCase):
 
@@ -516,5 +753,89 @@ class TestDOT_ABAP_GIT(unittest.TestCase):
 ''')
 
 
+class TestCheckoutManifest(unittest.TestCase):
+
+    def test_download_abap_source_incremental(self):
+        source = Mock()
+        fake_source(source, 'REPORT z_hello_world.')
+
+        with tempfile.TemporaryDirectory() as repo_dir:
+            manifest_path = os.path.join(repo_dir, sap.cli.checkout.MANIFEST_FILE)
+            manifest = sap.cli.checkout.CheckoutManifest(manifest_path)
+
+            sap.cli.checkout.download_abap_source('Z_HELLO_WORLD', source, '.prog', destdir=repo_dir,
+                                                  version='2019-03-07T20:22:01Z', manifest=manifest)
+            manifest.save()
+
+            fake_source(source, 'REPORT z_hello_world_changed.')
+            manifest = sap.cli.checkout.CheckoutManifest(manifest_path)
+
+            sap.cli.checkout.download_abap_source('Z_HELLO_WORLD', source, '.prog', destdir=repo_dir,
+                                                  version='2019-03-07T20:22:01Z', manifest=manifest)
+
+            filename = os.path.join(repo_dir, 'z_hello_world.prog.abap')
+            with open(filename) as abap_file:
+                self.assertEqual(abap_file.read(), 'REPORT z_hello_world.')
+
+            sap.cli.checkout.download_abap_source('Z_HELLO_WORLD', source, '.prog', destdir=repo_dir,
+                                                  version='2019-04-24T18:19:16Z', manifest=manifest)
+
+            with open(filename) as abap_file:
+                self.assertEqual(abap_file.read(), 'REPORT z_hello_world_changed.')
+
+            self.assertEqual(sorted(os.listdir(repo_dir)), [sap.cli.checkout.MANIFEST_FILE, 'z_hello_world.prog.abap'])
+
+    def test_download_abap_source_failed(self):
+        def broken_download(dest):
+            dest.write(b'REPORT')
+            raise ConnectionResetError('Boom')
+
+        source = Mock()
+        source.download_text.side_effect = broken_download
+
+        with tempfile.TemporaryDirectory() as repo_dir:
+            filename = os.path.join(repo_dir, 'z_hello_world.prog.abap')
+            with open(filename, 'w') as abap_file:
+                abap_file.write('REPORT z_hello_world_old.')
+
+            with self.assertRaises(ConnectionResetError):
+                sap.cli.checkout.download_abap_source('Z_HELLO_WORLD', source, '.prog', destdir=repo_dir)
+
+            self.assertEqual(os.listdir(repo_dir), ['z_hello_world.prog.abap'])
+
+            with open(filename) as abap_file:
+                self.assertEqual(abap_file.read(), 'REPORT z_hello_world_old.')
+
+    def test_manifest_missing_file(self):
+        with tempfile.TemporaryDirectory() as repo_dir:
+            manifest = sap.cli.checkout.CheckoutManifest(os.path.join(repo_dir, 'manifest.json'))
+            manifest.update(os.path.join(repo_dir, 'zdeleted.prog.abap'), '1')
+
+            self.assertFalse(manifest.is_current(os.path.join(repo_dir, 'zdeleted.prog.abap'), '1'))
+            self.assertFalse(manifest.is_current(os.path.join(repo_dir, 'zdeleted.prog.abap'), None))
+
+    def test_manifest_corrupt_file(self):
+        with tempfile.TemporaryDirectory() as repo_dir:
+            path = os.path.join(repo_dir, 'manifest.json')
+            source = os.path.join(repo_dir, 'zhello.prog.abap')
+
+            with open(source, 'w') as dest:
+                dest.write('report zhello.')
+
+            with open(path, 'w') as dest:
+                dest.write('{"zhello.prog.abap": "1"')
+
+            with patch('sys.stderr', new_callable=StringIO) as fake_stderr:
+                manifest = sap.cli.checkout.CheckoutManifest(path)
+
+            self.assertTrue(fake_stderr.getvalue().startswith(f'Ignoring broken manifest {path}: '))
+            self.assertFalse(manifest.is_current(source, '1'))
+
+            manifest.update(source, '2')
+            manifest.save()
+
+            self.assertTrue(sap.cli.checkout.CheckoutManifest(path).is_current(source, '2'))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 
 import unittest
-from unittest.mock import call, MagicMock
+from unittest.mock import call, MagicMock, patch
+from io import StringIO
 
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 
 import sap.errors
 import sap.cli.core
@@ -57,6 +58,16 @@ class TestCommandDeclaration(unittest.TestCase):
         self.assertEqual(cmd_decl.arguments, [(('--corrnr',), {'nargs':'?', 'default':None}),
                                               (('first',), {'arg1':'1'})])
 
+    def test_declare_jobs(self):
+        cmd_decl = sap.cli.core.CommandDeclaration(print, 'printer')
+
+        cmd_decl.append_argument('first', arg1='1')
+        cmd_decl.declare_jobs('Number of workers')
+
+        self.assertEqual(cmd_decl.arguments, [(('first',), {'arg1':'1'}),
+                                              (('-j', '--jobs'), {'type': sap.cli.core.positive_int, 'default': 1,
+                                                                  'help': 'Number of workers; default=1'})])
+
     def test_install_arguments(self):
         parser = MagicMock()
 
@@ -142,6 +153,13 @@ def dummy_corrnr(connection, args):
     return (args.corrnr, args.name)
 
 
+@DummyCommandGroup.argument_jobs('Number of workers')
+@DummyCommandGroup.command()
+def dummy_jobs(connection, args):
+
+    return args.jobs
+
+
 def parse_args(argv):
     parser = ArgumentParser()
     DummyCommandGroup().install_parser(parser)
@@ -156,7 +174,7 @@ class TestCommandGroup(unittest.TestCase):
 
     def test_get_commands(self):
         commands = DummyCommandGroup.get_commands()
-        self.assertEqual(len(commands.values()), 1)
+        self.assertEqual(len(commands.values()), 2)
 
     def test_argument_corrnr_default(self):
         args = parse_args(['dummy_corrnr', 'success'])
@@ -168,6 +186,40 @@ class TestCommandGroup(unittest.TestCase):
         self.assertEqual(args.name, 'fabulous')
         self.assertEqual(args.corrnr, '420')
 
+    def test_argument_jobs_default(self):
+        args = parse_args(['dummy_jobs'])
+        self.assertEqual(args.jobs, 1)
+
+    def test_argument_jobs_value(self):
+        args = parse_args(['dummy_jobs', '-j', '4'])
+        self.assertEqual(args.jobs, 4)
+
+    def test_argument_jobs_not_positive(self):
+        with patch('sys.stderr', new_callable=StringIO) as fake_stderr, \
+             self.assertRaises(SystemExit):
+            parse_args(['dummy_jobs', '--jobs', '0'])
+
+        self.assertIn('argument -j/--jobs: must be positive: 0', fake_stderr.getvalue())
+
+
+class TestPositiveInt(unittest.TestCase):
+
+    def test_positive(self):
+        self.assertEqual(sap.cli.core.positive_int('3'), 3)
+
+    def test_not_positive(self):
+        for value in ('0', '-1'):
+            with self.assertRaises(ArgumentTypeError) as caught:
+                sap.cli.core.positive_int(value)
+
+            self.assertEqual(str(caught.exception), f'must be positive: {value}')
+
+    def test_not_int(self):
+        with self.assertRaises(ArgumentTypeError) as caught:
+            sap.cli.core.positive_int('many')
+
+        self.assertEqual(str(caught.exception), "invalid int value: 'many'")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -102,10 +102,10 @@ class TestFunctionModuleWrite(unittest.TestCase):
         connection = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
 
         args = fm_parse_args('write', '-', '-', './src/zfg_hello_world.fugr.z_fn_hello_world.abap')
-        with patch('sap.cli.object.open', mock_open(read_data='source code')) as fake_open:
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')) as fake_open:
             args.execute(connection, args)
 
-        fake_open.assert_called_once_with('./src/zfg_hello_world.fugr.z_fn_hello_world.abap', 'r')
+        fake_open.assert_called_once_with('./src/zfg_hello_world.fugr.z_fn_hello_world.abap', 'rb')
 
         self.assertEqual([(e.method, e.adt_uri) for e in connection.execs],
                           [('POST', '/sap/bc/adt/functions/groups/zfg_hello_world/fmodules/z_fn_hello_world'),
@@ -3,7 +3,7 @@
 from argparse import ArgumentParser
 import unittest
 from unittest.mock import patch, mock_open
-from io import StringIO
+from io import StringIO, BytesIO, TextIOWrapper
 
 import sap.cli.interface
 
@@ -64,27 +64,27 @@ class TestInterfaceWrite(unittest.TestCase):
 
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
 
-        with patch('sys.stdin', StringIO('iface stdin definition')):
+        with patch('sys.stdin', TextIOWrapper(BytesIO('iface stdin definition'.encode('utf-8')))):
             args.execute(conn, args)
 
         self.assertEqual(len(conn.execs), 3)
 
         self.maxDiff = None
-        self.assertEqual(conn.execs[1][3], 'iface stdin definition')
+        self.assertEqual(conn.execs[1][3], b'iface stdin definition')
 
     def test_interface_read_from_file(self):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
         args = parse_args('write', 'ZIF_WRITER', 'zif_iface.abap')
 
-        with patch('sap.cli.object.open', mock_open(read_data='iface file definition')) as m:
+        with patch('sap.cli.object.open', mock_open(read_data=b'iface file definition')) as m:
             args.execute(conn, args)
 
-        m.assert_called_once_with('zif_iface.abap', 'r')
+        m.assert_called_once_with('zif_iface.abap', 'rb')
 
         self.assertEqual(len(conn.execs), 3)
 
         self.maxDiff = None
-        self.assertEqual(conn.execs[1][3], 'iface file definition')
+        self.assertEqual(conn.execs[1][3], b'iface file definition')
 
 
 if __name__ == '__main__':
@@ -5,6 +5,9 @@ from argparse import ArgumentParser
 import unittest
 from unittest.mock import patch, MagicMock, Mock, call, mock_open
 from types import SimpleNamespace
+from io import BytesIO, StringIO, TextIOWrapper, UnsupportedOperation
+import os
+import tempfile
 
 import sap.cli.object
 
@@ -76,7 +79,7 @@ class TestCommandGroupObjectTemplateDefine(unittest.TestCase):
         act_write_cmd = self.commands.get_declaration(self.group.write_object_text)
 
         self.assertEqual(act_write_cmd, exp_write_cmd)
-        self.assertEqual(len(exp_write_cmd.arguments), 4)
+        self.assertEqual(len(exp_write_cmd.arguments), 6)
 
     def test_define_activate(self):
         exp_activate_cmd = self.group.define_activate(self.commands)
@@ -123,6 +126,10 @@ class TestCommandGroupObjectTemplate(unittest.TestCase):
     def setUp(self):
         self.group._init_mocks()
 
+    def assert_wrote_source(self, fake_write, contents):
+        fake_write.assert_called_once()
+        self.assertEqual(fake_write.call_args[0][0].read(), contents)
+
     def parse_args(self, *argv):
         return self.__class__.parser.parse_args(argv)
 
@@ -193,13 +200,13 @@ class TestCommandGroupObjectTemplate(unittest.TestCase):
         self.assertEqual(args.corrnr, None)
         self.assertEqual(args.execute, self.group.write_object_text)
 
-        with patch('sys.stdin.readlines') as fake_readlines:
-            fake_readlines.return_value = 'source code'
+        with patch('sys.stdin', TextIOWrapper(BytesIO(b'source code'))) as fake_stdin:
             args.execute(connection, args)
 
         self.group.instace_mock.assert_called_once_with(connection, 'myname', args, metadata=None)
-        self.group.new_object_mock.open_editor.assert_called_once_with(corrnr=None)
-        self.group.open_editor_mock.write.assert_called_once_with('source code')
+        self.group.new_object_mock.open_editor.assert_called_once_with(
+            lock_handle=self.group.new_object_mock.lock.return_value, corrnr=None, unlock=False)
+        self.assert_wrote_source(self.group.open_editor_mock.write, b'source code')
 
     def test_write_object_text_file(self):
         connection = MagicMock()
@@ -208,11 +215,11 @@ class TestCommandGroupObjectTemplate(unittest.TestCase):
 
         self.assertEqual(args.source, ['source.abap'])
 
-        with patch('sap.cli.object.open', mock_open(read_data='source code')) as fake_open:
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')) as fake_open:
             args.execute(connection, args)
 
-        self.assertEqual(fake_open.call_args_list, [call('source.abap', 'r')])
-        self.group.open_editor_mock.write.assert_called_once_with('source code')
+        self.assertEqual(fake_open.call_args_list, [call('source.abap', 'rb')])
+        self.assert_wrote_source(self.group.open_editor_mock.write, b'source code')
 
     def test_write_object_name_from_file(self):
         connection = MagicMock()
@@ -221,11 +228,11 @@ class TestCommandGroupObjectTemplate(unittest.TestCase):
 
         self.assertEqual(args.source, ['objname.abap'])
 
-        with patch('sap.cli.object.open', mock_open(read_data='source code')) as fake_open:
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')) as fake_open:
             args.execute(connection, args)
 
         self.group.instace_mock.assert_called_once_with(connection, 'objname', args, metadata=None)
-        self.assertEqual(fake_open.call_args_list, [call('objname.abap', 'r')])
+        self.assertEqual(fake_open.call_args_list, [call('objname.abap', 'rb')])
 
     def test_write_object_text_stdin_corrnr(self):
         connection = MagicMock()
@@ -234,37 +241,38 @@ class TestCommandGroupObjectTemplate(unittest.TestCase):
 
         self.assertEqual(args.corrnr, '123456')
 
-        with patch('sys.stdin.readlines') as fake_readlines:
-            fake_readlines.return_value = 'source code'
+        with patch('sys.stdin', TextIOWrapper(BytesIO(b'source code'))) as fake_stdin:
             args.execute(connection, args)
 
         self.group.instace_mock.assert_called_once_with(connection, 'myname', args, metadata=None)
-        self.group.new_object_mock.open_editor.assert_called_once_with(corrnr='123456')
-        self.group.open_editor_mock.write.assert_called_once_with('source code')
+        self.group.new_object_mock.open_editor.assert_called_once_with(
+            lock_handle=self.group.new_object_mock.lock.return_value, corrnr='123456', unlock=False)
+        self.assert_wrote_source(self.group.open_editor_mock.write, b'source code')
 
-    @patch('sap.adt.wb.activate')
+    @patch('sap.adt.wb.activate_many')
     def test_write_object_text_stdin_corrnr_activate(self, fake_activate):
         connection = MagicMock()
 
         args = self.parse_args('write', 'myname', '-', '--corrnr', '123456', '--activate')
 
-        with patch('sys.stdin.readlines') as fake_readlines:
-            fake_readlines.return_value = 'source code'
+        with patch('sys.stdin', TextIOWrapper(BytesIO(b'source code'))) as fake_stdin:
             args.execute(connection, args)
 
-        fake_activate.assert_called_once_with(self.group.new_object_mock)
+        self.assertEqual(fake_activate.call_count, 1)
+        self.assertEqual(list(fake_activate.call_args[0][0]), [self.group.new_object_mock])
 
-    @patch('sap.adt.wb.activate')
+    @patch('sap.adt.wb.activate_many')
     def test_write_object_text_name_from_files_activate(self, fake_activate):
         connection = MagicMock()
 
         args = self.parse_args('write', '-', 'z_one.abap', 'z_one.incl.abap', 'z_two.abap', '--corrnr', '123456', '--activate')
 
-        with patch('sap.cli.object.open', mock_open(read_data='source code')) as fake_open, \
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')) as fake_open, \
              patch('sap.cli.printout') as fake_printout:
             args.execute(connection, args)
 
-        self.assertEqual(fake_activate.call_args_list, [call(self.group.new_object_mock), call(self.group.new_object_mock)])
+        self.assertEqual(fake_activate.call_count, 1)
+        self.assertEqual(list(fake_activate.call_args[0][0]), [self.group.new_object_mock, self.group.new_object_mock])
 
         exp = [call('Writing:'),
                call('*', 'str(z_one)'),
@@ -285,18 +293,180 @@ class TestCommandGroupObjectTemplate(unittest.TestCase):
         if not i + 1 == len(exp):
             self.fail(f'Missing: \n' + str(exp[i:]))
 
+    def test_write_object_text_unlock_one_by_one(self):
+        locks = []
+        self.configure_objects_by_name(locks=locks)
+
+        args = self.parse_args('write', '-', 'z_one.abap', 'z_two.abap')
+
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')), \
+             patch('sap.cli.printout'):
+            args.execute(MagicMock(), args)
+
+        self.assertEqual(locks, [('lock', 'z_one'), ('unlock', 'z_one'), ('lock', 'z_two'), ('unlock', 'z_two')])
+
+    def test_write_object_text_command_line_order(self):
+        locks = []
+        objects = self.configure_objects_by_name(locks=locks)
+
+        args = self.parse_args('write', '-', 'z_one.abap', 'z_two.abap', 'z_one.incl.abap')
+
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')) as fake_open, \
+             patch('sap.cli.printout') as fake_printout:
+            args.execute(MagicMock(), args)
+
+        self.assertEqual(fake_open.call_args_list, [call('z_one.abap', 'rb'), call('z_two.abap', 'rb'),
+                                                    call('z_one.incl.abap', 'rb')])
+        self.assertEqual(fake_printout.call_args_list[:4], [call('Writing:'),
+                                                            call('*', 'str(z_one)'),
+                                                            call('*', 'str(z_two)'),
+                                                            call('*', 'str(z_one)')])
+
+        # consecutive sources of one object share its lock
+        self.assertEqual(locks, [('lock', 'z_one'), ('unlock', 'z_one'), ('lock', 'z_two'), ('unlock', 'z_two'),
+                                 ('lock', 'z_one'), ('unlock', 'z_one')])
+        self.assertEqual(len(objects['z_one']), 2)
+
+    def configure_objects_by_name(self, failing=None, texts=None, locks=None):
+        objects = {}
+
+        def new_object(connection, name, args, metadata=None):
+            obj = MagicMock()
+            obj.name = name
+            obj.uri = f'/{name}'
+            obj.__str__ = lambda obj: f'str({obj.name})'
+            obj.text = (texts or {}).get(name)
+
+            if name == failing:
+                obj.open_editor.side_effect = sap.errors.SAPCliError(f'{name} is locked')
+
+            if locks is not None:
+                obj.lock.side_effect = lambda: locks.append(('lock', name))
+                obj.unlock.side_effect = lambda lock_handle: locks.append(('unlock', name))
+
+            objects.setdefault(name, []).append(obj)
+            return obj
+
+        self.group.instace_mock.side_effect = new_object
+        return objects
+
+    @patch('sap.adt.wb.activate_many')
+    def test_write_object_text_jobs(self, fake_activate):
+        connection = MagicMock()
+        objects = self.configure_objects_by_name()
+
+        args = self.parse_args('write', '-', 'z_one.abap', 'z_one.incl.abap', 'z_two.abap', '--jobs', '2', '--activate')
+
+        self.assertEqual(args.jobs, 2)
+
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')) as fake_open, \
+             patch('sap.cli.printout') as fake_printout:
+            retval = args.execute(connection, args)
+
+        self.assertEqual(retval, 0)
+        self.assertEqual(sorted(fake_open.call_args_list),
+                         [call('z_one.abap', 'rb'), call('z_one.incl.abap', 'rb'), call('z_two.abap', 'rb')])
+
+        for obj in objects['z_one'] + objects['z_two']:
+            lock_handle = objects[obj.name][0].lock.return_value
+            obj.open_editor.assert_called_once_with(lock_handle=lock_handle, corrnr=None, unlock=False)
+            obj.open_editor.return_value.__enter__.return_value.write.assert_called_once()
+            stream = obj.open_editor.return_value.__enter__.return_value.write.call_args[0][0]
+            self.assertIsInstance(stream, sap.cli.object.UnixLineEndings)
+
+        fake_activate.assert_called_once()
+        self.assertEqual(list(fake_activate.call_args[0][0]), [objects['z_one'][1], objects['z_two'][0]])
+
+        self.assertEqual(fake_printout.call_args_list, [call('Writing:'),
+                                                        call('*', 'str(z_one)'),
+                                                        call('*', 'str(z_one)'),
+                                                        call('*', 'str(z_two)'),
+                                                        call('Activating:'),
+                                                        call('*', 'z_one'),
+                                                        call('*', 'z_two')])
+
+    @patch('sap.adt.wb.activate_many')
+    def test_write_object_text_jobs_errors(self, fake_activate):
+        connection = MagicMock()
+        objects = self.configure_objects_by_name(failing='z_one')
+
+        args = self.parse_args('write', '-', 'z_one.abap', 'z_two.abap', 'z_one.incl.abap', '-j', '3', '--activate')
+
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')), \
+             patch('sap.cli.printout'), \
+             patch('sys.stderr', new_callable=StringIO) as fake_stderr:
+            retval = args.execute(connection, args)
+
+        self.assertEqual(retval, 1)
+        self.assertEqual(len(objects['z_one']), 2)
+        objects['z_two'][0].open_editor.assert_called_once_with(
+            lock_handle=objects['z_two'][0].lock.return_value, corrnr=None, unlock=False)
+
+        self.assertEqual(list(fake_activate.call_args[0][0]), [objects['z_two'][0]])
+        self.assertEqual(fake_stderr.getvalue(), 'Failed to write z_one.abap: z_one is locked\n'
+                                                 'Failed to write z_one.incl.abap: z_one is locked\n')
+
+    @patch('sap.adt.wb.activate_many')
+    def test_write_object_text_skip_unchanged(self, fake_activate):
+        connection = MagicMock()
+        objects = self.configure_objects_by_name(texts={'z_one': 'report z_one.\n\n', 'z_two': 'report z_two.'})
+
+        args = self.parse_args('write', '-', 'z_one.abap', 'z_two.abap', '--skip-unchanged', '--activate')
+
+        with patch('sap.cli.object.open', mock_open(read_data=b'report z_one.\r\n')), \
+             patch('sap.cli.printout') as fake_printout:
+            args.execute(connection, args)
+
+        objects['z_one'][0].open_editor.assert_not_called()
+        objects['z_two'][0].open_editor.return_value.__enter__.return_value.write.assert_called_once_with(
+            b'report z_one.\n')
+
+        self.assertEqual(list(fake_activate.call_args[0][0]), [objects['z_two'][0]])
+        self.assertEqual(fake_printout.call_args_list, [call('Writing:'),
+                                                        call('*', 'str(z_one)'),
+                                                        call('*', 'str(z_two)'),
+                                                        call('Unchanged:'),
+                                                        call('*', 'str(z_one)'),
+                                                        call('Activating:'),
+                                                        call('*', 'z_two')])
+
+    @patch('sap.adt.wb.activate_many')
+    def test_write_object_text_skip_unchanged_jobs(self, fake_activate):
+        connection = MagicMock()
+        objects = self.configure_objects_by_name(texts={'z_one': 'report z_one.', 'z_two': 'report z_one.'})
+
+        args = self.parse_args('write', '-', 'z_one.abap', 'z_two.abap', '--skip-unchanged', '--activate', '--jobs', '2')
+
+        with patch('sap.cli.object.open', mock_open(read_data=b'report z_one.\n')), \
+             patch('sap.cli.printout') as fake_printout:
+            args.execute(connection, args)
+
+        objects['z_one'][0].open_editor.assert_not_called()
+        objects['z_two'][0].open_editor.assert_not_called()
+
+        fake_activate.assert_not_called()
+        self.assertEqual(fake_printout.call_args_list, [call('Writing:'),
+                                                        call('*', 'str(z_one)'),
+                                                        call('*', 'str(z_two)'),
+                                                        call('Unchanged:'),
+                                                        call('*', 'str(z_one)'),
+                                                        call('*', 'str(z_two)')])
+
+    def test_write_object_text_jobs_not_positive(self):
+        with patch('sys.stderr', new_callable=StringIO), \
+             self.assertRaises(SystemExit):
+            self.parse_args('write', '-', 'z_one.abap', '--jobs', '0')
 
     def test_activate_objects(self):
         connection = MagicMock()
 
         args = self.parse_args('activate', 'myname', 'anothername')
 
-        with patch('sap.adt.wb.activate') as fake_activate, \
+        with patch('sap.adt.wb.activate_many') as fake_activate, \
              patch('sap.cli.printout') as fake_printout:
             args.execute(connection, args)
 
-        self.assertEqual(fake_activate.call_args_list, [call(self.group.new_object_mock),
-                                                        call(self.group.new_object_mock)])
+        fake_activate.assert_called_once_with([self.group.new_object_mock, self.group.new_object_mock])
 
         self.assertEqual(self.group.instace_mock.call_args_list, [call(connection, 'myname', args, metadata=None),
                                                                   call(connection, 'anothername', args, metadata=None)])
@@ -455,13 +625,11 @@ class TestWriteArgsToObjects(unittest.TestCase):
         args.name = 'zabap_object'
         args.source = ['-']
 
-        with patch('sys.stdin.readlines') as fake_readlines:
-            fake_readlines.return_value = ['source code']
-            objects = [obj_text for obj_text in sap.cli.object.write_args_to_objects(command, connection, args, metadata='metadata')]
+        with patch('sys.stdin', TextIOWrapper(BytesIO(b'source code'))):
+            objects = [(obj, stream.read()) for obj, stream in sap.cli.object.write_args_to_objects(command, connection, args, metadata='metadata')]
 
-        fake_readlines.assert_called_once()
         command.instance.assert_called_once_with(connection, 'zabap_object', args, metadata='metadata')
-        self.assertEqual([('instance', ['source code'])], objects)
+        self.assertEqual([('instance', b'source code')], objects)
 
     def test_name_with_file(self):
         command = MagicMock()
@@ -473,12 +641,12 @@ class TestWriteArgsToObjects(unittest.TestCase):
         args.name = 'zabap_object'
         args.source = ['zabap_object.abap']
 
-        with patch('sap.cli.object.open', mock_open(read_data='source code')) as fake_open:
-            objects = [obj_text for obj_text in sap.cli.object.write_args_to_objects(command, connection, args, metadata='metadata')]
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')) as fake_open:
+            objects = [(obj, stream.read()) for obj, stream in sap.cli.object.write_args_to_objects(command, connection, args, metadata='metadata')]
 
-        fake_open.assert_called_once_with('zabap_object.abap', 'r')
+        fake_open.assert_called_once_with('zabap_object.abap', 'rb')
         command.instance.assert_called_once_with(connection, 'zabap_object', args, metadata='metadata')
-        self.assertEqual([('instance', ['source code'])], objects)
+        self.assertEqual([('instance', b'source code')], objects)
 
     def test_name_dash_file_dash(self):
         command = MagicMock()
@@ -502,14 +670,81 @@ class TestWriteArgsToObjects(unittest.TestCase):
         args.name = '-'
         args.source = ['zabap_object.abap', 'zanother_object.abap']
 
-        with patch('sap.cli.object.open', mock_open(read_data='source code')) as fake_open:
-            objects = [obj_text for obj_text in sap.cli.object.write_args_to_objects(command, connection, args, metadata='metadata')]
+        with patch('sap.cli.object.open', mock_open(read_data=b'source code')) as fake_open:
+            objects = [(obj, stream.read()) for obj, stream in sap.cli.object.write_args_to_objects(command, connection, args, metadata='metadata')]
 
-        self.assertEqual(fake_open.call_args_list, [call('zabap_object.abap', 'r'), call('zanother_object.abap', 'r')])
+        self.assertEqual(fake_open.call_args_list, [call('zabap_object.abap', 'rb'), call('zanother_object.abap', 'rb')])
         self.assertEqual(command.instance_from_file_path.call_args_list, [call(connection, 'zabap_object.abap', args, metadata='metadata'),
                                                                           call(connection, 'zanother_object.abap', args, metadata='metadata')])
-        self.assertEqual(objects, [('instance', ['source code']),
-                                   ('instance', ['source code'])])
+        self.assertEqual(objects, [('instance', b'source code'),
+                                   ('instance', b'source code')])
+
+    def test_name_with_crlf_file(self):
+        command = MagicMock()
+        command.instance = Mock()
+        command.instance.return_value = 'instance'
+
+        args = MagicMock()
+        args.name = 'zabap_object'
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            args.source = [os.path.join(tmpdir, 'zabap_object.abap')]
+
+            with open(args.source[0], 'wb') as dest:
+                dest.write(b'REPORT zabap_object.\r\n\r\nWRITE 1.\r\n')
+
+            objects = [(obj, stream.read()) for obj, stream in sap.cli.object.write_args_to_objects(command, MagicMock(), args)]
+
+        self.assertEqual([('instance', b'REPORT zabap_object.\n\nWRITE 1.\n')], objects)
+
+
+class TestUnixLineEndings(unittest.TestCase):
+
+    def test_read_all(self):
+        stream = sap.cli.object.UnixLineEndings(BytesIO(b'one\r\ntwo\rthree\nfour\r\n'))
+
+        self.assertEqual(stream.read(), b'one\ntwo\nthree\nfour\n')
+        self.assertEqual(stream.read(), b'')
+
+    def test_read_crlf_on_chunk_boundary(self):
+        stream = sap.cli.object.UnixLineEndings(BytesIO(b'one\r\r\ntwo\r\n'))
+
+        self.assertEqual(stream.read(4), b'one\n\n')
+        self.assertEqual(stream.read(4), b'two\n')
+        self.assertEqual(stream.read(4), b'')
+
+    def test_iter_chunks(self):
+        with patch('sap.cli.object.UnixLineEndings.BLOCK_SIZE', 4):
+            stream = sap.cli.object.UnixLineEndings(BytesIO(b'one\r\ntwo\r\n'))
+
+            self.assertEqual(list(stream), [b'one\n', b'two\n'])
+
+    def test_seek_back(self):
+        stream = sap.cli.object.UnixLineEndings(BytesIO(b'one\r\n'))
+
+        self.assertTrue(stream.seekable())
+        self.assertEqual(stream.tell(), 0)
+        self.assertEqual(stream.read(), b'one\n')
+
+        stream.seek(0)
+        self.assertEqual(stream.read(), b'one\n')
+
+        # the converted length is unknown and HTTP clients must not guess it
+        with self.assertRaises(UnsupportedOperation):
+            stream.seek(0, os.SEEK_END)
+
+    def test_close(self):
+        source = BytesIO(b'one\r\n')
+        with sap.cli.object.UnixLineEndings(source):
+            pass
+
+        self.assertTrue(source.closed)
+
+        source = BytesIO(b'one\r\n')
+        with sap.cli.object.UnixLineEndings(source, close=False):
+            pass
+
+        self.assertFalse(source.closed)
 
 
 if __name__ == '__main__':
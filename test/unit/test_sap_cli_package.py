@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
+import os
+import tempfile
 import unittest
-from unittest.mock import patch, call
+from unittest.mock import patch, call, ANY
 from types import SimpleNamespace
 from argparse import ArgumentParser
 
@@ -69,22 +71,26 @@ class TestPackageCreate(unittest.TestCase):
         self.assertEqual(connection.execs[0].params['corrNr'], '420')
 
 
+def configure_mock_walk(fake_walk):
+    fake_walk.return_value = iter(
+        (([],
+          ['$VICTORY_TESTS', '$VICTORY_DOC'],
+          [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD'),
+           SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_WORLD'),
+           SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD')]),
+         (['$VICTORY_TESTS'],
+          [],
+          [SimpleNamespace(typ='CLAS/OC', name='ZCL_TESTS')]),
+         (['$VICTORY_DOC'],
+          [],
+          []))
+    )
+
+
 class TestPackageList(unittest.TestCase):
 
     def configure_mock_walk(self, conn, fake_walk):
-        fake_walk.return_value = iter(
-            (([],
-              ['$VICTORY_TESTS', '$VICTORY_DOC'],
-              [SimpleNamespace(typ='INTF/OI', name='ZIF_HELLO_WORLD'),
-               SimpleNamespace(typ='CLAS/OC', name='ZCL_HELLO_WORLD'),
-               SimpleNamespace(typ='PROG/P', name='Z_HELLO_WORLD')]),
-             (['$VICTORY_TESTS'],
-              [],
-              [SimpleNamespace(typ='CLAS/OC', name='ZCL_TESTS')]),
-             (['$VICTORY_DOC'],
-              [],
-              []))
-        )
+        configure_mock_walk(fake_walk)
 
     @patch('sap.adt.package.walk')
     def test_without_recursion(self, fake_walk):
@@ -117,6 +123,117 @@ class TestPackageList(unittest.TestCase):
                                                  call('$VICTORY_TESTS/ZCL_TESTS'),
                                                  call('$VICTORY_DOC/')])
 
+        fake_walk.assert_called_once_with(ANY, jobs=1)
+
+    @patch('sap.adt.package.walk')
+    def test_with_recursion_jobs(self, fake_walk):
+        conn = Connection()
+
+        self.configure_mock_walk(conn, fake_walk)
+        args = parse_args('list', '$VICTORY', '-r', '--jobs', '3')
+
+        with patch('sap.cli.package.print') as fake_print:
+            args.execute(conn, args)
+
+        self.assertEqual(len(fake_print.mock_calls), 5)
+        fake_walk.assert_called_once_with(ANY, jobs=3)
+
+    @patch('sap.adt.package.walk')
+    def test_without_recursion_jobs_ignored(self, fake_walk):
+        conn = Connection()
+
+        self.configure_mock_walk(conn, fake_walk)
+        args = parse_args('list', '$VICTORY', '--jobs', '3')
+
+        with patch('sap.cli.package.print'):
+            args.execute(conn, args)
+
+        fake_walk.assert_called_once_with(ANY, jobs=1)
+
+
+class TestPackageIndexCommands(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.index = os.path.join(self.tmpdir.name, 'packages.db')
+
+    def list_package(self, *params):
+        conn = Connection()
+        args = parse_args('list', '$victory', '-r', *params)
+
+        with patch('sap.adt.package.walk') as fake_walk, \
+             patch('sap.cli.package.print') as fake_print:
+            configure_mock_walk(fake_walk)
+            args.execute(conn, args)
+
+        return (fake_walk, fake_print)
+
+    def test_list_from_index(self):
+        fake_walk, fake_print = self.list_package('--index', self.index, '--jobs', '2')
+
+        fake_walk.assert_called_once_with(ANY, jobs=2)
+        self.assertEqual(fake_print.mock_calls, [call('ZIF_HELLO_WORLD'),
+                                                 call('ZCL_HELLO_WORLD'),
+                                                 call('Z_HELLO_WORLD'),
+                                                 call('$VICTORY_TESTS/ZCL_TESTS'),
+                                                 call('$VICTORY_DOC/')])
+
+        with patch.dict('os.environ', {'SAP_PACKAGE_INDEX': self.index}):
+            fake_walk, cached_print = self.list_package()
+
+        fake_walk.assert_not_called()
+        self.assertEqual(cached_print.mock_calls, fake_print.mock_calls)
+
+    def test_list_refresh(self):
+        self.list_package('--index', self.index)
+        fake_walk, _ = self.list_package('--index', self.index, '--refresh')
+
+        fake_walk.assert_called_once()
+
+    def test_list_expired(self):
+        self.list_package('--index', self.index)
+        fake_walk, _ = self.list_package('--index', self.index, '--ttl', '-1')
+
+        fake_walk.assert_called_once()
+
+    def test_owner(self):
+        self.list_package('--index', self.index)
+
+        args = parse_args('owner', 'zcl_tests', '--index', self.index)
+        with patch('sap.cli.package.print') as fake_print:
+            self.assertEqual(args.execute(Connection(), args), 0)
+
+        self.assertEqual(fake_print.mock_calls, [call('$VICTORY_TESTS CLAS/OC ZCL_TESTS')])
+
+    def test_owner_not_found(self):
+        self.list_package('--index', self.index)
+
+        args = parse_args('owner', 'zcl_tests', '--type', 'PROG/P', '--index', self.index)
+        with patch('sap.cli.package.print') as fake_print:
+            self.assertEqual(args.execute(Connection(), args), 1)
+
+        self.assertEqual(fake_print.call_args[0], ('The object ZCL_TESTS was not found in the package index',))
+
+    def test_find(self):
+        self.list_package('--index', self.index)
+
+        args = parse_args('find', 'z', '--index', self.index)
+        with patch('sap.cli.package.print') as fake_print:
+            args.execute(Connection(), args)
+
+        self.assertEqual(fake_print.mock_calls, [call('$VICTORY CLAS/OC ZCL_HELLO_WORLD'),
+                                                 call('$VICTORY_TESTS CLAS/OC ZCL_TESTS'),
+                                                 call('$VICTORY INTF/OI ZIF_HELLO_WORLD'),
+                                                 call('$VICTORY PROG/P Z_HELLO_WORLD')])
+
+    def test_find_without_index(self):
+        args = parse_args('find', 'z')
+
+        with patch.dict('os.environ', {}, clear=True), \
+             self.assertRaises(sap.cli.core.InvalidCommandLineError):
+            args.execute(Connection(), args)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,7 @@
 
 import unittest
 from unittest.mock import patch, mock_open
-from io import StringIO
+from io import StringIO, BytesIO, TextIOWrapper
 from argparse import ArgumentParser
 
 import sap.cli.program
@@ -37,33 +37,33 @@ class TestProgramWrite(unittest.TestCase):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
 
         args = parse_args('write', 'report', '-')
-        with patch('sys.stdin', StringIO(FIXTURE_STDIN_REPORT_SRC)):
+        with patch('sys.stdin', TextIOWrapper(BytesIO(FIXTURE_STDIN_REPORT_SRC.encode('utf-8')))):
             args.execute(conn, args)
 
         self.assertEqual(len(conn.execs), 3)
 
         self.maxDiff = None
-        self.assertEqual(conn.execs[1][3], FIXTURE_STDIN_REPORT_SRC)
+        self.assertEqual(conn.execs[1][3], FIXTURE_STDIN_REPORT_SRC.encode('utf-8'))
 
     def test_read_from_file(self):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
 
         args = parse_args('write', 'report', 'file.abap')
-        with patch('sap.cli.object.open', mock_open(read_data=FIXTURE_FILE_REPORT_SRC)) as m:
+        with patch('sap.cli.object.open', mock_open(read_data=FIXTURE_FILE_REPORT_SRC.encode('utf-8'))) as m:
             args.execute(conn, args)
 
-        m.assert_called_once_with('file.abap', 'r')
+        m.assert_called_once_with('file.abap', 'rb')
 
         self.assertEqual(len(conn.execs), 3)
 
         self.maxDiff = None
-        self.assertEqual(conn.execs[1][3], FIXTURE_FILE_REPORT_SRC)
+        self.assertEqual(conn.execs[1][3], FIXTURE_FILE_REPORT_SRC.encode('utf-8'))
 
     def test_write_with_corrnr(self):
         conn = Connection([LOCK_RESPONSE_OK, EMPTY_RESPONSE_OK, EMPTY_RESPONSE_OK])
 
         args = parse_args('write', 'report', 'file.abap', '--corrnr', '420')
-        with patch('sap.cli.object.open', mock_open(read_data=FIXTURE_FILE_REPORT_SRC)) as m:
+        with patch('sap.cli.object.open', mock_open(read_data=FIXTURE_FILE_REPORT_SRC.encode('utf-8'))) as m:
             args.execute(conn, args)
 
         self.assertEqual(conn.execs[1].params['corrNr'], '420')